@@ -132,6 +132,7 @@ MIDDLEWARE_CLASSES = (
     'core.middleware.ParseLinksMiddleware',
     'core.middleware.DownstreamCacheControlMiddleware',
     'flags.middleware.FlagConditionsMiddleware',
+    'v1.cache_tags.CacheTagMiddleware',
 )
 
 CSP_MIDDLEWARE_CLASSES = ('csp.middleware.CSPMiddleware', )
@@ -762,13 +763,45 @@ REGULATIONS_REFERENCE_MAPPING = [
     ),
 ]
 
-# Optionally enable cache for general template fragments
+# Optionally enable cache for general template fragments. Fragments are kept
+# in a file-based tier shared by all processes on a server, in front of a
+# database tier shared by all servers. See core.cache.TieredCache.
 if os.environ.get('ENABLE_DEFAULT_FRAGMENT_CACHE'):
+    FRAGMENT_CACHE_TIERS = [
+        {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.environ.get(
+                'FRAGMENT_CACHE_FILE_LOCATION',
+                '/tmp/cfgov_fragment_cache'
+            ),
+            'TIMEOUT': int(os.environ.get('FRAGMENT_CACHE_FILE_TIMEOUT', 60)),
+            'OPTIONS': {
+                'MAX_ENTRIES': int(
+                    os.environ.get('FRAGMENT_CACHE_FILE_MAX_ENTRIES', 5000)
+                ),
+            },
+        },
+        {
+            'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+            'LOCATION': 'default_fragment_cache',
+            'TIMEOUT': int(
+                os.environ.get('FRAGMENT_CACHE_DB_TIMEOUT', 60 * 60 * 24)
+            ),
+            'OPTIONS': {
+                'MAX_ENTRIES': int(
+                    os.environ.get('FRAGMENT_CACHE_DB_MAX_ENTRIES', 50000)
+                ),
+            },
+        },
+    ]
+
     CACHES = {
         'default_fragment_cache': {
-            'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+            'BACKEND': 'core.cache.TieredCache',
             'LOCATION': 'default_fragment_cache',
-            'TIMEOUT': None,
+            'OPTIONS': {
+                'TIERS': FRAGMENT_CACHE_TIERS,
+            },
         }
     }
 else:
@@ -779,6 +812,43 @@ else:
         }
     }
 
+# Optionally keep recently used template fragments in memory in each process,
+# in front of the caches used by v1.jinja2tags.fragment_cache. Fragments kept
+# in memory may be up to FRAGMENT_CACHE_LOCAL_TIMEOUT seconds out of date.
+FRAGMENT_CACHE_LOCAL_MAX_ENTRIES = int(
+    os.environ.get('FRAGMENT_CACHE_LOCAL_MAX_ENTRIES', 0)
+)
+FRAGMENT_CACHE_LOCAL_TIMEOUT = int(
+    os.environ.get('FRAGMENT_CACHE_LOCAL_TIMEOUT', 30)
+)
+
+# Caches used by {% cache %} template tags, whose fragments are evicted by
+# v1.jinja2tags.fragment_cache.invalidate_fragment_tags.
+FRAGMENT_CACHE_NAMES = ('default_fragment_cache', 'post_preview')
+
+# Maximum number of seconds to wait for another process to render a missing
+# template fragment before rendering it again.
+FRAGMENT_CACHE_LOCK_TIMEOUT = 10
+
+# Optionally store compiled Jinja2 templates in this directory, so that new
+# processes load them instead of compiling every template from source.
+# See v1.jinja2_environment and the precompile_templates management command.
+JINJA2_BYTECODE_CACHE_DIR = os.environ.get('JINJA2_BYTECODE_CACHE_DIR')
+
+# Optionally cache fully rendered Wagtail pages served to anonymous users.
+# See v1.page_cache.PageCache.
+if os.environ.get('ENABLE_PAGE_CACHE'):
+    CACHES['page_cache'] = {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'page_cache',
+        'TIMEOUT': int(os.environ.get('PAGE_CACHE_TIMEOUT', 300)),
+    }
+
+# Optionally send ETags with Wagtail pages served to anonymous users, and
+# answer matching conditional requests without rendering pages.
+# See v1.page_cache.PageETags.
+ENABLE_PAGE_ETAGS = bool(os.environ.get('ENABLE_PAGE_ETAGS'))
+
 
 # See core.middleware.ParseLinksMiddleware. Normally all HTML responses get
 # processed by this middleware so that their link content gets the proper
@@ -796,6 +866,14 @@ PARSE_LINKS_EXCLUSION_LIST = [
     r'^/policy-compliance/rulemaking/regulations/\d+/'
 ]
 
+# Optionally cache the output of core.middleware.ParseLinksMiddleware in
+# memory, so that identical HTML responses are only processed once. This is
+# the maximum total size in bytes of cached output per process; a value of 0
+# disables the cache.
+PARSE_LINKS_CACHE_MAX_SIZE = int(
+    os.environ.get('PARSE_LINKS_CACHE_MAX_SIZE', 0)
+)
+
 # Required by django-extensions to determine the execution directory used by
 # scripts executed with the "runscript" management command.
 # See https://django-extensions.readthedocs.io/en/latest/runscript.html.
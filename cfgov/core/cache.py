@@ -0,0 +1,153 @@
+from collections import Counter, defaultdict
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+from django.utils.module_loading import import_string
+
+
+# Hit and miss counts for each tiered cache, by location, counted overall
+# and for each tier by index. Django creates a cache instance per thread, so
+# these are kept for the whole process.
+_stats = defaultdict(Counter)
+
+
+class TieredCache(BaseCache):
+    """A cache backend that layers other cache backends.
+
+    Tiers are configured in OPTIONS['TIERS'] as a list of cache settings,
+    ordered from fastest to slowest. For example, a file-based tier that is
+    shared by all processes on a server can sit in front of a database tier
+    shared by all servers. See settings.CACHES['default_fragment_cache'].
+
+    Values are read from the first tier that has them, and are then copied
+    to the faster tiers. Values are written to and deleted from every tier.
+    Each tier keeps its own TIMEOUT and size limits; a value is never kept
+    in a tier for longer than that tier's TIMEOUT.
+
+    Because deletes only reach the tiers that this process can see, other
+    processes and servers may keep serving a deleted value from their own
+    faster tiers until it expires from them.
+
+    Whether add() succeeds is decided by the last tier, so that add() can be
+    used as a lock by every process that shares that tier.
+    """
+    def __init__(self, location, params):
+        super(TieredCache, self).__init__(params)
+        self.location = location
+
+        options = params.get('OPTIONS', {})
+        self.tiers = [
+            self.create_tier(tier_params)
+            for tier_params in options.get('TIERS', [])
+        ]
+
+        if not self.tiers:
+            raise ValueError('TieredCache requires at least one tier')
+
+    @staticmethod
+    def create_tier(params):
+        params = params.copy()
+        backend_cls = import_string(params.pop('BACKEND'))
+        return backend_cls(params.pop('LOCATION', ''), params)
+
+    @property
+    def stats(self):
+        """Return hit and miss counts for this process.
+
+        Counts for each tier are listed in tier order. A lookup that misses
+        a tier is counted as a miss of that tier, and as an overall miss
+        only if it misses every tier.
+        """
+        counts = _stats[self.location]
+        tiers = [
+            {'hits': counts['hits', i], 'misses': counts['misses', i]}
+            for i in range(len(self.tiers))
+        ]
+
+        return {
+            'hits': sum(tier['hits'] for tier in tiers),
+            'misses': counts['misses'],
+            'tiers': tiers,
+        }
+
+    def reset_stats(self):
+        _stats.pop(self.location, None)
+
+    @staticmethod
+    def get_tier_timeout(tier, timeout):
+        """Limit a timeout to the default timeout of a tier."""
+        if timeout is DEFAULT_TIMEOUT:
+            return timeout
+
+        if tier.default_timeout is None:
+            return timeout
+
+        if timeout is None:
+            return tier.default_timeout
+
+        return min(timeout, tier.default_timeout)
+
+    def get(self, key, default=None, version=None):
+        counts = _stats[self.location]
+
+        for i, tier in enumerate(self.tiers):
+            value = tier.get(key, self, version=version)
+
+            if value is self:
+                counts['misses', i] += 1
+                continue
+
+            counts['hits', i] += 1
+
+            for faster_tier in self.tiers[:i]:
+                faster_tier.set(key, value, version=version)
+
+            return value
+
+        counts['misses'] += 1
+        return default
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        for tier in self.tiers:
+            tier.set(
+                key,
+                value,
+                timeout=self.get_tier_timeout(tier, timeout),
+                version=version
+            )
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        last_tier = self.tiers[-1]
+
+        if not last_tier.add(
+            key,
+            value,
+            timeout=self.get_tier_timeout(last_tier, timeout),
+            version=version
+        ):
+            return False
+
+        for tier in self.tiers[:-1]:
+            tier.set(
+                key,
+                value,
+                timeout=self.get_tier_timeout(tier, timeout),
+                version=version
+            )
+
+        return True
+
+    def delete(self, key, version=None):
+        for tier in self.tiers:
+            tier.delete(key, version=version)
+
+    def delete_many(self, keys, version=None):
+        for tier in self.tiers:
+            tier.delete_many(keys, version=version)
+
+    def clear(self):
+        for tier in self.tiers:
+            tier.clear()
+
+    def close(self, **kwargs):
+        for tier in self.tiers:
+            tier.close(**kwargs)
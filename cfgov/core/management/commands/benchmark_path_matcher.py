@@ -0,0 +1,66 @@
+from __future__ import unicode_literals
+
+import re
+import timeit
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core.utils import PathMatcher
+
+
+SAMPLE_PATHS = (
+    '/',
+    '/about-us/blog/',
+    '/about-us/newsroom/cfpb-issues-rule/',
+    '/admin/',
+    '/admin/pages/1234/edit/',
+    '/admin/pages/1234/edit/preview/',
+    '/ask-cfpb/what-is-a-statute-of-limitations-on-a-debt-en-1389/',
+    '/consumer-tools/debt-collection/',
+    '/django-admin/auth/user/',
+    '/login/',
+    '/owning-a-home/prepare/',
+    '/policy-compliance/rulemaking/regulations/1002/',
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare the time taken to check request paths against '
+        'settings.PARSE_LINKS_EXCLUSION_LIST using uncompiled regular '
+        'expressions and using a PathMatcher'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--iterations',
+            type=int,
+            default=10000,
+            help='Number of times to check each sample path'
+        )
+
+    def handle(self, *args, **options):
+        iterations = options['iterations']
+        patterns = settings.PARSE_LINKS_EXCLUSION_LIST
+        matcher = PathMatcher(regexes=patterns)
+
+        def check_uncompiled():
+            for path in SAMPLE_PATHS:
+                any(re.search(regex, path) for regex in patterns)
+
+        def check_compiled():
+            for path in SAMPLE_PATHS:
+                matcher.matches(path)
+
+        checks = iterations * len(SAMPLE_PATHS)
+
+        for label, func in (
+            ('re.search per pattern', check_uncompiled),
+            ('PathMatcher', check_compiled),
+        ):
+            seconds = timeit.timeit(func, number=iterations)
+            self.stdout.write('{}: {:.3f} microseconds per path'.format(
+                label,
+                seconds * 1e6 / checks
+            ))
@@ -0,0 +1,33 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.db import BaseDatabaseCache
+from django.core.management.commands import createcachetable
+
+from core.cache import TieredCache
+
+
+class Command(createcachetable.Command):
+    help = (
+        createcachetable.Command.help + ' This includes the database tiers '
+        'of core.cache.TieredCache caches.'
+    )
+
+    def handle(self, *tablenames, **options):
+        super(Command, self).handle(*tablenames, **options)
+
+        if tablenames:
+            return
+
+        for cache_alias in settings.CACHES:
+            cache = caches[cache_alias]
+
+            if not isinstance(cache, TieredCache):
+                continue
+
+            for tier in cache.tiers:
+                if isinstance(tier, BaseDatabaseCache):
+                    self.create_table(
+                        options['database'],
+                        tier._table,
+                        options['dry_run']
+                    )
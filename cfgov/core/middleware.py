@@ -1,14 +1,24 @@
+from __future__ import unicode_literals
+
+import codecs
+import hashlib
 import re
+import threading
+from collections import OrderedDict
 from six import text_type as str
+from six.moves.html_parser import HTMLParser
 
 from django.conf import settings
-from django.utils.encoding import force_text
+from django.utils.encoding import force_bytes, force_text
 
 from wagtail.wagtailcore.rich_text import expand_db_html
 
-from bs4 import BeautifulSoup
+from bs4.dammit import EntitySubstitution
 
-from core.utils import add_link_markup, get_link_tags
+from core.utils import (
+    LINK_ICON_CLASSES, LINK_ICON_TEXT_CLASSES, get_link_icon_markup,
+    get_link_markup_rule, get_path_matcher
+)
 
 
 class DownstreamCacheControlMiddleware(object):
@@ -18,6 +28,216 @@ class DownstreamCacheControlMiddleware(object):
         return response
 
 
+# An HTML tag, with attribute values that may contain ">" when quoted.
+HTML_TAG = re.compile(
+    r'<(/?)([a-zA-Z][^\t\n\r\f />]*)'
+    r'((?:"[^"]*"|\'[^\']*\'|[^\'">])*)>'
+)
+
+# A tag that has been started but not yet terminated at the end of a chunk.
+UNTERMINATED_TAG = re.compile(r'<[^>]*\Z')
+
+# Elements whose contents are not parsed as HTML.
+RAW_TEXT_ELEMENTS = {
+    name: re.compile(r'</{}\s*>'.format(name), re.IGNORECASE)
+    for name in ('script', 'style')
+}
+
+# Elements that have no contents and no closing tag.
+VOID_ELEMENTS = frozenset((
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'keygen',
+    'link', 'menuitem', 'meta', 'param', 'source', 'track', 'wbr',
+))
+
+# Links that directly contain one of these elements are left unmodified.
+IMAGE_ELEMENTS = frozenset(('img', 'svg'))
+
+# Multi-valued attributes are split on whitespace the same way that
+# BeautifulSoup splits them.
+WHITESPACE = re.compile(r'\s+')
+
+
+class _StartTagParser(HTMLParser):
+    """Parse the attributes of a single start tag.
+
+    This uses the same attribute parsing and entity handling as
+    BeautifulSoup's html.parser tree builder.
+    """
+    def parse(self, start_tag):
+        self.attrs = None
+        self.reset()
+        self.feed(start_tag)
+        self.close()
+        return self.attrs
+
+    def handle_starttag(self, tag, attrs):
+        self.attrs = OrderedDict(
+            (key, '' if value is None else value) for key, value in attrs
+        )
+
+
+class LinkMarkupRewriter(object):
+    """Incrementally add link markup to HTML.
+
+    HTML is passed to feed() in one or more chunks and is scanned once, from
+    start to finish. Each call returns the output that is ready to be sent;
+    a call to close() returns anything that remains. Output is only held back
+    while a tag or a link is incomplete.
+
+    Wagtail rich text references are expanded, and then each link is given
+    the markup described by core.utils.get_link_markup_rule. Modified links
+    are serialized the same way that BeautifulSoup serializes them; all other
+    content is passed through unmodified.
+    """
+    def __init__(self):
+        self.unexpanded = ''
+        self.buffer = ''
+        self.start_tag_parser = _StartTagParser()
+
+    def feed(self, html):
+        self.unexpanded += html
+
+        # Only expand complete tags, as rich text references are attributes
+        # of <a> and <embed> tags.
+        unterminated = UNTERMINATED_TAG.search(self.unexpanded)
+        if unterminated:
+            split = unterminated.start()
+            html = self.unexpanded[:split]
+            self.unexpanded = self.unexpanded[split:]
+        else:
+            html, self.unexpanded = self.unexpanded, ''
+
+        return self.rewrite(expand_db_html(html), final=False)
+
+    def close(self):
+        html, self.unexpanded = self.unexpanded, ''
+        return self.rewrite(expand_db_html(html), final=True)
+
+    def rewrite(self, html, final):
+        data = self.buffer + html
+        output = []
+        emitted = 0
+        pos = 0
+
+        # The currently open link, if any.
+        link_start = link_attrs = link_content_start = None
+        link_depth = 0
+        link_has_image = False
+
+        while True:
+            lt = data.find('<', pos)
+            if lt == -1:
+                break
+
+            if data.startswith('<!--', lt):
+                end = data.find('-->', lt + 4)
+                if end == -1:
+                    break
+                pos = end + 3
+                continue
+
+            match = HTML_TAG.match(data, lt)
+            if not match:
+                if not final and data.find('>', lt) == -1:
+                    break
+                pos = lt + 1
+                continue
+
+            pos = match.end()
+            is_end_tag = match.group(1)
+            name = match.group(2).lower()
+            self_closing = match.group(3).endswith('/')
+
+            if (not is_end_tag and not self_closing and
+                    name in RAW_TEXT_ELEMENTS):
+                raw_text_end = RAW_TEXT_ELEMENTS[name].search(data, pos)
+                if raw_text_end:
+                    pos = raw_text_end.end()
+                elif final:
+                    pos = len(data)
+                else:
+                    pos = lt
+                    break
+
+            elif name == 'a' and not is_end_tag:
+                # Links can't be nested; an unclosed link is left as-is.
+                link_start = link_attrs = None
+                if self_closing:
+                    continue
+
+                attrs = self.start_tag_parser.parse(match.group(0))
+                if attrs and 'href' in attrs:
+                    link_start = lt
+                    link_attrs = attrs
+                    link_content_start = pos
+                    link_depth = 0
+                    link_has_image = False
+
+            elif link_start is not None:
+                if is_end_tag and name == 'a':
+                    markup = self.get_link_markup(
+                        link_attrs,
+                        data[link_content_start:lt],
+                        link_has_image
+                    )
+                    if markup is not None:
+                        output.append(data[emitted:link_start])
+                        output.append(markup)
+                        emitted = pos
+
+                    link_start = link_attrs = None
+                elif is_end_tag:
+                    link_depth = max(0, link_depth - 1)
+                else:
+                    if link_depth == 0 and name in IMAGE_ELEMENTS:
+                        link_has_image = True
+                    if not self_closing and name not in VOID_ELEMENTS:
+                        link_depth += 1
+
+        # Hold back any incomplete link or tag until more input arrives.
+        if final:
+            hold = len(data)
+        elif link_start is not None:
+            hold = link_start
+        else:
+            hold = lt if lt != -1 else len(data)
+
+        output.append(data[emitted:hold])
+        self.buffer = data[hold:]
+        return ''.join(output)
+
+    def get_link_markup(self, attrs, content, has_image):
+        """Return the markup for a link, or None if it isn't modified."""
+        if has_image:
+            return None
+
+        icon, href = get_link_markup_rule(attrs['href'])
+        if not icon:
+            return None
+
+        attrs = attrs.copy()
+        attrs['href'] = href
+        attrs['class'] = ' '.join(
+            [c for c in WHITESPACE.split(attrs['class']) if c] +
+            [LINK_ICON_CLASSES]
+        ) if attrs.get('class') else LINK_ICON_CLASSES
+
+        return '<a{}><span class="{}">{}</span> {}</a>'.format(
+            ''.join(
+                ' {}={}'.format(
+                    key,
+                    EntitySubstitution.quoted_attribute_value(
+                        EntitySubstitution.substitute_xml(value)
+                    )
+                )
+                for key, value in sorted(attrs.items())
+            ),
+            LINK_ICON_TEXT_CLASSES,
+            content,
+            get_link_icon_markup(icon)
+        )
+
+
 def parse_links(html, encoding=None):
     """Process all links in given html and replace them if markup is added."""
     if encoding is None:
@@ -28,31 +248,133 @@ def parse_links(html, encoding=None):
     # always want this content to be a string for our purposes.
     html_as_text = force_text(html, encoding=encoding)
 
-    # This call invokes Wagail-specific logic that converts references to
-    # Wagtail pages, documents, and images to their proper link URLs.
-    expanded_html = expand_db_html(html_as_text)
+    rewriter = LinkMarkupRewriter()
+    return rewriter.feed(html_as_text) + rewriter.close()
+
+
+def parse_links_streaming(chunks, encoding=None):
+    """Process all links in an iterable of HTML chunks.
+
+    Yields chunks of processed HTML as bytes as soon as they are available.
+    """
+    if encoding is None:
+        encoding = settings.DEFAULT_CHARSET
+
+    decoder = codecs.getincrementaldecoder(encoding)()
+    rewriter = LinkMarkupRewriter()
+
+    for chunk in chunks:
+        if isinstance(chunk, bytes):
+            chunk = decoder.decode(chunk)
+        else:
+            chunk = str(chunk)
+
+        output = rewriter.feed(chunk)
+        if output:
+            yield output.encode(encoding)
+
+    output = rewriter.feed(decoder.decode(b'', final=True)) + rewriter.close()
+    if output:
+        yield output.encode(encoding)
 
-    soup = BeautifulSoup(expanded_html, 'html.parser')
-    link_tags = get_link_tags(soup)
-    for tag in link_tags:
-        original_link = str(tag)
-        link_with_markup = add_link_markup(tag)
-        if link_with_markup:
-            expanded_html = expanded_html.replace(
-                original_link,
-                link_with_markup
-            )
 
-    return expanded_html
+class ParseLinksCache(object):
+    """A size-bounded LRU cache of parse_links output.
+
+    Output is keyed by a hash of the response content, its encoding, and the
+    settings that affect link markup, so identical responses are only
+    processed once. The least recently used output is evicted when the total
+    size of cached output exceeds max_size bytes.
+
+    Content that contains Wagtail rich text references is never cached, as
+    the expansion of those references depends on the current page tree.
+    """
+    RICH_TEXT_REFERENCES = (b'linktype=', b'embedtype=')
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self.lock = threading.Lock()
+        self.clear()
+
+    def clear(self):
+        with self.lock:
+            self.entries = OrderedDict()
+            self.size = 0
+            self.hits = 0
+            self.misses = 0
+
+    @property
+    def stats(self):
+        return {
+            'entries': len(self.entries),
+            'size': self.size,
+            'max_size': self.max_size,
+            'hits': self.hits,
+            'misses': self.misses,
+        }
+
+    def get_key(self, content, encoding):
+        key = hashlib.sha1(content)
+        key.update(force_bytes(encoding))
+        key.update(force_bytes(settings.SECRET_KEY))
+        return key.hexdigest()
+
+    def parse_links(self, content, encoding):
+        """Return parse_links output for response content, as bytes."""
+        if any(ref in content for ref in self.RICH_TEXT_REFERENCES):
+            return force_bytes(parse_links(content, encoding), encoding)
+
+        key = self.get_key(content, encoding)
+
+        with self.lock:
+            output = self.entries.pop(key, None)
+            if output is not None:
+                self.entries[key] = output
+                self.hits += 1
+                return output
+
+            self.misses += 1
+
+        output = force_bytes(parse_links(content, encoding), encoding)
+
+        if len(output) <= self.max_size:
+            with self.lock:
+                if key not in self.entries:
+                    self.entries[key] = output
+                    self.size += len(output)
+
+                while self.size > self.max_size:
+                    _, evicted = self.entries.popitem(last=False)
+                    self.size -= len(evicted)
+
+        return output
 
 
 class ParseLinksMiddleware(object):
+    def __init__(self):
+        max_size = settings.PARSE_LINKS_CACHE_MAX_SIZE
+        self.cache = ParseLinksCache(max_size) if max_size else None
+
     def process_response(self, request, response):
-        if self.should_parse_links(request.path, response['content-type']):
-            response.content = parse_links(
-                response.content,
-                encoding=response.charset
-            )
+        if self.should_parse_links(
+            request.path,
+            response.get('content-type', '')
+        ):
+            if response.streaming:
+                response.streaming_content = parse_links_streaming(
+                    response.streaming_content,
+                    encoding=response.charset
+                )
+            elif self.cache is not None:
+                response.content = self.cache.parse_links(
+                    response.content,
+                    response.charset
+                )
+            else:
+                response.content = parse_links(
+                    response.content,
+                    encoding=response.charset
+                )
         return response
 
     @classmethod
@@ -69,7 +391,7 @@ class ParseLinksMiddleware(object):
         if settings.DEFAULT_CONTENT_TYPE not in response_content_type:
             return False
 
-        return not any(
-            re.search(regex, request_path)
-            for regex in settings.PARSE_LINKS_EXCLUSION_LIST
+        exclusions = get_path_matcher(
+            regexes=tuple(settings.PARSE_LINKS_EXCLUSION_LIST)
         )
+        return not exclusions.matches(request_path)
@@ -1,9 +1,17 @@
+import os
 import re
+from six import text_type as str
 
 from django import template
+from django.conf import settings
 from django.contrib.staticfiles import finders
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.functional import cached_property
 from django.utils.safestring import mark_safe
 
+from bs4 import BeautifulSoup
+
 
 register = template.Library()
 
@@ -20,19 +28,85 @@ SVG_REGEX = re.compile(
 )
 
 
-@register.simple_tag()
-def svg_icon(name):
-    """Return SVG content given an icon name."""
-    relative_path = 'icons/{}.svg'.format(name)
-    static_filename = finders.find(relative_path)
+class SvgIcon(object):
+    """A validated SVG icon loaded from staticfiles."""
+    def __init__(self, filename):
+        self.filename = filename
+        self.mtime = os.path.getmtime(filename)
 
-    if not static_filename:
-        raise ValueError('{} not found in staticfiles'.format(relative_path))
-
-    with open(static_filename, 'r') as f:
-        content = f.read()
+        with open(filename, 'r') as f:
+            content = f.read()
 
         if not SVG_REGEX.match(content):
-            raise ValueError('{} is not a valid SVG'.format(static_filename))
+            raise ValueError('{} is not a valid SVG'.format(filename))
+
+        self.content = mark_safe(content)
+
+    @cached_property
+    def link_markup(self):
+        """Icon markup as it is serialized by BeautifulSoup.
+
+        This is the form of the icon that is appended to links by
+        core.utils.add_link_markup.
+        """
+        return str(BeautifulSoup(self.content, 'html.parser'))
+
+
+class SvgIconRegistry(object):
+    """An in-process registry of SVG icons.
+
+    Each icon is looked up in staticfiles, read, and validated the first time
+    that it is requested, and is then served from memory. When DEBUG is
+    enabled, icons are reloaded if their files have been modified.
+    """
+    def __init__(self):
+        self.icons = {}
+
+    def clear(self):
+        self.icons = {}
+
+    def get(self, name):
+        icon = self.icons.get(name)
+
+        if icon is None or (settings.DEBUG and self.is_modified(icon)):
+            icon = self.icons[name] = self.load(name)
 
-        return mark_safe(content)
+        return icon
+
+    def load(self, name):
+        relative_path = 'icons/{}.svg'.format(name)
+        static_filename = finders.find(relative_path)
+
+        if not static_filename:
+            raise ValueError('{} not found in staticfiles'.format(
+                relative_path
+            ))
+
+        return SvgIcon(static_filename)
+
+    @staticmethod
+    def is_modified(icon):
+        try:
+            return os.path.getmtime(icon.filename) != icon.mtime
+        except OSError:
+            return True
+
+
+svg_icons = SvgIconRegistry()
+
+
+@receiver(setting_changed)
+def clear_svg_icons(sender, setting, **kwargs):
+    if setting in (
+        'DEBUG',
+        'MOCK_STATICFILES_PATTERNS',
+        'STATICFILES_DIRS',
+        'STATICFILES_FINDERS',
+    ):
+        svg_icons.clear()
+
+
+@register.simple_tag()
+def svg_icon(name):
+    """Return SVG content given an icon name."""
+    return svg_icons.get(name).content
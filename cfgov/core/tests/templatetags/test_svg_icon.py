@@ -4,7 +4,11 @@ from django.template import Context, Template
 from django.test import TestCase, override_settings
 from django.utils.safestring import SafeData
 
-from core.templatetags.svg_icon import SVG_REGEX, svg_icon
+import mock
+
+from core.templatetags.svg_icon import (
+    SVG_REGEX, SvgIconRegistry, svg_icon, svg_icons
+)
 
 
 VALID_SVG = (
@@ -38,14 +42,15 @@ class SvgRegexTests(TestCase):
         ))
 
 
+TEST_STATICFILES_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(__file__)),
+    'staticfiles'
+)
+
+
 @override_settings(
     MOCK_STATICFILES_PATTERNS={},
-    STATICFILES_DIRS=[
-        os.path.join(
-            os.path.dirname(os.path.dirname(__file__)),
-            'staticfiles'
-        ),
-    ]
+    STATICFILES_DIRS=[TEST_STATICFILES_DIR]
 )
 class SvgIconTests(TestCase):
     def test_assert_renders_valid_svg_from_staticfiles_icons(self):
@@ -70,3 +75,62 @@ class SvgIconTests(TestCase):
         template = Template('{% load svg_icon %}{% svg_icon "invalid" %}')
         with self.assertRaises(ValueError):
             template.render(Context())
+
+
+@override_settings(
+    MOCK_STATICFILES_PATTERNS={},
+    STATICFILES_DIRS=[TEST_STATICFILES_DIR]
+)
+class SvgIconRegistryTests(TestCase):
+    def setUp(self):
+        self.registry = SvgIconRegistry()
+
+    def test_icon_only_loaded_once(self):
+        with mock.patch(
+            'core.templatetags.svg_icon.finders.find',
+            wraps=lambda path: os.path.join(TEST_STATICFILES_DIR, path)
+        ) as find:
+            self.registry.get('test')
+            self.registry.get('test')
+
+        find.assert_called_once_with('icons/test.svg')
+
+    def test_invalid_icon_raises_valueerror_every_time(self):
+        for _ in range(2):
+            with self.assertRaises(ValueError):
+                self.registry.get('invalid')
+
+    def test_link_markup_is_normalized_by_beautifulsoup(self):
+        self.assertEqual(
+            self.registry.get('test').link_markup,
+            (
+                '<svg height="100" width="100">\n'
+                '<circle cx="50" cy="50" fill="yellow" r="40" '
+                'stroke="green"></circle>\n'
+                '</svg>\n'
+            )
+        )
+
+    def test_clear(self):
+        icon = self.registry.get('test')
+        self.registry.clear()
+        self.assertIsNot(self.registry.get('test'), icon)
+
+    def test_modified_icon_not_reloaded_when_debug_disabled(self):
+        icon = self.registry.get('test')
+        icon.mtime = 0
+        self.assertIs(self.registry.get('test'), icon)
+
+    @override_settings(DEBUG=True)
+    def test_modified_icon_reloaded_when_debug_enabled(self):
+        icon = self.registry.get('test')
+        self.assertIs(self.registry.get('test'), icon)
+        icon.mtime = 0
+        self.assertIsNot(self.registry.get('test'), icon)
+
+    def test_staticfiles_setting_change_clears_registry(self):
+        svg_icons.get('test')
+        self.assertIn('test', svg_icons.icons)
+
+        with override_settings(STATICFILES_DIRS=[]):
+            self.assertNotIn('test', svg_icons.icons)
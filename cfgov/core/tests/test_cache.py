@@ -0,0 +1,108 @@
+import shutil
+import tempfile
+
+from django.core.cache.backends.locmem import LocMemCache
+from django.test import SimpleTestCase
+
+from core.cache import TieredCache
+
+
+class TieredCacheTests(SimpleTestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.cache = TieredCache('test-tiered-cache', {
+            'OPTIONS': {
+                'TIERS': [
+                    {
+                        'BACKEND': (
+                            'django.core.cache.backends.locmem.LocMemCache'
+                        ),
+                        'LOCATION': 'test-tiered-cache-memory',
+                        'TIMEOUT': 60,
+                        'OPTIONS': {'MAX_ENTRIES': 10},
+                    },
+                    {
+                        'BACKEND': (
+                            'django.core.cache.backends.filebased.'
+                            'FileBasedCache'
+                        ),
+                        'LOCATION': self.directory,
+                        'TIMEOUT': None,
+                    },
+                ],
+            },
+        })
+        self.memory, self.file = self.cache.tiers
+
+    def tearDown(self):
+        self.cache.clear()
+        self.cache.reset_stats()
+        shutil.rmtree(self.directory)
+
+    def test_requires_tiers(self):
+        with self.assertRaises(ValueError):
+            TieredCache('test-tiered-cache-empty', {})
+
+    def test_creates_tiers(self):
+        self.assertIsInstance(self.memory, LocMemCache)
+        self.assertEqual(self.memory.default_timeout, 60)
+        self.assertEqual(self.memory._max_entries, 10)
+
+    def test_set_writes_to_every_tier(self):
+        self.cache.set('key', 'value')
+        self.assertEqual(self.memory.get('key'), 'value')
+        self.assertEqual(self.file.get('key'), 'value')
+
+    def test_get_copies_value_to_faster_tiers(self):
+        self.file.set('key', 'value')
+        self.assertEqual(self.cache.get('key'), 'value')
+        self.assertEqual(self.memory.get('key'), 'value')
+
+    def test_get_missing_returns_default(self):
+        self.assertEqual(self.cache.get('key', 'default'), 'default')
+
+    def test_get_cached_none(self):
+        self.cache.set('key', None)
+        self.assertIsNone(self.cache.get('key', 'default'))
+
+    def test_delete_removes_from_every_tier(self):
+        self.cache.set('key', 'value')
+        self.cache.delete('key')
+        self.assertIsNone(self.memory.get('key'))
+        self.assertIsNone(self.file.get('key'))
+
+    def test_delete_many_removes_from_every_tier(self):
+        self.cache.set_many({'a': 1, 'b': 2})
+        self.cache.delete_many(['a', 'b'])
+        self.assertEqual(self.cache.get_many(['a', 'b']), {})
+
+    def test_add_is_decided_by_last_tier(self):
+        self.file.set('key', 'value')
+        self.assertFalse(self.cache.add('key', 'other'))
+        self.assertIsNone(self.memory.get('key'))
+
+    def test_add_writes_to_every_tier(self):
+        self.assertTrue(self.cache.add('key', 'value'))
+        self.assertEqual(self.memory.get('key'), 'value')
+        self.assertEqual(self.file.get('key'), 'value')
+
+    def test_tier_timeout_limits_timeout(self):
+        self.assertEqual(self.cache.get_tier_timeout(self.memory, 600), 60)
+        self.assertEqual(self.cache.get_tier_timeout(self.memory, 30), 30)
+        self.assertEqual(self.cache.get_tier_timeout(self.memory, None), 60)
+        self.assertEqual(self.cache.get_tier_timeout(self.file, 600), 600)
+        self.assertIsNone(self.cache.get_tier_timeout(self.file, None))
+
+    def test_stats(self):
+        self.file.set('a', 1)
+        self.cache.get('a')
+        self.cache.get('a')
+        self.cache.get('b')
+        self.assertEqual(self.cache.stats, {
+            'hits': 2,
+            'misses': 1,
+            'tiers': [
+                {'hits': 1, 'misses': 2},
+                {'hits': 1, 'misses': 1},
+            ],
+        })
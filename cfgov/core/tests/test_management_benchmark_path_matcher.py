@@ -0,0 +1,13 @@
+from six import StringIO
+
+from django.core.management import call_command
+from django.test import SimpleTestCase
+
+
+class BenchmarkPathMatcherTestCase(SimpleTestCase):
+    def test_reports_time_per_path(self):
+        stdout = StringIO()
+        call_command('benchmark_path_matcher', iterations=1, stdout=stdout)
+        output = stdout.getvalue()
+        self.assertIn('re.search per pattern: ', output)
+        self.assertIn('PathMatcher: ', output)
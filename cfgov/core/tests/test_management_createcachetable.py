@@ -0,0 +1,25 @@
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+
+
+@override_settings(CACHES={
+    'tiered': {
+        'BACKEND': 'core.cache.TieredCache',
+        'OPTIONS': {
+            'TIERS': [
+                {
+                    'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+                    'LOCATION': 'test_tiered_cache_table',
+                },
+            ],
+        },
+    },
+})
+class CreateCacheTableTestCase(TestCase):
+    def test_creates_tables_for_database_tiers(self):
+        call_command('createcachetable', verbosity=0)
+        self.assertIn(
+            'test_tiered_cache_table',
+            connection.introspection.table_names()
+        )
@@ -1,11 +1,21 @@
 # -*- coding: utf-8 -*-
 from __future__ import unicode_literals
 
-from django.test import TestCase, override_settings
+from six import text_type as str
+
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+
+from wagtail.wagtailcore.rich_text import expand_db_html
 
 import mock
+from bs4 import BeautifulSoup
 
-from core.middleware import ParseLinksMiddleware, parse_links
+from core.middleware import (
+    LinkMarkupRewriter, ParseLinksCache, ParseLinksMiddleware, parse_links,
+    parse_links_streaming
+)
+from core.utils import add_link_markup, get_link_tags
 from v1.models import CFGOVPage
 from v1.tests.wagtail_pages.helpers import publish_page
 
@@ -24,6 +34,125 @@ class TestParseLinksMiddleware(TestCase):
         mock_parse_links.assert_not_called()
 
 
+class TestParseLinksMiddlewareStreaming(TestCase):
+    def setUp(self):
+        self.request = RequestFactory().get('/foo/bar')
+
+    def test_streaming_response_links_get_parsed(self):
+        response = StreamingHttpResponse([
+            b'<p><a href="https://www.fdic.',
+            b'gov/bar">gov link</a></p>',
+        ])
+        response = ParseLinksMiddleware().process_response(
+            self.request,
+            response
+        )
+        output = b''.join(response.streaming_content)
+        self.assertIn(b'cf-icon-svg', output)
+        self.assertIn(b'href="https://www.fdic.gov/bar"', output)
+
+    def test_non_streaming_response_links_get_parsed(self):
+        response = HttpResponse('<a href="https://www.fdic.gov/bar">x</a>')
+        response = ParseLinksMiddleware().process_response(
+            self.request,
+            response
+        )
+        self.assertIn(b'cf-icon-svg', response.content)
+
+
+class TestParseLinksMiddlewareCache(TestCase):
+    def setUp(self):
+        self.request = RequestFactory().get('/foo/bar')
+
+    def process(self, middleware, content):
+        return middleware.process_response(
+            self.request,
+            HttpResponse(content)
+        ).content
+
+    @override_settings(PARSE_LINKS_CACHE_MAX_SIZE=0)
+    def test_cache_disabled_by_default(self):
+        self.assertIsNone(ParseLinksMiddleware().cache)
+
+    @override_settings(PARSE_LINKS_CACHE_MAX_SIZE=1024 * 1024)
+    def test_identical_content_only_parsed_once(self):
+        middleware = ParseLinksMiddleware()
+        content = '<a href="https://www.fdic.gov/bar">x</a>'
+
+        with mock.patch(
+            'core.middleware.parse_links',
+            wraps=parse_links
+        ) as mock_parse_links:
+            first = self.process(middleware, content)
+            second = self.process(middleware, content)
+
+        self.assertEqual(mock_parse_links.call_count, 1)
+        self.assertEqual(first, second)
+        self.assertIn(b'cf-icon-svg', second)
+        self.assertEqual(middleware.cache.hits, 1)
+        self.assertEqual(middleware.cache.misses, 1)
+
+
+class TestParseLinksCache(TestCase):
+    def test_hit_returns_same_output_as_miss(self):
+        cache = ParseLinksCache(max_size=1024)
+        content = b'<a href="/something.pdf">file</a>'
+        self.assertEqual(
+            cache.parse_links(content, 'utf-8'),
+            cache.parse_links(content, 'utf-8')
+        )
+        self.assertEqual(cache.stats['hits'], 1)
+        self.assertEqual(cache.stats['misses'], 1)
+        self.assertEqual(cache.stats['entries'], 1)
+
+    def test_different_encodings_cached_separately(self):
+        cache = ParseLinksCache(max_size=1024)
+        cache.parse_links(b'<a href="/x">x</a>', 'utf-8')
+        cache.parse_links(b'<a href="/x">x</a>', 'latin-1')
+        self.assertEqual(cache.stats['misses'], 2)
+
+    def test_least_recently_used_evicted_when_full(self):
+        cache = ParseLinksCache(max_size=40)
+        first = b'<a href="/first">first</a>'
+        second = b'<a href="/second">second</a>'
+
+        cache.parse_links(first, 'utf-8')
+        cache.parse_links(second, 'utf-8')
+        self.assertEqual(cache.stats['entries'], 1)
+        self.assertLessEqual(cache.size, cache.max_size)
+
+        cache.parse_links(second, 'utf-8')
+        self.assertEqual(cache.hits, 1)
+
+        cache.parse_links(first, 'utf-8')
+        self.assertEqual(cache.misses, 3)
+
+    def test_content_larger_than_cache_not_cached(self):
+        cache = ParseLinksCache(max_size=10)
+        cache.parse_links(b'<a href="/something">text</a>', 'utf-8')
+        self.assertEqual(cache.stats['entries'], 0)
+
+    def test_rich_text_references_not_cached(self):
+        page = CFGOVPage(title='foo bar', slug='foo-bar')
+        publish_page(page)
+        content = '<a id="{}" linktype="page">foo bar</a>'.format(page.id)
+
+        cache = ParseLinksCache(max_size=1024)
+        self.assertEqual(
+            cache.parse_links(content.encode('utf-8'), 'utf-8'),
+            b'<a href="/foo-bar/">foo bar</a>'
+        )
+        self.assertEqual(cache.stats['entries'], 0)
+
+    def test_clear(self):
+        cache = ParseLinksCache(max_size=1024)
+        cache.parse_links(b'<a href="/x">x</a>', 'utf-8')
+        cache.clear()
+        self.assertEqual(cache.stats['entries'], 0)
+        self.assertEqual(cache.stats['size'], 0)
+        self.assertEqual(cache.stats['misses'], 0)
+
+
 class TestShouldParseLinks(TestCase):
     def test_should_not_parse_links_if_non_html(self):
         self.assertFalse(ParseLinksMiddleware.should_parse_links(
@@ -122,3 +251,138 @@ class TestParseLinks(TestCase):
         encoding = 'gb2312'
         parsed = parse_links(s.encode(encoding), encoding=encoding)
         self.assertEqual(parsed, s)
+
+
+def parse_links_with_beautifulsoup(html):
+    """Reference implementation of parse_links that uses BeautifulSoup.
+
+    This was the implementation of parse_links prior to the introduction of
+    LinkMarkupRewriter, and is used to verify that their output matches.
+    """
+    expanded_html = expand_db_html(html)
+
+    soup = BeautifulSoup(expanded_html, 'html.parser')
+    for tag in get_link_tags(soup):
+        original_link = str(tag)
+        link_with_markup = add_link_markup(tag)
+        if link_with_markup:
+            expanded_html = expanded_html.replace(
+                original_link,
+                link_with_markup
+            )
+
+    return expanded_html
+
+
+PARITY_HTML = [
+    '<a href="/something">text</a>',
+    '<a href="https://wwww.google.com">external link</a>',
+    '<a href="http://example.com/?a=1&amp;b=2">query string</a>',
+    '<a href="https://www.fdic.gov/bar">gov link</a>',
+    '<a href="https://www.consumerfinance.gov/foo">cfpb link</a>',
+    '<a href="/something.pdf">link</a>',
+    '<a href="/something.XLSX">link</a>',
+    '<a class="a-btn" href="/something.zip">styled link</a>',
+    '<a class="one two" href="https://www.google.com">classes</a>',
+    '<a href="https://www.google.com">nested <em>markup</em> <b>here</b></a>',
+    '<a href="https://www.google.com">hello<br/>there</a>',
+    '<a href="https://www.google.com"><img src="/foo.png"/></a>',
+    '<a href="/something.pdf"><svg></svg></a>',
+    '<a href="https://www.google.com"><span><img src="/foo.png"/></span></a>',
+    '<a href="/external-site/?ext_url=https%3A%2F%2Fexample.com">site</a>',
+    '<a>no href</a><a href="">empty href</a>',
+    '<a href="https://www.google.com">哈哈</a>',
+    '<a data-x="1" href="https://www.google.com" title="a &gt; b">x</a>',
+    (
+        '<!DOCTYPE html><html><head><title>Title</title>'
+        '<script>var link = \'<a href="https://a.com">a</a>\';</script>'
+        '<style>a > span { color: red; }</style></head><body>'
+        '<!-- <a href="https://b.com">b</a> -->'
+        '<ul><li><a href="https://c.com">c</a></li>'
+        '<li><a href="https://c.com">c</a></li>'
+        '<li><a href="/d/">d</a></li></ul>'
+        '<p>Text with a <a href="https://www.fdic.gov/e.pdf">link</a>.</p>'
+        '</body></html>'
+    ),
+]
+
+
+class TestLinkMarkupRewriter(TestCase):
+    def rewrite_in_chunks(self, html, chunk_size):
+        rewriter = LinkMarkupRewriter()
+        output = [
+            rewriter.feed(html[i:i + chunk_size])
+            for i in range(0, len(html), chunk_size)
+        ]
+        output.append(rewriter.close())
+        return ''.join(output)
+
+    def test_parity_with_beautifulsoup(self):
+        for html in PARITY_HTML:
+            self.assertEqual(
+                parse_links(html),
+                parse_links_with_beautifulsoup(html),
+                html
+            )
+
+    def test_parity_with_beautifulsoup_rich_text(self):
+        page = CFGOVPage(title='foo bar', slug='foo-bar')
+        publish_page(page)
+        html = (
+            '<p><a id="{0}" linktype="page">foo bar</a> '
+            '<a href="https://www.google.com">google</a></p>'
+        ).format(page.id)
+        self.assertEqual(
+            parse_links(html),
+            parse_links_with_beautifulsoup(html)
+        )
+
+    def test_chunked_output_matches_unchunked_output(self):
+        html = ''.join(PARITY_HTML)
+        expected = parse_links(html)
+        for chunk_size in (1, 2, 3, 7, 64, 1024):
+            self.assertEqual(
+                self.rewrite_in_chunks(html, chunk_size),
+                expected
+            )
+
+    def test_output_emitted_before_input_is_complete(self):
+        rewriter = LinkMarkupRewriter()
+        self.assertEqual(rewriter.feed('<p>foo</p><a href="/x"'), '<p>foo</p>')
+        self.assertEqual(rewriter.feed('>x</a>'), '<a href="/x">x</a>')
+        self.assertEqual(rewriter.close(), '')
+
+    def test_unclosed_link_is_output_unmodified(self):
+        html = '<a href="https://www.google.com">unclosed'
+        self.assertEqual(self.rewrite_in_chunks(html, 5), html)
+
+    def test_links_in_comments_are_not_modified(self):
+        html = '<!-- <a href="https://www.google.com">x</a> -->'
+        self.assertEqual(parse_links(html), html)
+
+    def test_links_in_scripts_are_not_modified(self):
+        html = '<script>"<a href=\'https://www.google.com\'>x</a>"</script>'
+        self.assertEqual(self.rewrite_in_chunks(html, 4), html)
+
+    def test_attributes_not_in_canonical_order_get_markup(self):
+        output = parse_links('<a href="https://www.fdic.gov" data-x>x</a>')
+        self.assertTrue(output.startswith(
+            '<a class="a-link a-link__icon" data-x="" '
+            'href="https://www.fdic.gov"><span class="a-link_text">x</span> '
+        ))
+
+
+class TestParseLinksStreaming(TestCase):
+    def test_multibyte_characters_split_across_chunks(self):
+        encoded = '<a href="/something">哈哈</a>'.encode('utf-8')
+        chunks = [encoded[i:i + 1] for i in range(len(encoded))]
+        self.assertEqual(
+            b''.join(parse_links_streaming(chunks, encoding='utf-8')),
+            encoded
+        )
+
+    def test_text_chunks(self):
+        self.assertEqual(
+            b''.join(parse_links_streaming(['<a href="/x">', 'x</a>'])),
+            b'<a href="/x">x</a>'
+        )
@@ -3,7 +3,8 @@ import unittest
 from django.test import TestCase
 
 from core.utils import (
-    NoMigrations, extract_answers_from_request, format_file_size
+    NoMigrations, PathMatcher, extract_answers_from_request, format_file_size,
+    get_path_matcher
 )
 
 
@@ -59,3 +60,51 @@ class FormatFileSizeTests(unittest.TestCase):
 
     def test_format_file_size_terabytes(self):
         self.assertEqual(format_file_size(1024 * 9000000000), '8 TB')
+
+
+class PathMatcherTests(unittest.TestCase):
+    def test_empty_matcher_matches_nothing(self):
+        self.assertFalse(PathMatcher().matches('/foo/'))
+
+    def test_regexes_are_searched(self):
+        matcher = PathMatcher(regexes=[r'^/admin/', r'bar/$'])
+        self.assertTrue(matcher.matches('/admin/pages/'))
+        self.assertTrue(matcher.matches('/foo/bar/'))
+        self.assertFalse(matcher.matches('/foo/admin/'))
+
+    def test_regexes_with_groups(self):
+        matcher = PathMatcher(regexes=[
+            r'^/admin/(?!pages/\d+/(edit/preview|view_draft)/)',
+            r'^/login/',
+        ])
+        self.assertTrue(matcher.matches('/admin/pages/1234/edit/'))
+        self.assertFalse(matcher.matches('/admin/pages/1234/view_draft/'))
+        self.assertTrue(matcher.matches('/login/'))
+
+    def test_prefixes_are_literal(self):
+        matcher = PathMatcher(prefixes=['/foo.bar/'])
+        self.assertTrue(matcher.matches('/foo.bar/baz/'))
+        self.assertFalse(matcher.matches('/fooxbar/baz/'))
+        self.assertFalse(matcher.matches('/baz/foo.bar/'))
+
+    def test_paths_must_match_exactly(self):
+        matcher = PathMatcher(paths=['/foo/'])
+        self.assertTrue(matcher.matches('/foo/'))
+        self.assertFalse(matcher.matches('/foo/bar/'))
+
+    def test_combined(self):
+        matcher = PathMatcher(
+            regexes=[r'^/a/'],
+            prefixes=['/b/'],
+            paths=['/c/']
+        )
+        self.assertTrue(matcher.matches('/a/1/'))
+        self.assertTrue(matcher.matches('/b/1/'))
+        self.assertTrue(matcher.matches('/c/'))
+        self.assertFalse(matcher.matches('/c/1/'))
+
+    def test_get_path_matcher_reuses_matchers(self):
+        self.assertIs(
+            get_path_matcher(regexes=('^/foo/',)),
+            get_path_matcher(regexes=('^/foo/',))
+        )
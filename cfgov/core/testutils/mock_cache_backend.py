@@ -2,6 +2,7 @@ from wagtail.contrib.wagtailfrontendcache.backends import BaseBackend
 
 
 CACHE_PURGED_URLS = []
+CACHE_PURGED_TAGS = []
 
 
 class MockCacheBackend(BaseBackend):
@@ -10,3 +11,6 @@ class MockCacheBackend(BaseBackend):
 
     def purge(self, url):
         CACHE_PURGED_URLS.append(url)
+
+    def purge_tags(self, tags):
+        CACHE_PURGED_TAGS.extend(tags)
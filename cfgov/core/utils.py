@@ -4,10 +4,12 @@ from six.moves.urllib.parse import parse_qs, urlencode, urlparse
 
 from django.core.signing import Signer
 from django.core.urlresolvers import reverse
+from django.utils.lru_cache import lru_cache
 
 from bs4 import BeautifulSoup, NavigableString
+from bs4.element import PreformattedString
 
-from core.templatetags.svg_icon import svg_icon
+from core.templatetags.svg_icon import svg_icons
 
 
 NON_GOV_LINKS = re.compile(
@@ -82,39 +84,59 @@ def is_image_tag(tag):
     return False
 
 
-def add_link_markup(tag):
-    """Add necessary markup to the given link and return if modified.
+def get_link_markup_rule(href):
+    """Determine the markup that should be added to a link.
 
-    Add an external link icon if the input is not a CFPB (internal) link.
-    Add an external link redirect if the input is not a gov link.
-    Add a download icon if the input is a file.
-    Otherwise (internal link that is not a file), return None.
+    Returns a tuple of (icon, href). The icon is 'external-link' if the link
+    is not a CFPB (internal) link, 'download' if the link is to a file, and
+    None otherwise. The href is converted to a signed external link redirect
+    if the link is not a gov link.
     """
-    icon = False
-
-    if not tag.attrs.get('class', None):
-        tag.attrs.update({'class': []})
-
-    if tag['href'].startswith('/external-site/?'):
+    if href.startswith('/external-site/?'):
         # Sets the icon to indicate you're leaving consumerfinance.gov
-        icon = 'external-link'
-        components = urlparse(tag['href'])
+        components = urlparse(href)
         arguments = parse_qs(components.query)
         if 'ext_url' in arguments:
             external_url = arguments['ext_url'][0]
             # Add the redirect notice as well
-            tag['href'] = signed_redirect(external_url)
+            href = signed_redirect(external_url)
+        return 'external-link', href
 
-    elif NON_CFPB_LINKS.match(tag['href']):
+    if NON_CFPB_LINKS.match(href):
         # Sets the icon to indicate you're leaving consumerfinance.gov
-        icon = 'external-link'
-        if NON_GOV_LINKS.match(tag['href']):
+        if NON_GOV_LINKS.match(href):
             # Add the redirect notice as well
-            tag['href'] = signed_redirect(tag['href'])
+            href = signed_redirect(href)
+        return 'external-link', href
 
-    elif DOWNLOAD_LINKS.search(tag['href']):
+    if DOWNLOAD_LINKS.search(href):
         # Sets the icon to indicate you're downloading a file
-        icon = 'download'
+        return 'download', href
+
+    return None, href
+
+
+def get_link_icon_markup(icon):
+    """Return link icon SVG markup as it is serialized by BeautifulSoup."""
+    return svg_icons.get(icon).link_markup
+
+
+class _RawMarkup(PreformattedString):
+    """A string that BeautifulSoup outputs as-is, without escaping."""
+
+
+def add_link_markup(tag):
+    """Add necessary markup to the given link and return if modified.
+
+    Add an external link icon if the input is not a CFPB (internal) link.
+    Add an external link redirect if the input is not a gov link.
+    Add a download icon if the input is a file.
+    Otherwise (internal link that is not a file), return None.
+    """
+    if not tag.attrs.get('class', None):
+        tag.attrs.update({'class': []})
+
+    icon, tag['href'] = get_link_markup_rule(tag['href'])
 
     if icon:
         tag.attrs['class'].append(LINK_ICON_CLASSES)
@@ -125,12 +147,50 @@ def add_link_markup(tag):
         span.contents = contents
         tag.contents = [span, NavigableString(' ')]
         # Appends the SVG icon
-        tag.contents.append(BeautifulSoup(svg_icon(icon), 'html.parser'))
+        tag.contents.append(_RawMarkup(get_link_icon_markup(icon)))
         return str(tag)
 
     return None
 
 
+class PathMatcher(object):
+    """Match request paths against a list of paths or patterns.
+
+    Paths can be matched against any combination of regular expressions
+    (matched anywhere in the path, like re.search), literal path prefixes,
+    and exact paths. Regular expressions and prefixes are compiled once into
+    a single alternation so that each check is a single regex search, and
+    exact paths are checked with a set lookup.
+    """
+    def __init__(self, regexes=(), prefixes=(), paths=()):
+        alternatives = ['(?:{})'.format(regex) for regex in regexes]
+        alternatives.extend('^' + re.escape(prefix) for prefix in prefixes)
+
+        self.regex = None
+        if alternatives:
+            self.regex = re.compile('|'.join(alternatives))
+
+        self.paths = frozenset(paths)
+
+    def matches(self, path):
+        if path in self.paths:
+            return True
+
+        return self.regex is not None and bool(self.regex.search(path))
+
+
+@lru_cache(maxsize=None)
+def get_path_matcher(regexes=(), prefixes=(), paths=()):
+    """Return a PathMatcher, reusing one if it has already been compiled.
+
+    Arguments must be hashable, so that matchers can be built from settings
+    on demand. For example:
+
+        get_path_matcher(regexes=tuple(settings.SOME_PATTERNS))
+    """
+    return PathMatcher(regexes=regexes, prefixes=prefixes, paths=paths)
+
+
 class NoMigrations(object):
     """Class to disable app migrations through settings.MIGRATION_MODULES.
 
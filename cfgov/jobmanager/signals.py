@@ -1,11 +1,17 @@
 import logging
 
+from django.db.models.signals import post_delete, post_save
+
 from wagtail.wagtailcore.signals import page_published
 
 import requests
 from flags.state import flag_enabled
 
+from jobmanager.models.django import (
+    ApplicantType, Grade, JobCategory, JobLength, Office, Region, ServiceType
+)
 from jobmanager.models.pages import JobListingPage
+from v1.page_cache import clear_cached_pages
 
 
 logger = logging.getLogger(__name__)
@@ -15,6 +21,18 @@ SITEMAP_URL = 'https://www.consumerfinance.gov/sitemap.xml'
 GOOGLE_URL = 'https://www.google.com/ping'
 
 
+# Job listings display these models, which are edited outside of pages.
+JOB_LISTING_MODELS = (
+    ApplicantType,
+    Grade,
+    JobCategory,
+    JobLength,
+    Office,
+    Region,
+    ServiceType,
+)
+
+
 def request_site_recrawl(sender, **kwargs):
     try:
         if flag_enabled('PING_GOOGLE_ON_PUBLISH'):
@@ -31,3 +49,7 @@ def request_site_recrawl(sender, **kwargs):
 
 def register_signal_handlers():
     page_published.connect(request_site_recrawl, sender=JobListingPage)
+
+    for model in JOB_LISTING_MODELS:
+        post_save.connect(clear_cached_pages, sender=model)
+        post_delete.connect(clear_cached_pages, sender=model)
@@ -6,17 +6,19 @@ from datetime import date
 
 from django.core.exceptions import ValidationError
 from django.db import models
-from django.db.models.signals import post_save
+from django.db.models.signals import post_init, post_save
 from django.dispatch import receiver
 from django.utils.encoding import python_2_unicode_compatible
 from django.utils.functional import cached_property
 from django.utils.html import strip_tags
 
-from wagtail.contrib.wagtailfrontendcache.utils import PurgeBatch
 from wagtail.wagtailadmin.edit_handlers import FieldPanel
 
 import regdown
 
+from v1.cache_tags import purge_cache_tags, tag_instance
+from v1.page_cache import clear_cached_pages
+
 
 def sortable_label(label, separator='-'):
     """ Create a sortable tuple out of a label.
@@ -303,24 +305,51 @@ class SectionParagraph(models.Model):
             self.section.part, self.section.label, self.paragraph_id)
 
 
+# Regulation pages are tagged with the parts and versions that they display,
+# so that changes to them purge exactly those pages from the CDN.
+post_init.connect(tag_instance, sender=Part)
+post_init.connect(tag_instance, sender=EffectiveVersion)
+
+
+def get_version_cache_tag(version):
+    return 'regulations3k.effectiveversion:{}'.format(version.pk)
+
+
+def get_version_urls(version, section=None):
+    """Return the URLs of every page of a version, or of one section.
+
+    These are purged instead of the version's cache tag from front-end
+    caches that can't purge by tag.
+    """
+    urls = []
+    for page in version.part.page.all():
+        urls.extend(page.get_urls_for_version(version, section=section))
+    return urls
+
+
+@receiver(post_save, sender=Part)
+def part_saved(sender, instance, **kwargs):
+    clear_cached_pages()
+    purge_cache_tags('regulations3k.part:{}'.format(instance.pk))
+
+
 @receiver(post_save, sender=EffectiveVersion)
 def effective_version_saved(sender, instance, **kwargs):
     """ Invalidate the cache if the effective_version is not a draft """
     if not instance.draft:
-        batch = PurgeBatch()
-        for page in instance.part.page.all():
-            urls = page.get_urls_for_version(instance)
-            batch.add_urls(urls)
-        batch.purge()
+        clear_cached_pages()
+        purge_cache_tags(
+            get_version_cache_tag(instance),
+            fallback_urls=get_version_urls(instance)
+        )
 
 
 @receiver(post_save, sender=Section)
 def section_saved(sender, instance, **kwargs):
-    if not instance.subpart.version.draft:
-        batch = PurgeBatch()
-        for page in instance.subpart.version.part.page.all():
-            urls = page.get_urls_for_version(
-                instance.subpart.version, section=instance
-            )
-            batch.add_urls(urls)
-        batch.purge()
+    version = instance.subpart.version
+    if not version.draft:
+        clear_cached_pages()
+        purge_cache_tags(
+            get_version_cache_tag(version),
+            fallback_urls=get_version_urls(version, section=instance)
+        )
@@ -18,7 +18,9 @@ from wagtail.wagtailcore.models import Site
 import mock
 from model_mommy import mommy
 
-from core.testutils.mock_cache_backend import CACHE_PURGED_URLS
+from core.testutils.mock_cache_backend import (
+    CACHE_PURGED_TAGS, CACHE_PURGED_URLS, MockCacheBackend
+)
 from regulations3k.models.django import (
     EffectiveVersion, Part, Section, SectionParagraph, Subpart,
     effective_version_saved, section_saved, sortable_label
@@ -29,6 +31,7 @@ from regulations3k.models.pages import (
     get_section_url, validate_num_results, validate_order,
     validate_page_number, validate_regs_list
 )
+from v1 import purge_queue
 
 
 class RegModelTests(DjangoTestCase):
@@ -187,6 +190,7 @@ class RegModelTests(DjangoTestCase):
         self.reg_page.save()
         self.reg_search_page.save()
 
+        CACHE_PURGED_TAGS[:] = []
         CACHE_PURGED_URLS[:] = []
 
     def get_request(self, path='', data={}):
@@ -614,19 +618,13 @@ class RegModelTests(DjangoTestCase):
     })
     def test_effective_version_saved(self):
         effective_version_saved(None, self.effective_version)
+        purge_queue.drain()
 
-        self.assertIn(
-            'http://localhost/reg-landing/1002/',
-            CACHE_PURGED_URLS
-        )
-        self.assertIn(
-            'http://localhost/reg-landing/1002/4/',
-            CACHE_PURGED_URLS
-        )
-        self.assertIn(
-            'http://localhost/reg-landing/1002/versions/',
-            CACHE_PURGED_URLS
-        )
+        self.assertEqual(CACHE_PURGED_TAGS, [
+            'regulations3k.effectiveversion-{}'.format(
+                self.effective_version.pk
+            ),
+        ])
 
     @override_settings(WAGTAILFRONTENDCACHE={
         'varnish': {
@@ -635,9 +633,41 @@ class RegModelTests(DjangoTestCase):
     })
     def test_section_saved(self):
         section_saved(None, self.section_num4)
-        self.assertEqual(
-            CACHE_PURGED_URLS,
-            ['http://localhost/reg-landing/1002/4/']
+        purge_queue.drain()
+
+        self.assertEqual(CACHE_PURGED_TAGS, [
+            'regulations3k.effectiveversion-{}'.format(
+                self.section_num4.subpart.version.pk
+            ),
+        ])
+
+    @override_settings(WAGTAILFRONTENDCACHE={
+        'varnish': {
+            'BACKEND': 'core.testutils.mock_cache_backend.MockCacheBackend',
+        },
+    })
+    @mock.patch.object(MockCacheBackend, 'purge_tags', None)
+    def test_saves_purge_urls_without_tag_purging(self):
+        effective_version_saved(None, self.effective_version)
+        section_saved(None, self.section_num4)
+        purge_queue.drain()
+
+        self.assertIn('http://localhost/reg-landing/1002/', CACHE_PURGED_URLS)
+        self.assertIn(
+            'http://localhost/reg-landing/1002/4/',
+            CACHE_PURGED_URLS
+        )
+        self.assertEqual(CACHE_PURGED_TAGS, [])
+
+    def test_reg_page_tagged_with_part_and_version(self):
+        response = self.client.get('/reg-landing/1002/4/')
+        tags = response['Edge-Cache-Tag'].split(',')
+        self.assertIn('regulations3k.part-{}'.format(self.part_1002.pk), tags)
+        self.assertIn(
+            'regulations3k.effectiveversion-{}'.format(
+                self.effective_version.pk
+            ),
+            tags
         )
 
     def test_reg_page_can_serve_draft_versions(self):
@@ -0,0 +1 @@
+/* Placeholder file generated by Python unit tests */
\ No newline at end of file
@@ -9,6 +9,7 @@ from wagtail.contrib.wagtailfrontendcache.utils import PurgeBatch
 
 from requests.exceptions import HTTPError
 
+from v1 import purge_queue
 from v1.admin_forms import CacheInvalidationForm
 from v1.models.caching import AkamaiBackend, CDNHistory
 
@@ -96,4 +97,5 @@ def manage_cdn(request):
     return render(request, 'cdnadmin/index.html',
                   context={'form': form,
                            'user_can_purge': user_can_purge,
-                           'history': history})
+                           'history': history,
+                           'purge_queue': purge_queue.get_stats()})
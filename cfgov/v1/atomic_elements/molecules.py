@@ -277,6 +277,8 @@ class ContentImage(blocks.StructBlock):
         icon = 'image'
         template = '_includes/molecules/content-image.html'
         label = 'Image'
+        # Renditions requested by the template; see v1.renditions.
+        rendition_filter_specs = ('original', 'width-1200')
 
 
 class RelatedLinks(blocks.StructBlock):
@@ -0,0 +1,91 @@
+import threading
+
+
+# Akamai reads cache tags from this header and removes it from responses.
+HEADER = 'Edge-Cache-Tag'
+
+# Akamai ignores responses with more cache tags than this.
+MAX_TAGS = 128
+
+
+_local = threading.local()
+
+
+def get_cache_tag(tag):
+    """Return the cache tag sent to Akamai for a tag.
+
+    Tags are the same as fragment cache tags, like "v1.reusabletext" for a
+    model or "v1.reusabletext:1" for an instance of it; see
+    v1.jinja2tags.fragment_cache.get_instance_tags. Akamai doesn't allow
+    colons in cache tags, so they are replaced with dashes.
+    """
+    return tag.replace(':', '-')
+
+
+def add_cache_tags(*tags):
+    """Add tags to the response of the request being served, if any.
+
+    Tags are only collected between CacheTagMiddleware.process_request and
+    process_response; outside of a request, this does nothing.
+    """
+    collected = getattr(_local, 'tags', None)
+
+    if collected is not None:
+        collected.update(tags)
+
+
+def get_cache_tags():
+    """Return the tags collected so far for the request being served.
+
+    Outside of a request, this returns an empty set.
+    """
+    return set(getattr(_local, 'tags', None) or ())
+
+
+def tag_instance(sender, instance, **kwargs):
+    """Tag the current response with a model instance that it has loaded.
+
+    This is connected to post_init for models that pages display, so that
+    responses are tagged with exactly the instances used to render them.
+    """
+    if instance.pk is not None:
+        label = instance._meta.label_lower
+        add_cache_tags('{}:{}'.format(label, instance.pk))
+
+
+def purge_cache_tags(*tags, **kwargs):
+    """Invalidate every cached response tagged with any of the given tags.
+
+    Tags are queued to be purged from every configured front-end cache
+    backend that can purge by tag, like v1.models.caching.AkamaiBackend;
+    see v1.purge_queue. Backends that can't are sent the URLs given as
+    fallback_urls instead, if any.
+    """
+    from v1.purge_queue import enqueue_tags
+
+    enqueue_tags(
+        sorted(set(get_cache_tag(tag) for tag in tags)),
+        fallback_urls=kwargs.get('fallback_urls')
+    )
+
+
+class CacheTagMiddleware(object):
+    """Collect cache tags while serving a request and send them in a header.
+
+    Tags are sorted so that responses are tagged consistently, and if there
+    are more than Akamai accepts, none are sent, so that the response is
+    only invalidated by URL.
+    """
+    def process_request(self, request):
+        _local.tags = set()
+
+    def process_response(self, request, response):
+        tags = getattr(_local, 'tags', None)
+        _local.tags = None
+
+        if tags and len(tags) <= MAX_TAGS:
+            response[HEADER] = ','.join(
+                sorted(get_cache_tag(tag) for tag in tags)
+            )
+
+        return response
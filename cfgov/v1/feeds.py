@@ -1,6 +1,13 @@
+import calendar
+import hashlib
 from datetime import datetime
 
 from django.contrib.syndication.views import Feed
+from django.core.cache import caches
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.encoding import force_bytes
+from django.utils.http import http_date, quote_etag
 
 from wagtail.wagtailcore.url_routing import RouteResult
 
@@ -13,9 +20,9 @@ eastern = pytz.timezone('US/Eastern')
 class FilterableFeed(Feed):
     item_guid_is_permalink = False
 
-    def __init__(self, page, context):
+    def __init__(self, page, items):
         self.page = page
-        self.context = context
+        self._items = items
 
     def link(self):
         return self.page.full_url
@@ -24,8 +31,7 @@ class FilterableFeed(Feed):
         return "%s | Consumer Financial Protection Bureau" % self.page.title
 
     def items(self):
-        posts = self.context['filter_data']['page_set']
-        return posts
+        return self._items
 
     def item_link(self, item):
         return item.full_url
@@ -48,6 +54,96 @@ class FilterableFeed(Feed):
         return "%s<>consumerfinance.gov" % item.page_ptr_id
 
 
+class FeedCache(object):
+    """A store of serialized feeds of filterable list pages.
+
+    The XML of each feed is kept in the default cache, keyed by the page,
+    the filters that were requested, and the scheme and host of the request,
+    because feeds contain absolute links to that host. Feeds are served
+    with an ETag of their content and a Last-Modified date of their newest
+    item, so that clients that already have the latest feed get a 304 Not
+    Modified response.
+
+    Every stored feed is invalidated at once by changing a version stored
+    in the database as a CacheVersion, so that feeds kept on every server
+    are invalidated. This happens whenever a page is published,
+    unpublished, moved, or deleted, or whenever page tags change; see
+    v1.wagtail_hooks.
+    """
+    cache_name = 'default'
+    version_name = 'filterable_feed'
+
+    @property
+    def cache(self):
+        return caches[self.cache_name]
+
+    def get_version(self):
+        from v1.models.caching import CacheVersion
+        return CacheVersion.current(self.version_name)
+
+    def invalidate(self):
+        from v1.models.caching import CacheVersion
+        CacheVersion.bump(self.version_name)
+
+    def get_key(self, page, request, form_data):
+        return 'filterable_feed_{}_{}'.format(
+            self.get_version(),
+            hashlib.sha1(force_bytes(repr((
+                page.pk,
+                request.scheme,
+                request.get_host(),
+                sorted(form_data.items()),
+            )))).hexdigest()
+        )
+
+    def render(self, page, request, form_data):
+        feed = FilterableFeed(page, page.get_feed_items(form_data))
+        response = feed(request)
+
+        items = feed.items()
+        last_modified = None
+        if items:
+            newest = max(items, key=lambda item: item.date_published)
+            last_modified = calendar.timegm(
+                feed.item_pubdate(newest).utctimetuple()
+            )
+
+        return {
+            'content': response.content,
+            'content_type': response['Content-Type'],
+            'etag': quote_etag(hashlib.sha1(response.content).hexdigest()),
+            'last_modified': last_modified,
+        }
+
+    def serve(self, page, request):
+        form_data, _ = page.get_form_data(request.GET)
+        key = self.get_key(page, request, form_data)
+        feed = self.cache.get(key)
+
+        if feed is None:
+            feed = self.render(page, request, form_data)
+            self.cache.set(key, feed)
+
+        response = HttpResponse(
+            feed['content'],
+            content_type=feed['content_type']
+        )
+        response['ETag'] = feed['etag']
+
+        if feed['last_modified'] is not None:
+            response['Last-Modified'] = http_date(feed['last_modified'])
+
+        return get_conditional_response(
+            request,
+            etag=feed['etag'],
+            last_modified=feed['last_modified'],
+            response=response
+        )
+
+
+feed_cache = FeedCache()
+
+
 class FilterableFeedPageMixin(object):
 
     def route(self, request, path_components):
@@ -59,11 +155,36 @@ class FilterableFeedPageMixin(object):
 
     def serve(self, request, format='html'):
         if format == 'rss':
-            context = self.get_context(request)
-            return FilterableFeed(self, context)(request)
+            return feed_cache.serve(self, request)
         else:
             return super(FilterableFeedPageMixin, self).serve(request)
 
+    def get_feed_items(self, form_data):
+        """Return the newest pages that match a feed's filters.
+
+        Unlike the filterable list itself, a feed only needs matching pages,
+        so topic and author choices aren't loaded, and the categories and
+        tags of every page are loaded together.
+        """
+        from v1.forms import FilterableListForm
+
+        form = FilterableListForm(
+            form_data,
+            filterable_pages=self.filterable_pages(),
+            load_facets=False
+        )
+
+        if not form.is_valid():
+            return []
+
+        # Page tags are read through their ParentalKey relation, so that
+        # relation is prefetched rather than the tags manager itself.
+        return list(
+            form.get_page_set()
+            .prefetch_related('categories', 'cfgovtaggedpages_set__tag')
+            [:self.filterable_per_page_limit]
+        )
+
 
 def get_appropriate_rss_feed_url_for_page(page, request=None):
     """Given a page, return the most appropriate RSS feed for it to link to.
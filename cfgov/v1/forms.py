@@ -1,4 +1,3 @@
-from collections import Counter
 from datetime import date
 
 from django import forms
@@ -6,11 +5,10 @@ from django.core.exceptions import ValidationError
 from django.db.models import Q
 from django.forms import widgets
 
-from taggit.models import Tag
-
 from v1.util import ERROR_MESSAGES, ref
 from v1.util.categories import clean_categories
 from v1.util.date_filter import end_of_time_period
+from v1.util.filterable_facets import filterable_facets
 
 from .models.base import Feedback
 
@@ -112,18 +110,29 @@ class FilterableListForm(forms.Form):
 
     def __init__(self, *args, **kwargs):
         self.filterable_pages = kwargs.pop('filterable_pages')
+        load_facets = kwargs.pop('load_facets', True)
         super(FilterableListForm, self).__init__(*args, **kwargs)
 
         clean_categories(selected_categories=self.data.get('categories'))
 
-        page_ids = self.filterable_pages.values_list('id', flat=True)
-        self.set_topics(page_ids)
-        self.set_authors(page_ids)
+        if load_facets:
+            facets = filterable_facets.get(self.filterable_pages)
+            self.set_topics(facets['topics'])
+            self.set_authors(facets['authors'])
+        else:
+            # Without facets, accept any author; unknown authors simply
+            # match no pages.
+            authors = self.fields['authors']
+            authors.choices = [
+                (slug, slug) for slug in authors.widget.value_from_datadict(
+                    self.data, self.files, self.add_prefix('authors')
+                ) or []
+            ]
 
     def get_page_set(self):
         query = self.generate_query()
         return self.filterable_pages.filter(query).distinct().order_by(
-            '-date_published'
+            '-date_published', '-pk'
         )
 
     def first_page_date(self):
@@ -133,23 +142,17 @@ class FilterableListForm(forms.Form):
         else:
             return date(2010, 1, 1)
 
-    def prepare_options(self, arr):
+    def prepare_options(self, counts):
         """
         Returns an ordered list of tuples of the format
         ('tag-slug-name', 'Tag Display Name')
+        from a list of tag counts ordered from most to least common
         """
-        arr = Counter(arr).most_common()  # Order by most to least common
-        # Grab only the first tuple in the generated tuple,
-        # which includes a count we do not need
-        return [x[0] for x in arr]
+        return [(slug, name) for slug, name, count in counts]
 
     # Populate Topics' choices
-    def set_topics(self, page_ids):
-        tags = Tag.objects.filter(
-            v1_cfgovtaggedpages_items__content_object__id__in=page_ids
-        ).values_list('slug', 'name')
-
-        options = self.prepare_options(arr=tags)
+    def set_topics(self, counts):
+        options = self.prepare_options(counts)
         most = options[:3]
         other = options[3:]
 
@@ -158,13 +161,8 @@ class FilterableListForm(forms.Form):
              ('All other topics', other))
 
     # Populate Authors' choices
-    def set_authors(self, page_ids):
-        authors = Tag.objects.filter(
-            v1_cfgovauthoredpages_items__content_object__id__in=page_ids
-        ).values_list('slug', 'name')
-        options = self.prepare_options(arr=authors)
-
-        self.fields['authors'].choices = options
+    def set_authors(self, counts):
+        self.fields['authors'].choices = self.prepare_options(counts)
 
     def clean(self):
         cleaned_data = super(FilterableListForm, self).clean()
@@ -1,14 +1,18 @@
 from __future__ import absolute_import
 
+import errno
+import os
 import os.path
 
+from django.conf import settings
 from django.contrib import messages
 from django.contrib.staticfiles.storage import staticfiles_storage
 from django.core.urlresolvers import reverse
 from django.template.defaultfilters import linebreaksbr, pluralize, slugify
+from django.utils import six
 from django.utils.translation import ugettext, ungettext
 
-from jinja2 import Environment
+from jinja2 import Environment, FileSystemBytecodeCache
 
 
 class RelativeTemplatePathEnvironment(Environment):
@@ -36,8 +40,35 @@ class RelativeTemplatePathEnvironment(Environment):
 
     This logic adds relative paths to the template search tree, that take
     precendence over the default loader source directories.
+
+    Finding a relative path checks the filesystem for every candidate path
+    in every search directory, and happens on every include or import, so
+    resolved paths are kept in memory for the life of the process, keyed by
+    template and parent. When templates are reloaded as they change, which
+    Django does when DEBUG is on, paths are resolved every time instead, so
+    that new templates are found.
     """
+    def __init__(self, *args, **kwargs):
+        super(RelativeTemplatePathEnvironment, self).__init__(*args, **kwargs)
+        self.cache_join_paths = not self.auto_reload
+        self.join_path_cache = {}
+
     def join_path(self, template, parent):
+        if not self.cache_join_paths:
+            return self.resolve_path(template, parent)
+
+        key = (template, parent)
+
+        try:
+            return self.join_path_cache[key]
+        except KeyError:
+            path = self.join_path_cache[key] = self.resolve_path(
+                template,
+                parent
+            )
+            return path
+
+    def resolve_path(self, template, parent):
         dirname = os.path.dirname(parent)
         segments = dirname.split('/')
         paths = []
@@ -62,7 +93,38 @@ class JinjaTranslations(object):
         return ungettext(singular, plural, number)
 
 
+def get_bytecode_cache(directory):
+    """Return a cache that stores compiled templates in a directory.
+
+    Compiled templates are keyed by template name and path, and are only
+    used while their source is unchanged, so the directory can be kept
+    across deploys.
+    """
+    try:
+        os.makedirs(directory)
+    except OSError as e:
+        if e.errno != errno.EEXIST:
+            raise
+
+    return FileSystemBytecodeCache(directory)
+
+
 def environment(**options):
+    if settings.JINJA2_BYTECODE_CACHE_DIR:
+        options.setdefault(
+            'bytecode_cache',
+            get_bytecode_cache(settings.JINJA2_BYTECODE_CACHE_DIR)
+        )
+
+        # Template directories in settings are unipath.Path objects, which
+        # become the file names of compiled templates, but compiled templates
+        # can only be stored with plain string file names.
+        loader = options.get('loader')
+        if hasattr(loader, 'searchpath'):
+            loader.searchpath = [
+                six.text_type(path) for path in loader.searchpath
+            ]
+
     env = RelativeTemplatePathEnvironment(**options)
     env.autoescape = True
 
@@ -1,9 +1,177 @@
 # Based off of http://jinja.pocoo.org/docs/2.10/extensions/
+import hashlib
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from django.conf import settings
 from django.core.cache import caches
+from django.utils.encoding import force_bytes
 
 from jinja2 import nodes
 from jinja2.ext import Extension
 
+from v1.cache_tags import add_cache_tags
+
+
+# How often to check for a fragment that another process is rendering.
+LOCK_POLL_INTERVAL = 0.05
+
+
+class LocalFragmentCache(object):
+    """A per-process LRU cache of rendered fragments.
+
+    This sits in front of the shared cache backends so that frequently used
+    fragments don't require a round trip to those backends on each request.
+    It holds up to settings.FRAGMENT_CACHE_LOCAL_MAX_ENTRIES fragments, and is
+    disabled if that setting is 0.
+
+    Fragments and tag versions that are deleted through delete_fragment are
+    removed from this process immediately, but other processes may keep
+    serving their copies for up to settings.FRAGMENT_CACHE_LOCAL_TIMEOUT
+    seconds.
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.clear()
+
+    def clear(self):
+        with self.lock:
+            self.entries = OrderedDict()
+
+    def get(self, cache_name, key):
+        if not settings.FRAGMENT_CACHE_LOCAL_MAX_ENTRIES:
+            return None
+
+        with self.lock:
+            entry = self.entries.pop((cache_name, key), None)
+            if entry is None:
+                return None
+
+            value, expires = entry
+            if expires <= time.time():
+                return None
+
+            self.entries[(cache_name, key)] = entry
+            return value
+
+    def set(self, cache_name, key, value):
+        max_entries = settings.FRAGMENT_CACHE_LOCAL_MAX_ENTRIES
+        if not max_entries:
+            return
+
+        expires = time.time() + settings.FRAGMENT_CACHE_LOCAL_TIMEOUT
+
+        with self.lock:
+            self.entries.pop((cache_name, key), None)
+            self.entries[(cache_name, key)] = (value, expires)
+
+            while len(self.entries) > max_entries:
+                self.entries.popitem(last=False)
+
+    def delete(self, cache_name, key):
+        with self.lock:
+            self.entries.pop((cache_name, key), None)
+
+
+local_fragment_cache = LocalFragmentCache()
+
+
+def delete_fragment(cache_name, *keys):
+    """Delete cached fragments from all cache tiers."""
+    caches[cache_name].delete_many(keys)
+
+    for key in keys:
+        local_fragment_cache.delete(cache_name, key)
+
+
+TAG_VERSION_KEY = 'fragment_tag_{}'
+
+
+def get_instance_tags(instance):
+    """Return the fragment cache tags that depend on a model instance.
+
+    Each instance has a tag for its model, like "v1.menuitem", and a tag
+    for itself, like "v1.menuitem:1". Instances of models that inherit from
+    other models, like Wagtail pages, also have tags for those models, so
+    that any page can be referred to as "wagtailcore.page:<id>".
+    """
+    tags = []
+
+    for model in [type(instance)] + instance._meta.get_parent_list():
+        label = model._meta.label_lower
+        tags.extend([label, '{}:{}'.format(label, instance.pk)])
+
+    return tags
+
+
+def invalidate_fragment_tags(*tags):
+    """Evict all cached fragments that depend on any of the given tags.
+
+    Each tag has a version that is part of the cache key of every fragment
+    that depends on it. Deleting those versions from every cache in
+    settings.FRAGMENT_CACHE_NAMES means that dependent fragments will no
+    longer be found, without having to look them up; they expire from their
+    caches as usual.
+    """
+    keys = [TAG_VERSION_KEY.format(tag) for tag in tags]
+
+    for cache_name in settings.FRAGMENT_CACHE_NAMES:
+        if cache_name in settings.CACHES:
+            delete_fragment(cache_name, *keys)
+
+
+def get_tag_versions(cache_name, tag_keys):
+    """Return the versions of fragment tags, creating any that are missing.
+
+    Versions are kept in the local fragment cache like fragments are, so
+    that fragments found locally don't need a round trip to the shared
+    cache for their tags.
+    """
+    versions = {}
+
+    for tag_key in tag_keys:
+        version = local_fragment_cache.get(cache_name, tag_key)
+        if version is not None:
+            versions[tag_key] = version
+
+    missing = [tag_key for tag_key in tag_keys if tag_key not in versions]
+    if not missing:
+        return versions
+
+    fragment_cache = caches[cache_name]
+    versions.update(fragment_cache.get_many(missing))
+
+    for tag_key in missing:
+        if tag_key not in versions:
+            version = uuid.uuid4().hex
+
+            # Another process may have created this version at the same time.
+            if not fragment_cache.add(tag_key, version, None):
+                version = fragment_cache.get(tag_key, version)
+
+            versions[tag_key] = version
+
+        local_fragment_cache.set(cache_name, tag_key, versions[tag_key])
+
+    return versions
+
+
+def get_tagged_key(cache_name, key, tags):
+    """Return the cache key of a fragment that depends on the given tags."""
+    if not tags:
+        return key
+
+    tag_keys = [TAG_VERSION_KEY.format(tag) for tag in sorted(set(tags))]
+    versions = get_tag_versions(cache_name, tag_keys)
+
+    digest = hashlib.md5(force_bytes(
+        ':'.join(versions[tag_key] for tag_key in tag_keys)
+    ))
+
+    return '{}_{}'.format(key, digest.hexdigest())
+
 
 class FragmentCacheExtension(Extension):
     # a set of names that trigger the extension.
@@ -25,10 +193,23 @@ class FragmentCacheExtension(Extension):
 
         # If there is a third argument, the user provided a timeout.
         # If not use None
-        if parser.stream.skip_if('comma'):
-            args.append(parser.parse_expression())
-        else:
-            args.append(nodes.Const(None))
+        timeout = nodes.Const(None)
+
+        # Fragments may also depend on a list of tags passed as tags=[...],
+        # which invalidate the fragment when they are passed to
+        # invalidate_fragment_tags.
+        tags = nodes.Const(None)
+
+        while parser.stream.skip_if('comma'):
+            if (parser.stream.current.test('name:tags') and
+                    parser.stream.look().test('assign')):
+                next(parser.stream)
+                next(parser.stream)
+                tags = parser.parse_expression()
+            else:
+                timeout = parser.parse_expression()
+
+        args.extend([timeout, tags])
 
         # now we parse the body of the cache block up to `endcache` and
         # drop the needle (which would always be `endcache` in that case)
@@ -39,15 +220,56 @@ class FragmentCacheExtension(Extension):
         return nodes.CallBlock(self.call_method('_cache_support', args),
                                [], [], body).set_lineno(lineno)
 
-    def _cache_support(self, key, cache_name, timeout, caller):
+    def _cache_support(self, key, cache_name, timeout, tags, caller):
         """Helper callback."""
         fragment_cache = caches[cache_name]
+        key = get_tagged_key(cache_name, key, tags)
+
+        # Responses that include this fragment depend on its tags too.
+        if tags:
+            add_cache_tags(*tags)
+
+        rv = local_fragment_cache.get(cache_name, key)
+        if rv is not None:
+            return rv
+
         # try to load the block from the cache
         # if there is no fragment in the cache, render it and store
         # it in the cache.
         rv = fragment_cache.get(key)
         if rv is not None:
+            # Only fragments that have been stored in the shared cache are
+            # kept locally, so that local copies can't outlive it.
+            local_fragment_cache.set(cache_name, key, rv)
+            return rv
+
+        return self._render(fragment_cache, key, timeout, caller)
+
+    def _render(self, fragment_cache, key, timeout, caller):
+        """Render a fragment that is missing from the cache.
+
+        Only the process that acquires a lock in the shared cache renders
+        and stores the fragment; others wait for that fragment to be stored,
+        up to settings.FRAGMENT_CACHE_LOCK_TIMEOUT seconds, before rendering
+        it themselves. This prevents every process from rendering the same
+        fragment at once when it expires or is deleted.
+        """
+        lock_key = '{}:lock'.format(key)
+        lock_timeout = settings.FRAGMENT_CACHE_LOCK_TIMEOUT
+
+        if fragment_cache.add(lock_key, True, lock_timeout):
+            try:
+                rv = caller()
+                fragment_cache.add(key, rv, timeout)
+            finally:
+                fragment_cache.delete(lock_key)
             return rv
-        rv = caller()
-        fragment_cache.add(key, rv, timeout)
-        return rv
+
+        deadline = time.time() + lock_timeout
+        while time.time() < deadline:
+            time.sleep(LOCK_POLL_INTERVAL)
+            rv = fragment_cache.get(key)
+            if rv is not None:
+                return rv
+
+        return caller()
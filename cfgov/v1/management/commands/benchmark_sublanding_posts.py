@@ -0,0 +1,138 @@
+from __future__ import unicode_literals
+
+import timeit
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from wagtail.wagtailcore.models import Page
+
+from v1.forms import FilterableListForm
+from v1.models import (
+    AbstractFilterPage, BrowseFilterablePage, CFGOVPage, SublandingPage
+)
+from v1.util.sublanding_posts import sublanding_posts
+
+
+class Rollback(Exception):
+    pass
+
+
+def get_posts_with_forms(page, limit):
+    """Select posts the way that sublanding pages used to.
+
+    Each filterable page below the sublanding page is loaded in its specific
+    form and given its own FilterableListForm, and every one of their posts
+    is loaded and sorted in Python.
+    """
+    filter_pages = [p.specific
+                    for p in page.get_appropriate_descendants()
+                    if 'FilterablePage' in p.specific_class.__name__
+                    and 'archive' not in p.title.lower()]
+    posts_list = []
+    for filter_page in filter_pages:
+        eligible_children = AbstractFilterPage.objects.live().filter(
+            CFGOVPage.objects.child_of_q(filter_page)
+        )
+
+        form = FilterableListForm(filterable_pages=eligible_children)
+        for post in form.get_page_set():
+            posts_list.append(post)
+    return sorted(posts_list,
+                  key=lambda p: p.date_published,
+                  reverse=True)[:limit]
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare the time taken to select the posts previewed on a '
+        'sublanding page with a form per filterable page and with a single '
+        'query. A temporary page tree is built for the comparison and is '
+        'rolled back afterwards.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--filterable-pages',
+            type=int,
+            default=6,
+            help='Number of filterable pages below the sublanding page'
+        )
+        parser.add_argument(
+            '--posts',
+            type=int,
+            default=400,
+            help='Number of posts below each filterable page'
+        )
+        parser.add_argument(
+            '--limit',
+            type=int,
+            default=5,
+            help='Number of posts to select'
+        )
+        parser.add_argument(
+            '--iterations',
+            type=int,
+            default=10,
+            help='Number of times to select posts'
+        )
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self.run(**options)
+                raise Rollback
+        except Rollback:
+            pass
+        finally:
+            sublanding_posts.invalidate()
+
+    def build_tree(self, filterable_pages, posts):
+        root = Page.get_first_root_node()
+        sublanding_page = root.add_child(instance=SublandingPage(
+            title='Benchmark sublanding page',
+            slug='benchmark-sublanding-page'
+        ))
+
+        first_date = date(2010, 1, 1)
+
+        for i in range(filterable_pages):
+            filterable_page = sublanding_page.add_child(
+                instance=BrowseFilterablePage(
+                    title='Filterable page {}'.format(i),
+                    slug='filterable-page-{}'.format(i)
+                )
+            )
+
+            for j in range(posts):
+                filterable_page.add_child(instance=AbstractFilterPage(
+                    title='Post {}'.format(j),
+                    slug='post-{}'.format(j),
+                    date_published=first_date + timedelta(days=i + j * 3)
+                ))
+
+        return sublanding_page
+
+    def run(self, filterable_pages, posts, limit, iterations, **options):
+        self.stdout.write('Building {} filterable pages of {} posts'.format(
+            filterable_pages,
+            posts
+        ))
+        page = self.build_tree(filterable_pages, posts)
+
+        for label, func in (
+            ('FilterableListForm per page', get_posts_with_forms),
+            ('single query', lambda page, limit: list(
+                page.get_browsefilterable_queryset()[:limit]
+            )),
+            ('cached', sublanding_posts.get),
+        ):
+            seconds = timeit.timeit(
+                lambda: func(page, limit),
+                number=iterations
+            )
+            self.stdout.write('{}: {:.2f} milliseconds per selection'.format(
+                label,
+                seconds * 1e3 / iterations
+            ))
@@ -0,0 +1,135 @@
+from __future__ import unicode_literals
+
+import json
+import timeit
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.template import engines
+from django.test import RequestFactory
+
+from wagtail.wagtailcore.models import Site
+
+from v1.models import BrowsePage
+
+
+class Rollback(Exception):
+    pass
+
+
+def get_heavy_content(repeat):
+    """Return BrowsePage content with many nested atomic element includes."""
+    link = {'text': 'Link', 'url': '/'}
+    heading = {'text': 'Heading', 'level': 'h3'}
+
+    content = []
+
+    for i in range(repeat):
+        content.extend([
+            {
+                'type': 'full_width_text',
+                'value': [
+                    {'type': 'heading', 'value': heading},
+                    {'type': 'content', 'value': '<p>Paragraph</p>'},
+                    {'type': 'related_links', 'value': {
+                        'heading': 'Related links',
+                        'links': [link] * 3,
+                    }},
+                ],
+            },
+            {
+                'type': 'info_unit_group',
+                'value': {
+                    'format': '50-50',
+                    'info_units': [{
+                        'heading': heading,
+                        'body': '<p>Body</p>',
+                        'links': [link] * 2,
+                    }] * 4,
+                },
+            },
+            {
+                'type': 'expandable_group',
+                'value': {
+                    'heading': 'Expandables',
+                    'expandables': [{
+                        'label': 'Expandable',
+                        'content': [
+                            {'type': 'paragraph', 'value': '<p>Text</p>'},
+                            {'type': 'links', 'value': link},
+                        ],
+                    }] * 3,
+                },
+            },
+        ])
+
+    return json.dumps(content)
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare the time taken to render a BrowsePage with many nested '
+        'includes when relative template paths are resolved on every '
+        'include and when they are kept in memory. A temporary page is '
+        'created for the comparison and is rolled back afterwards.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=10,
+            help='Number of times to repeat each group of content blocks'
+        )
+        parser.add_argument(
+            '--iterations',
+            type=int,
+            default=20,
+            help='Number of times to render the page'
+        )
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self.run(**options)
+                raise Rollback
+        except Rollback:
+            pass
+
+    def run(self, repeat, iterations, **options):
+        site = Site.objects.get(is_default_site=True)
+        page = site.root_page.add_child(instance=BrowsePage(
+            title='Benchmark browse page',
+            slug='benchmark-browse-page',
+            content=get_heavy_content(repeat)
+        ))
+
+        request = RequestFactory().get(page.url)
+        request.user = AnonymousUser()
+        request.site = site
+
+        def render():
+            page.serve(request).render()
+
+        env = engines['wagtail-env'].env
+        cache_join_paths = env.cache_join_paths
+
+        # Render once first, so that every template is already compiled.
+        render()
+
+        try:
+            for label, cached in (
+                ('resolved on every include', False),
+                ('kept in memory', True),
+            ):
+                env.cache_join_paths = cached
+                env.join_path_cache.clear()
+
+                seconds = timeit.timeit(render, number=iterations)
+                self.stdout.write(
+                    'Relative template paths {}: {:.2f} milliseconds '
+                    'per render'.format(label, seconds * 1e3 / iterations)
+                )
+        finally:
+            env.cache_join_paths = cache_join_paths
@@ -0,0 +1,39 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from v1 import purge_queue
+
+
+class Command(BaseCommand):
+    help = 'Sends queued purges to the front-end cache backends'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep draining the queue until interrupted'
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=10,
+            help='Seconds to wait between drains when looping'
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            stats = purge_queue.drain()
+
+            if stats['purged'] or stats['failed']:
+                self.stdout.write(
+                    'Purged {purged}, failed {failed} in {seconds:.2f} '
+                    'seconds, {latency:.2f} seconds after queueing'.format(
+                        **stats
+                    )
+                )
+
+            if not options['loop']:
+                break
+
+            time.sleep(options['interval'])
@@ -0,0 +1,46 @@
+import multiprocessing
+
+from django.core.management.base import BaseCommand
+
+from v1.models import CFGOVImage, CFGOVPage
+from v1.renditions import (
+    DEFAULT_FILTER_SPECS, generate_renditions, get_missing_renditions,
+    get_page_renditions
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Generates missing image renditions: the default renditions of '
+        'every image, and every rendition used by live pages'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--processes',
+            type=int,
+            default=multiprocessing.cpu_count(),
+            help='Number of processes to generate renditions with'
+        )
+
+    def handle(self, *args, **options):
+        renditions = set(
+            (image_id, filter_spec)
+            for image_id in CFGOVImage.objects.values_list('pk', flat=True)
+            for filter_spec in DEFAULT_FILTER_SPECS
+        )
+
+        for page in CFGOVPage.objects.live().specific().iterator():
+            renditions.update(get_page_renditions(page))
+
+        missing = get_missing_renditions(renditions)
+        self.stdout.write('Generating {} of {} renditions'.format(
+            len(missing),
+            len(renditions)
+        ))
+
+        stats = generate_renditions(missing, processes=options['processes'])
+        self.stdout.write(
+            'Generated {generated} renditions in {seconds:.2f} seconds, '
+            '{per_second:.1f} per second, {failed} failed'.format(**stats)
+        )
@@ -0,0 +1,53 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.template import engines
+from django.template.backends.jinja2 import Jinja2
+
+from jinja2 import TemplateSyntaxError
+
+
+class Command(BaseCommand):
+    help = (
+        'Compiles every Jinja2 template, storing them in the bytecode cache '
+        'if JINJA2_BYTECODE_CACHE_DIR is set, and fails if any template has '
+        'a syntax error'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--extension',
+            action='append',
+            dest='extensions',
+            help='Extension of template files to compile; defaults to html'
+        )
+
+    def handle(self, *args, **options):
+        extensions = options['extensions'] or ['html']
+        errors = []
+
+        for engine in engines.all():
+            if not isinstance(engine, Jinja2):
+                continue
+
+            env = engine.env
+            names = env.list_templates(extensions=extensions)
+
+            for name in names:
+                try:
+                    env.get_template(name)
+                except TemplateSyntaxError as e:
+                    errors.append('{}, line {}: {}'.format(
+                        e.filename or name,
+                        e.lineno,
+                        e.message
+                    ))
+
+            self.stdout.write('Compiled {} templates for {}{}'.format(
+                len(names),
+                engine.name,
+                '' if env.bytecode_cache else ' (no bytecode cache is set)'
+            ))
+
+        if errors:
+            raise CommandError(
+                'Templates with syntax errors:\n' + '\n'.join(errors)
+            )
@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+# Filterable lists search page titles with title__icontains, which Django
+# runs on PostgreSQL as UPPER(title) LIKE UPPER(%s). A trigram index on that
+# expression lets those searches use an index instead of scanning every page.
+TITLE_INDEX_NAME = 'v1_page_title_trgm_idx'
+
+
+def create_title_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    schema_editor.execute(
+        'CREATE INDEX IF NOT EXISTS {} ON wagtailcore_page '
+        'USING gin (UPPER(title) gin_trgm_ops)'.format(TITLE_INDEX_NAME)
+    )
+
+
+def drop_title_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    schema_editor.execute('DROP INDEX IF EXISTS {}'.format(TITLE_INDEX_NAME))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('v1', '0159_spanishhomepage'),
+        ('wagtailcore', '0040_page_draft_title'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='abstractfilterpage',
+            index=models.Index(
+                fields=['date_published', 'cfgovpage_ptr'],
+                name='v1_filterpage_date_idx'
+            ),
+        ),
+        migrations.RunPython(create_title_index, drop_title_index),
+    ]
@@ -0,0 +1,28 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.20 on 2026-10-17 12:01
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('v1', '0160_filterable_list_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CDNPurgeRequest',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created', models.DateTimeField(auto_now_add=True)),
+                ('backend', models.CharField(max_length=255)),
+                ('kind', models.CharField(choices=[('url', 'URL'), ('tag', 'Cache tag')], max_length=3)),
+                ('value', models.CharField(max_length=2083)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('next_attempt', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+            ],
+        ),
+    ]
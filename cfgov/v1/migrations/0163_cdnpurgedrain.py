@@ -0,0 +1,26 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.20 on 2026-10-17 15:40
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('v1', '0162_cacheversion'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CDNPurgeDrain',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('finished', models.DateTimeField()),
+                ('seconds', models.FloatField()),
+                ('purged', models.PositiveIntegerField()),
+                ('failed', models.PositiveIntegerField()),
+                ('latency', models.FloatField()),
+            ],
+        ),
+    ]
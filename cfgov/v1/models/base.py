@@ -6,7 +6,7 @@ from django.db import models
 from django.http import HttpResponse, HttpResponseBadRequest, JsonResponse
 from django.template.response import TemplateResponse
 from django.utils import timezone, translation
-from django.utils.module_loading import import_string
+from django.utils.functional import cached_property
 from django.utils.translation import ugettext_lazy as _
 
 from wagtail.wagtailadmin.edit_handlers import (
@@ -24,13 +24,23 @@ from wagtail.wagtailsearch import index
 from modelcluster.fields import ParentalKey
 from modelcluster.tags import ClusterTaggableManager
 from taggit.models import TaggedItemBase
-from wagtailinventory.helpers import get_page_blocks
 
 from v1 import blocks as v1_blocks
 from v1.atomic_elements import molecules, organisms
 from v1.models.snippets import ReusableText
 from v1.util import ref
-from v1.util.util import validate_social_sharing_image
+from v1.util.page_blocks import get_block_js, page_blocks
+from v1.util.page_tree import page_tree
+from v1.util.util import BAH_JOURNEY_URLS, validate_social_sharing_image
+
+
+# Page types that other pages can be filtered from. See get_filter_data.
+FILTER_PAGE_TYPES = (
+    'BrowseFilterablePage',
+    'SublandingFilterablePage',
+    'EventArchivePage',
+    'NewsroomLandingPage',
+)
 
 
 class CFGOVAuthoredPages(TaggedItemBase):
@@ -161,19 +171,33 @@ class CFGOVPage(Page):
         return tags
 
     def get_filter_data(self):
+        ancestors = page_tree.get_ancestors(self)
+
+        if ancestors is None:
+            return self._get_filter_data_from_database()
+
+        for ancestor in reversed(ancestors):
+            if ancestor.specific_class.__name__ in FILTER_PAGE_TYPES:
+                return ancestor.get_specific()
+        return None
+
+    def _get_filter_data_from_database(self):
         for ancestor in self.get_ancestors().reverse().specific():
-            if ancestor.specific_class.__name__ in ['BrowseFilterablePage',
-                                                    'SublandingFilterablePage',
-                                                    'EventArchivePage',
-                                                    'NewsroomLandingPage']:
+            if ancestor.specific_class.__name__ in FILTER_PAGE_TYPES:
                 return ancestor
         return None
 
     def get_breadcrumbs(self, request):
-        ancestors = self.get_ancestors()
-        home_page_children = request.site.root_page.get_children()
+        ancestors = page_tree.get_ancestors(self)
+
+        if ancestors is None:
+            ancestors = self.get_ancestors()
+        else:
+            ancestors = [ancestor.as_page() for ancestor in ancestors]
+
+        root_page_id = request.site.root_page_id
         for i, ancestor in enumerate(ancestors):
-            if ancestor in home_page_children:
+            if i > 0 and ancestors[i - 1].pk == root_page_id:
                 # Add top level parent page and `/process/` url segments
                 # where necessary to BAH page breadcrumbs.
                 # TODO: Remove this when BAH moves under /consumer-tools
@@ -182,12 +206,7 @@ class CFGOVPage(Page):
                     breadcrumbs = []
                     for ancestor in ancestors[i:]:
                         ancestor_url = ancestor.relative_url(request.site)
-                        if ancestor_url.startswith((
-                                '/owning-a-home/prepare',
-                                '/owning-a-home/explore',
-                                '/owning-a-home/compare',
-                                '/owning-a-home/close',
-                                '/owning-a-home/sources')):
+                        if BAH_JOURNEY_URLS.matches(ancestor_url):
                             ancestor_url = ancestor_url.replace(
                                 'owning-a-home', 'owning-a-home/process')
                         breadcrumbs.append({
@@ -293,6 +312,10 @@ class CFGOVPage(Page):
         app_label = 'v1'
 
     def parent(self):
+        parent = page_tree.get_parent(self)
+        if parent is not None:
+            return parent.get_specific()
+
         parent = self.get_ancestors(inclusive=False).reverse()[0].specific
         return parent
 
@@ -305,16 +328,13 @@ class CFGOVPage(Page):
     def streamfield_js(self):
         js = []
 
-        block_cls_names = get_page_blocks(self)
-        for block_cls_name in block_cls_names:
-            block_cls = import_string(block_cls_name)
-            if hasattr(block_cls, 'Media') and hasattr(block_cls.Media, 'js'):
-                js.extend(block_cls.Media.js)
+        for block_cls_name in page_blocks.get(self):
+            js.extend(get_block_js(block_cls_name))
 
         return js
 
     # Returns the JS files required by this page and its StreamField blocks.
-    @property
+    @cached_property
     def media(self):
         return sorted(set(self.page_js + self.streamfield_js))
 
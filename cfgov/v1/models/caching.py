@@ -1,15 +1,17 @@
 import json
 import logging
 import os
+import uuid
 
 from django.conf import settings
 from django.contrib.auth.models import User
 from django.db import models
 from django.db.models.signals import post_save
 from django.dispatch import receiver
+from django.utils import timezone
+from django.utils.encoding import force_text
 
 from wagtail.contrib.wagtailfrontendcache.backends import BaseBackend
-from wagtail.contrib.wagtailfrontendcache.utils import PurgeBatch
 from wagtail.wagtaildocs.models import Document
 
 import requests
@@ -28,7 +30,110 @@ class CDNHistory(models.Model):
     user = models.ForeignKey(User)
 
 
+class CDNPurgeRequest(models.Model):
+    """A URL or cache tag waiting to be purged from a front-end cache.
+
+    Purges are queued here instead of being sent while content is saved,
+    and are sent in batches by the drain_purge_queue management command;
+    see v1.purge_queue.
+    """
+    URL = 'url'
+    TAG = 'tag'
+    KIND_CHOICES = (
+        (URL, 'URL'),
+        (TAG, 'Cache tag'),
+    )
+
+    created = models.DateTimeField(auto_now_add=True)
+    backend = models.CharField(max_length=255)
+    kind = models.CharField(max_length=3, choices=KIND_CHOICES)
+    value = models.CharField(max_length=2083)
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt = models.DateTimeField(default=timezone.now, db_index=True)
+
+
+class CDNPurgeDrain(models.Model):
+    """Statistics of the last drain of the CDN purge queue.
+
+    A single row is kept, and is replaced by each drain that sends any
+    purges, so that the CDN Manager can show it on every server.
+    """
+    finished = models.DateTimeField()
+    seconds = models.FloatField()
+    purged = models.PositiveIntegerField()
+    failed = models.PositiveIntegerField()
+    latency = models.FloatField()
+
+
+class PageCacheStats(models.Model):
+    """Running totals of requests served through a page cache.
+
+    Each process adds its own counts to these totals periodically, so that
+    they include requests served by every process on every server; see
+    v1.page_cache.PageCache.
+    """
+    name = models.CharField(max_length=255, unique=True)
+    hits = models.BigIntegerField(default=0)
+    misses = models.BigIntegerField(default=0)
+    bypasses = models.BigIntegerField(default=0)
+
+    @classmethod
+    def add(cls, name, counts):
+        """Add counts, given by field name, to the totals of a cache."""
+        cls.objects.get_or_create(name=name)
+        cls.objects.filter(name=name).update(**dict(
+            (field, models.F(field) + count)
+            for field, count in counts.items()
+        ))
+
+
+class CacheVersion(models.Model):
+    """A version of a cache that is kept separately on each server.
+
+    Caches kept in memory or in a per-server cache backend store the
+    version that they were built from, and compare it with this one to
+    find out when another server has changed their content.
+    """
+    name = models.CharField(max_length=255, unique=True)
+    version = models.CharField(max_length=32)
+    updated = models.DateTimeField(auto_now=True)
+
+    @classmethod
+    def current(cls, name):
+        """Return the current version of a cache, creating it if needed.
+
+        Versions are always returned as text, whether or not they were just
+        created, so that they compare and hash the same way on Python 2.
+        """
+        version = cls.objects.filter(name=name).values_list(
+            'version',
+            flat=True
+        ).first()
+
+        if version is None:
+            version = cls.objects.get_or_create(
+                name=name,
+                defaults={'version': uuid.uuid4().hex}
+            )[0].version
+
+        return force_text(version)
+
+    @classmethod
+    def bump(cls, name):
+        """Change the version of a cache, and return the new version."""
+        version = force_text(uuid.uuid4().hex)
+        cls.objects.update_or_create(
+            name=name,
+            defaults={'version': version}
+        )
+        return version
+
+
 class AkamaiBackend(BaseBackend):
+    # Fast Purge requests are limited to 50,000 bytes, which leaves room for
+    # a few hundred URLs or cache tags.
+    max_batch_size = 250
+
     def __init__(self, params):
         self.client_token = params.get('CLIENT_TOKEN')
         self.client_secret = params.get('CLIENT_SECRET')
@@ -55,41 +160,67 @@ class AkamaiBackend(BaseBackend):
     def get_payload(self, obj):
         return {
             'action': 'invalidate',
-            'objects': [obj]
+            'objects': obj if isinstance(obj, list) else [obj]
         }
 
-    def purge(self, url):
+    def post_purge(self, purge_url, obj, description):
         resp = requests.post(
-            os.environ['AKAMAI_FAST_PURGE_URL'],
+            purge_url,
             headers=self.headers,
-            data=json.dumps(self.get_payload(obj=url)),
+            data=json.dumps(self.get_payload(obj=obj)),
             auth=self.auth
         )
         logger.info(
-            u'Attempted to invalidate page {url}, '
+            u'Attempted to invalidate {description}, '
             'got back response {message}'.format(
-                url=url,
+                description=description,
                 message=resp.text
             )
         )
         resp.raise_for_status()
 
+    def purge(self, url):
+        self.post_purge(
+            os.environ['AKAMAI_FAST_PURGE_URL'],
+            url,
+            u'page {}'.format(url)
+        )
+
+    def purge_batch(self, urls):
+        """Invalidate a list of URLs with a single request."""
+        urls = list(urls)
+        if urls:
+            self.post_purge(
+                os.environ['AKAMAI_FAST_PURGE_URL'],
+                urls,
+                u'pages {}'.format(', '.join(urls))
+            )
+
+    @property
+    def can_purge_tags(self):
+        return bool(os.environ.get('AKAMAI_FAST_PURGE_TAG_URL'))
+
+    def purge_tags(self, tags):
+        """Invalidate every object with any of the given cache tags.
+
+        Cache tags are sent by pages in an Edge-Cache-Tag header; see
+        v1.cache_tags.
+        """
+        tags = list(tags)
+        if tags:
+            self.post_purge(
+                os.environ['AKAMAI_FAST_PURGE_TAG_URL'],
+                tags,
+                u'cache tags {}'.format(', '.join(tags))
+            )
+
     def purge_all(self):
         obj = os.environ['AKAMAI_OBJECT_ID']
-        resp = requests.post(
+        self.post_purge(
             os.environ['AKAMAI_PURGE_ALL_URL'],
-            headers=self.headers,
-            data=json.dumps(self.get_payload(obj=obj)),
-            auth=self.auth
+            obj,
+            u'content provider {}'.format(obj)
         )
-        logger.info(
-            u'Attempted to invalidate content provider {obj}, '
-            'got back response {message}'.format(
-                obj=obj,
-                message=resp.text
-            )
-        )
-        resp.raise_for_status()
 
 
 @receiver(post_save, sender=Document)
@@ -103,8 +234,7 @@ def cloudfront_cache_invalidation(sender, instance, **kwargs):
 
     url = instance.file.url
 
-    logger.info('Purging {} from "files" cache'.format(url))
+    logger.info('Queueing purge of {} from "files" cache'.format(url))
 
-    batch = PurgeBatch()
-    batch.add_url(url)
-    batch.purge(backends=['files'])
+    from v1.purge_queue import enqueue_urls
+    enqueue_urls([url], backends=['files'])
@@ -17,17 +17,36 @@ class CFGOVImage(AbstractImage):
         'alt',
     )
 
+    # Existing renditions of this image, keyed by filter spec and focal point
+    # key, when they have been loaded together with those of other images;
+    # see v1.renditions.prefetch_renditions.
+    prefetched_renditions = None
+
     def get_rendition(self, rendition_filter):
         """Always return the source image file for GIF renditions.
 
         CFGOVImage overrides the default Wagtail renditions behavior to
         always embed the original uploaded image file for GIFs, instead of
         generating new versions on the fly.
+
+        Renditions that have been prefetched are returned without a query.
         """
         if self.file.name.endswith('.gif'):
             return self.get_mock_rendition(rendition_filter)
-        else:
-            return super(CFGOVImage, self).get_rendition(rendition_filter)
+
+        if self.prefetched_renditions:
+            if isinstance(rendition_filter, string_types):
+                rendition_filter = Filter(spec=rendition_filter)
+
+            rendition = self.prefetched_renditions.get((
+                rendition_filter.spec,
+                rendition_filter.get_cache_key(self)
+            ))
+
+            if rendition is not None:
+                return rendition
+
+        return super(CFGOVImage, self).get_rendition(rendition_filter)
 
     def get_mock_rendition(self, rendition_filter):
         """Create a mock rendition object that wraps the original image.
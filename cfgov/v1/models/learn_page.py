@@ -76,6 +76,16 @@ class AbstractFilterPage(CFGOVPage):
 
     objects = CFGOVPageManager()
 
+    class Meta:
+        # Filterable lists are ordered on these fields; see
+        # v1.util.pagination.KeysetPaginator.
+        indexes = [
+            models.Index(
+                fields=['date_published', 'cfgovpage_ptr'],
+                name='v1_filterpage_date_idx'
+            ),
+        ]
+
     search_fields = CFGOVPage.search_fields + [
         index.SearchField('header')
     ]
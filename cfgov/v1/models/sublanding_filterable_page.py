@@ -52,6 +52,7 @@ class SublandingFilterablePage(FilterableFeedPageMixin,
     ])
 
     template = 'sublanding-page/index.html'
+    filterable_keyset_pagination = True
 
     objects = PageManager()
 
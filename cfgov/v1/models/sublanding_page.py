@@ -1,20 +1,24 @@
+from django.contrib.contenttypes.models import ContentType
 from django.db import models
+from django.db.models.functions import Length, Substr
 
 from wagtail.wagtailadmin.edit_handlers import (
     FieldPanel, ObjectList, StreamFieldPanel, TabbedInterface
 )
 from wagtail.wagtailcore import blocks
 from wagtail.wagtailcore.fields import StreamField
-from wagtail.wagtailcore.models import PageManager
+from wagtail.wagtailcore.models import Page, PageManager
 from wagtail.wagtailimages.blocks import ImageChooserBlock
 from wagtail.wagtailsearch import index
 
 from jobmanager.blocks import JobListingList
 from v1 import blocks as v1_blocks
 from v1.atomic_elements import molecules, organisms
-from v1.forms import FilterableListForm
 from v1.models.base import CFGOVPage
 from v1.models.learn_page import AbstractFilterPage
+from v1.util.sublanding_posts import (
+    get_filterable_parent_models, sublanding_posts
+)
 
 
 class SublandingPage(CFGOVPage):
@@ -90,20 +94,30 @@ class SublandingPage(CFGOVPage):
         index.SearchField('header')
     ]
 
-    def get_browsefilterable_posts(self, limit):
-        filter_pages = [p.specific
-                        for p in self.get_appropriate_descendants()
-                        if 'FilterablePage' in p.specific_class.__name__
-                        and 'archive' not in p.title.lower()]
-        posts_list = []
-        for page in filter_pages:
-            eligible_children = AbstractFilterPage.objects.live().filter(
-                CFGOVPage.objects.child_of_q(page)
+    def get_browsefilterable_queryset(self):
+        """Return the posts of the filterable pages below this page.
+
+        Posts are the live children of any live filterable page below this
+        one, other than archives, ordered from newest to oldest. They are
+        selected with a single query, which matches each post's parent path
+        against those filterable pages.
+        """
+        filter_pages = Page.objects.live().descendant_of(
+            self, inclusive=True
+        ).filter(
+            content_type__in=ContentType.objects.get_for_models(
+                *get_filterable_parent_models()
+            ).values()
+        ).exclude(title__icontains='archive')
+
+        return AbstractFilterPage.objects.live().descendant_of(self).annotate(
+            parent_path=Substr(
+                'path', 1, Length('path') - Page.steplen,
+                output_field=models.CharField()
             )
+        ).filter(
+            parent_path__in=filter_pages.values('path')
+        ).order_by('-date_published', '-pk')
 
-            form = FilterableListForm(filterable_pages=eligible_children)
-            for post in form.get_page_set():
-                posts_list.append(post)
-        return sorted(posts_list,
-                      key=lambda p: p.date_published,
-                      reverse=True)[:limit]
+    def get_browsefilterable_posts(self, limit):
+        return sublanding_posts.get(self, limit)
@@ -0,0 +1,332 @@
+import hashlib
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.cache import get_conditional_response
+from django.utils.encoding import force_bytes, force_text
+from django.utils.http import quote_etag
+
+from wagtailsharing.models import SharingSite
+
+from flags.middleware import FlagConditionsMiddleware
+from flags.sources import get_flags
+
+from v1.cache_tags import add_cache_tags, get_cache_tags
+from v1.models.caching import CacheVersion, PageCacheStats
+
+
+def get_enabled_flags(page, request):
+    """Return the names of the feature flags enabled for a page request."""
+    flags = getattr(
+        request,
+        FlagConditionsMiddleware.request_attribute,
+        None
+    )
+
+    if flags is None:
+        flags = get_flags()
+
+    return sorted(
+        name for name, flag in flags.items()
+        if flag.check_state(request=request, page=page)
+    )
+
+
+class PageCache(object):
+    """An optional server-side cache of fully rendered Wagtail pages.
+
+    The cache is enabled by configuring a Django cache with the given name in
+    settings.CACHES. Rendered responses are keyed on the page, its live
+    revision, its language, the requested URL, and the set of feature flags
+    that are enabled for the request. Because pages also display content from
+    other pages and from snippets, the whole cache is cleared whenever any
+    page is published or unpublished or a shared snippet is saved.
+
+    Only anonymous GET and HEAD requests for published content are cached;
+    previews, sharing site requests, and pages listed in
+    settings.SERVE_LATEST_DRAFT_PAGES are always rendered. Responses that
+    set cookies, use a CSRF token, or use a session are never cached.
+    Sharing site hosts are kept in memory, and are reloaded at most every
+    sharing_hosts_interval seconds, or whenever a sharing site is saved or
+    deleted in this process.
+
+    The cache tags collected while a page is rendered are stored with its
+    response, and are added again whenever the response is served from the
+    cache; see v1.cache_tags.
+
+    Each response served through the cache has an X-Page-Cache header of
+    either "hit" or "miss". Each process counts hits, misses, and bypasses,
+    and adds its counts to running totals in the database at most every
+    stats_interval seconds; these totals, for every process on every
+    server, are available from stats.
+    """
+    header = 'X-Page-Cache'
+    sharing_hosts_interval = 60
+    stats_interval = 60
+
+    def __init__(self, cache_name):
+        self.cache_name = cache_name
+        self.lock = threading.Lock()
+        self.sharing_hosts = None
+        self.sharing_hosts_loaded = 0
+        self.counts = Counter()
+        self.counts_saved = time.time()
+
+    @property
+    def enabled(self):
+        return self.cache_name in settings.CACHES
+
+    @property
+    def cache(self):
+        return caches[self.cache_name]
+
+    def count(self, name):
+        """Count a request, and save this process's counts if it's time."""
+        now = time.time()
+
+        with self.lock:
+            self.counts[name] += 1
+
+            if now - self.counts_saved < self.stats_interval:
+                return
+
+            counts, self.counts = self.counts, Counter()
+            self.counts_saved = now
+
+        PageCacheStats.add(self.cache_name, counts)
+
+    @property
+    def stats(self):
+        """Return the totals of every process, including unsaved counts."""
+        totals = PageCacheStats.objects.filter(
+            name=self.cache_name
+        ).values('hits', 'misses', 'bypasses').first() or {}
+
+        with self.lock:
+            counts = Counter(self.counts)
+
+        counts.update(totals)
+        requests = counts['hits'] + counts['misses']
+
+        return {
+            'hits': counts['hits'],
+            'misses': counts['misses'],
+            'bypasses': counts['bypasses'],
+            'hit_rate': float(counts['hits']) / requests if requests else None,
+        }
+
+    def clear(self):
+        if self.enabled:
+            self.cache.clear()
+
+    def serve(self, page, request, args, kwargs):
+        """Serve a page from the cache, rendering and caching it if needed.
+
+        Returns None if the page should not be served from the cache.
+        """
+        if not self.enabled:
+            return None
+
+        if not self.is_cacheable_request(page, request):
+            self.count('bypasses')
+            return None
+
+        key = self.get_key(page, request)
+        cached = self.cache.get(key)
+
+        if cached is not None:
+            response, cache_tags = cached
+            add_cache_tags(*cache_tags)
+
+            self.count('hits')
+            response[self.header] = 'hit'
+            return response
+
+        self.count('misses')
+        response = page.serve(request, *args, **kwargs)
+
+        if callable(getattr(response, 'render', None)):
+            response = response.render()
+
+        if self.is_cacheable_response(request, response):
+            self.cache.set(key, (response, get_cache_tags()))
+
+        response[self.header] = 'miss'
+        return response
+
+    def is_cacheable_request(self, page, request):
+        if request.method not in ('GET', 'HEAD'):
+            return False
+
+        if request.user.is_authenticated or getattr(
+            request, 'is_preview', False
+        ):
+            return False
+
+        if page.pk in settings.SERVE_LATEST_DRAFT_PAGES:
+            return False
+
+        return not self.is_sharing_request(request)
+
+    def get_sharing_hosts(self):
+        """Return the (hostname, port) of every sharing site."""
+        now = time.time()
+
+        with self.lock:
+            if (
+                self.sharing_hosts is None or
+                now - self.sharing_hosts_loaded >= self.sharing_hosts_interval
+            ):
+                self.sharing_hosts = frozenset(
+                    SharingSite.objects.values_list('hostname', 'port')
+                )
+                self.sharing_hosts_loaded = now
+
+            return self.sharing_hosts
+
+    def clear_sharing_hosts(self):
+        with self.lock:
+            self.sharing_hosts = None
+
+    def is_sharing_request(self, request):
+        """Return whether a request is for a sharing site.
+
+        This matches requests the same way as SharingSite.find_for_request.
+        """
+        hostname = request.get_host().split(':')[0]
+
+        try:
+            port = int(request.get_port())
+        except (TypeError, ValueError):
+            return False
+
+        return (hostname, port) in self.get_sharing_hosts()
+
+    @staticmethod
+    def is_cacheable_response(request, response):
+        if response.status_code != 200 or response.streaming:
+            return False
+
+        if response.cookies or request.META.get('CSRF_COOKIE_USED'):
+            return False
+
+        # Anonymous users may still have session data that affects content.
+        session = getattr(request, 'session', None)
+        return not (session is not None and (
+            session.modified or
+            settings.SESSION_COOKIE_NAME in request.COOKIES
+        ))
+
+    def get_key(self, page, request):
+        enabled_flags = get_enabled_flags(page, request)
+
+        key = hashlib.sha1(force_bytes(repr((
+            page.live_revision_id,
+            getattr(page, 'language', None),
+            request.scheme,
+            request.get_host(),
+            request.get_full_path(),
+            enabled_flags,
+        ))))
+
+        return 'page_{}_{}'.format(page.pk, key.hexdigest())
+
+
+page_cache = PageCache('page_cache')
+
+
+class PageETags(object):
+    """ETags for Wagtail pages that are known before pages are rendered.
+
+    ETags are enabled by settings.ENABLE_PAGE_ETAGS. An ETag is computed
+    from the page's live revision, its language, the requested URL, the
+    enabled feature flags, and a content version stored in the database as
+    a CacheVersion, so that it is the same on every server. The content
+    version changes whenever any page is published or unpublished, or
+    whenever a shared snippet, image, document, regulation, or job listing
+    option is saved, because pages also display content from all of them;
+    see clear_cached_pages.
+
+    Some content also changes with the date, like upcoming events and open
+    job listings, so every ETag changes at least once per lifetime seconds.
+
+    Requests whose If-None-Match header matches get a 304 Not Modified
+    response without the page being rendered. The same requests as those
+    served through PageCache are eligible, and ETags are only sent with
+    responses that PageCache would store.
+    """
+    version_name = 'page_etags'
+    lifetime = 60 * 60
+
+    @property
+    def enabled(self):
+        return settings.ENABLE_PAGE_ETAGS
+
+    def get_version(self):
+        return CacheVersion.current(self.version_name)
+
+    def invalidate(self):
+        if self.enabled:
+            CacheVersion.bump(self.version_name)
+
+    def get_etag(self, page, request):
+        parts = (
+            page.pk,
+            page.live_revision_id,
+            getattr(page, 'language', None),
+            request.scheme,
+            request.get_host(),
+            request.get_full_path(),
+            ','.join(get_enabled_flags(page, request)),
+            self.get_version(),
+            int(time.time() // self.lifetime),
+        )
+
+        return quote_etag(hashlib.sha1(force_bytes(
+            '\n'.join(force_text(part) for part in parts)
+        )).hexdigest())
+
+    def serve(self, page, request, serve_page):
+        """Serve a page with an ETag, or 304 if the client has it already.
+
+        serve_page is called to get the page's response if needed. Returns
+        None if the page should be served without an ETag.
+        """
+        if not self.enabled:
+            return None
+
+        if not page_cache.is_cacheable_request(page, request):
+            return None
+
+        etag = self.get_etag(page, request)
+        not_modified = get_conditional_response(request, etag=etag)
+
+        if not_modified is not None:
+            not_modified['ETag'] = etag
+            return not_modified
+
+        response = serve_page()
+
+        if callable(getattr(response, 'render', None)):
+            response = response.render()
+
+        if page_cache.is_cacheable_response(request, response):
+            response['ETag'] = etag
+
+        return response
+
+
+page_etags = PageETags()
+
+
+def clear_cached_pages(*args, **kwargs):
+    """Clear the page cache and change every page ETag.
+
+    This can be connected directly to model signals, for models whose
+    content is displayed on pages without being part of them.
+    """
+    page_cache.clear()
+    page_etags.invalidate()
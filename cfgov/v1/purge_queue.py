@@ -0,0 +1,234 @@
+import logging
+import time
+from collections import OrderedDict
+from datetime import timedelta
+
+from django.db.models import Min
+from django.utils import timezone
+
+from wagtail.contrib.wagtailfrontendcache.utils import get_backends
+
+from v1.models.caching import CDNPurgeDrain, CDNPurgeRequest
+
+
+logger = logging.getLogger(__name__)
+
+
+# The most URLs or cache tags that each kind of backend accepts in a single
+# request, for backends that don't define a max_batch_size themselves.
+MAX_BATCH_SIZES = {
+    'CloudflareBackend': 30,
+    'CloudfrontBackend': 3000,
+}
+
+DEFAULT_BATCH_SIZE = 100
+
+# Failed purges are retried after RETRY_DELAY seconds, doubling after each
+# attempt up to MAX_RETRY_DELAY, and are dropped after MAX_ATTEMPTS.
+RETRY_DELAY = 30
+MAX_RETRY_DELAY = 60 * 60
+MAX_ATTEMPTS = 8
+
+# Purges that have been due for longer than this many seconds are shown as
+# overdue, which usually means that drain_purge_queue isn't running.
+OVERDUE_AFTER = 5 * 60
+
+# The primary key of the only CDNPurgeDrain row.
+LAST_DRAIN_PK = 1
+
+
+def get_max_batch_size(backend):
+    return getattr(backend, 'max_batch_size', None) or MAX_BATCH_SIZES.get(
+        backend.__class__.__name__,
+        DEFAULT_BATCH_SIZE
+    )
+
+
+def get_retry_delay(attempts):
+    return timedelta(seconds=min(
+        RETRY_DELAY * 2 ** (attempts - 1),
+        MAX_RETRY_DELAY
+    ))
+
+
+def can_purge_tags(backend):
+    """Return whether a backend is able to purge by cache tag.
+
+    Backends can purge by tag if they have a purge_tags method, unless they
+    set a false can_purge_tags attribute, as AkamaiBackend does when it
+    isn't configured to.
+    """
+    if getattr(backend, 'purge_tags', None) is None:
+        return False
+
+    return getattr(backend, 'can_purge_tags', True)
+
+
+def enqueue(kind, values, backends=None, fallback_urls=None):
+    """Queue values to be purged from front-end cache backends.
+
+    Values are queued once for each named backend, or for every configured
+    backend if none are named. Cache tags are only queued for backends that
+    can purge by tag; fallback_urls, if given, are queued for the others
+    instead.
+    """
+    values = list(values)
+    fallback_urls = list(fallback_urls or [])
+    requests = []
+
+    for name, backend in get_backends(backends=backends).items():
+        backend_kind, backend_values = kind, values
+
+        if kind == CDNPurgeRequest.TAG and not can_purge_tags(backend):
+            backend_kind, backend_values = CDNPurgeRequest.URL, fallback_urls
+
+        requests.extend(
+            CDNPurgeRequest(backend=name, kind=backend_kind, value=value)
+            for value in backend_values
+        )
+
+    CDNPurgeRequest.objects.bulk_create(requests)
+
+
+def enqueue_urls(urls, backends=None):
+    enqueue(CDNPurgeRequest.URL, urls, backends=backends)
+
+
+def enqueue_tags(tags, backends=None, fallback_urls=None):
+    enqueue(
+        CDNPurgeRequest.TAG,
+        tags,
+        backends=backends,
+        fallback_urls=fallback_urls
+    )
+
+
+def purge(backend, kind, values):
+    if kind == CDNPurgeRequest.TAG:
+        backend.purge_tags(values)
+    else:
+        backend.purge_batch(values)
+
+
+def drain():
+    """Send every queued purge that is due, and return drain statistics.
+
+    Queued values are grouped by backend and kind, duplicates are sent only
+    once, and each backend is sent batches as large as it accepts. When a
+    batch fails, its values are retried on a later drain with exponential
+    backoff.
+    """
+    started = timezone.now()
+    start_time = time.time()
+    backends = get_backends()
+
+    due = CDNPurgeRequest.objects.filter(next_attempt__lte=started)
+    oldest = due.aggregate(created=Min('created'))['created']
+
+    grouped = OrderedDict()
+    for pk, name, kind, value in due.order_by('pk').values_list(
+        'pk', 'backend', 'kind', 'value'
+    ):
+        values = grouped.setdefault((name, kind), OrderedDict())
+        values.setdefault(value, []).append(pk)
+
+    purged = failed = 0
+
+    for (name, kind), values in grouped.items():
+        backend = backends.get(name)
+
+        if backend is None:
+            logger.warning(
+                'Dropping purges queued for unknown backend {}'.format(name)
+            )
+            CDNPurgeRequest.objects.filter(
+                pk__in=[pk for pks in values.values() for pk in pks]
+            ).delete()
+            continue
+
+        batch_size = get_max_batch_size(backend)
+        values = list(values.items())
+
+        for i in range(0, len(values), batch_size):
+            batch = values[i:i + batch_size]
+            pks = [pk for _, value_pks in batch for pk in value_pks]
+
+            try:
+                purge(backend, kind, [value for value, _ in batch])
+            except Exception:
+                logger.exception(
+                    'Failed to purge {} {}s from {}'.format(
+                        len(batch),
+                        kind,
+                        name
+                    )
+                )
+                failed += len(batch)
+                retry(pks)
+            else:
+                purged += len(batch)
+                CDNPurgeRequest.objects.filter(pk__in=pks).delete()
+
+    finished = timezone.now()
+
+    stats = {
+        'finished': finished,
+        'seconds': time.time() - start_time,
+        'purged': purged,
+        'failed': failed,
+        # How long the oldest purge waited in the queue before being sent.
+        'latency': (finished - oldest).total_seconds() if oldest else 0,
+    }
+
+    if grouped:
+        CDNPurgeDrain.objects.update_or_create(
+            pk=LAST_DRAIN_PK,
+            defaults=stats
+        )
+
+    return stats
+
+
+def retry(pks):
+    requests = CDNPurgeRequest.objects.filter(pk__in=pks)
+    now = timezone.now()
+
+    # Purges are updated from the most attempted down, so that each update
+    # doesn't match purges that have just been updated.
+    for attempts in sorted(
+        set(requests.values_list('attempts', flat=True)),
+        reverse=True
+    ):
+        attempts += 1
+        same_attempts = requests.filter(attempts=attempts - 1)
+
+        if attempts >= MAX_ATTEMPTS:
+            logger.error('Dropping {} purges after {} attempts'.format(
+                same_attempts.count(),
+                attempts
+            ))
+            same_attempts.delete()
+        else:
+            same_attempts.update(
+                attempts=attempts,
+                next_attempt=now + get_retry_delay(attempts)
+            )
+
+
+def get_stats():
+    """Return the depth of the queue and statistics of the last drain.
+
+    The queue is also reported as overdue if any purge has been due for
+    longer than OVERDUE_AFTER seconds.
+    """
+    overdue_since = timezone.now() - timedelta(seconds=OVERDUE_AFTER)
+
+    return {
+        'depth': CDNPurgeRequest.objects.count(),
+        'overdue': CDNPurgeRequest.objects.filter(
+            next_attempt__lte=overdue_since
+        ).exists(),
+        'last_drain': CDNPurgeDrain.objects.filter(pk=LAST_DRAIN_PK).values(
+            'finished', 'seconds', 'purged', 'failed', 'latency'
+        ).first(),
+    }
@@ -0,0 +1,245 @@
+import logging
+import multiprocessing
+import threading
+import time
+from collections import defaultdict
+
+from django.db import connection, connections, models, transaction
+
+from wagtail.wagtailcore.blocks import ListBlock, StreamBlock, StructBlock
+from wagtail.wagtailcore.fields import StreamField
+from wagtail.wagtailimages.blocks import ImageChooserBlock
+from wagtail.wagtailimages.models import Filter
+
+from v1.models.images import CFGOVImage, CFGOVRendition
+
+
+logger = logging.getLogger(__name__)
+
+
+# Filter specs of the renditions that templates request for an image, unless
+# a block containing it sets rendition_filter_specs in its Meta.
+DEFAULT_FILTER_SPECS = ('original',)
+
+
+def get_block_renditions(block, value, filter_specs=DEFAULT_FILTER_SPECS):
+    """Yield (image, filter spec) for every image in a block value."""
+    filter_specs = getattr(block.meta, 'rendition_filter_specs', filter_specs)
+
+    if isinstance(block, ImageChooserBlock):
+        if value:
+            for filter_spec in filter_specs:
+                yield value, filter_spec
+
+    elif isinstance(block, StructBlock):
+        if hasattr(value, 'get'):
+            for name, child_block in block.child_blocks.items():
+                for rendition in get_block_renditions(
+                    child_block, value.get(name), filter_specs
+                ):
+                    yield rendition
+
+    elif isinstance(block, ListBlock):
+        for child_value in value or []:
+            for rendition in get_block_renditions(
+                block.child_block, child_value, filter_specs
+            ):
+                yield rendition
+
+    elif isinstance(block, StreamBlock):
+        for child in value or []:
+            for rendition in get_block_renditions(
+                child.block, child.value, filter_specs
+            ):
+                yield rendition
+
+
+def get_page_images(page):
+    """Yield (image, filter spec) for every image that a page shows.
+
+    Images are those in the page's StreamFields and those that the page
+    links to directly, like its social sharing image. They are the same
+    instances that templates use to render the page, so the page must be
+    an instance of its specific page type.
+    """
+    for field in page._meta.fields:
+        if isinstance(field, StreamField):
+            for rendition in get_block_renditions(
+                field.stream_block,
+                getattr(page, field.name)
+            ):
+                yield rendition
+
+        elif (
+            isinstance(field, models.ForeignKey) and
+            issubclass(field.related_model, CFGOVImage) and
+            getattr(page, field.attname)
+        ):
+            image = getattr(page, field.name)
+            for filter_spec in DEFAULT_FILTER_SPECS:
+                yield image, filter_spec
+
+
+def get_page_renditions(page):
+    """Return the renditions that templates request to show a page.
+
+    Renditions are returned as a set of (image id, filter spec).
+    """
+    return set(
+        (image.pk, filter_spec)
+        for image, filter_spec in get_page_images(page)
+    )
+
+
+def prefetch_renditions(renditions):
+    """Attach existing renditions to image instances with a single query.
+
+    Renditions are given as (image, filter spec). CFGOVImage.get_rendition
+    returns attached renditions without querying for them; renditions that
+    don't exist yet are still generated when they are requested.
+    """
+    images = defaultdict(list)
+    filter_specs = set()
+
+    for image, filter_spec in renditions:
+        if image.file.name.endswith('.gif'):
+            continue
+
+        if image.prefetched_renditions is None:
+            image.prefetched_renditions = {}
+            images[image.pk].append(image)
+
+        filter_specs.add(filter_spec)
+
+    if not images:
+        return
+
+    for rendition in CFGOVRendition.objects.filter(
+        image_id__in=images,
+        filter_spec__in=filter_specs
+    ):
+        for image in images[rendition.image_id]:
+            rendition.image = image
+            image.prefetched_renditions[
+                (rendition.filter_spec, rendition.focal_point_key)
+            ] = rendition
+
+
+def prefetch_page_renditions(page):
+    """Attach the existing renditions of every image a page shows."""
+    prefetch_renditions(get_page_images(page))
+
+
+def get_missing_renditions(renditions):
+    """Return the renditions, as (image id, filter spec), that don't exist.
+
+    GIFs are skipped, because CFGOVImage always serves their original file.
+    """
+    renditions = set(renditions)
+    image_ids = set(image_id for image_id, _ in renditions)
+
+    images = CFGOVImage.objects.in_bulk(image_ids)
+
+    existing = set(CFGOVRendition.objects.filter(
+        image_id__in=image_ids
+    ).values_list('image_id', 'filter_spec', 'focal_point_key'))
+
+    missing = []
+
+    for image_id, filter_spec in sorted(renditions):
+        image = images.get(image_id)
+
+        if image is None or image.file.name.endswith('.gif'):
+            continue
+
+        focal_point_key = Filter(spec=filter_spec).get_cache_key(image)
+
+        if (image_id, filter_spec, focal_point_key) not in existing:
+            missing.append((image_id, filter_spec))
+
+    return missing
+
+
+def generate_rendition(rendition):
+    """Generate a rendition, given as (image id, filter spec).
+
+    This is run in pool processes, so it returns whether it succeeded
+    instead of raising.
+    """
+    image_id, filter_spec = rendition
+
+    try:
+        CFGOVImage.objects.get(pk=image_id).get_rendition(filter_spec)
+    except Exception:
+        logger.exception('Failed to generate {} rendition of image {}'.format(
+            filter_spec,
+            image_id
+        ))
+        return False
+
+    return True
+
+
+def generate_renditions(renditions, processes=1):
+    """Generate renditions, and return how many were generated per second.
+
+    Renditions are given as (image id, filter spec). With more than one
+    process, they are generated in a process pool; database connections are
+    closed first, so that each process opens its own.
+    """
+    renditions = list(renditions)
+    start_time = time.time()
+
+    if processes > 1 and len(renditions) > 1:
+        connections.close_all()
+        pool = multiprocessing.Pool(processes)
+
+        try:
+            results = pool.map(generate_rendition, renditions)
+        finally:
+            pool.close()
+            pool.join()
+    else:
+        results = [generate_rendition(rendition) for rendition in renditions]
+
+    seconds = time.time() - start_time
+    generated = sum(results)
+
+    stats = {
+        'generated': generated,
+        'failed': len(results) - generated,
+        'seconds': seconds,
+        'per_second': generated / seconds if seconds else 0,
+    }
+
+    if renditions:
+        logger.info(
+            'Generated {generated} renditions in {seconds:.2f} seconds, '
+            '{per_second:.1f} per second, {failed} failed'.format(**stats)
+        )
+
+    return stats
+
+
+def pregenerate_renditions(get_renditions):
+    """Generate missing renditions in a background thread.
+
+    get_renditions is called in the thread, once the current transaction is
+    committed, to return the renditions to generate as (image id, filter
+    spec). Renditions are generated in the thread itself rather than a
+    process pool, so that web server processes are never forked.
+    """
+    def generate():
+        try:
+            generate_renditions(get_missing_renditions(get_renditions()))
+        except Exception:
+            logger.exception('Failed to pregenerate renditions')
+        finally:
+            connection.close()
+
+    def start():
+        thread = threading.Thread(target=generate)
+        thread.daemon = True
+        thread.start()
+
+    transaction.on_commit(start)
@@ -1,4 +1,19 @@
+from django.core.cache import caches
+
+from jinja2 import Markup
+
+from v1.models.caching import CacheVersion
 from v1.models.menu_item import MenuItem
+from v1.util.page_tree import page_tree
+
+
+SNAPSHOT_CACHE_NAME = 'default'
+SNAPSHOT_KEY = 'mega_menu_snapshot_{}_{}_{}'
+SNAPSHOT_VERSION_NAME = 'mega_menu'
+
+# Snapshots are keyed by version, so they never go out of date; this only
+# removes snapshots of old versions.
+SNAPSHOT_TIMEOUT = 60 * 60 * 24
 
 
 def get_menu_items(request):
@@ -6,8 +21,138 @@ def get_menu_items(request):
     Assembles mega menu content based on draft state.
     The 'show_draft_megamenu' attribute is set to True
     for sharing sites in 'before_serve_shared_page' hook.
+
+    Menu content is read from a snapshot that is compiled whenever a
+    menu item is saved or deleted, so that menu StreamFields don't need
+    to be loaded when pages are served. Snapshots are kept in each
+    server's cache, keyed by a CacheVersion that changes with the menu and
+    its images, and by the version of the page tree, which changes whenever
+    a linked page is published, unpublished, moved, or deleted. Every
+    server therefore compiles new snapshots after any of these changes.
     '''
     show_draft = hasattr(request, 'show_draft_megamenu')
 
-    return [item.get_content(show_draft)
-            for item in MenuItem.objects.all().order_by('order')]
+    cache = caches[SNAPSHOT_CACHE_NAME]
+    key = get_snapshot_key(show_draft)
+    snapshot = cache.get(key)
+
+    if snapshot is None:
+        snapshot = compile_menu(show_draft)
+        cache.set(key, snapshot, SNAPSHOT_TIMEOUT)
+
+    return snapshot
+
+
+def get_snapshot_key(draft, version=None):
+    if version is None:
+        version = CacheVersion.current(SNAPSHOT_VERSION_NAME)
+
+    return SNAPSHOT_KEY.format(
+        'draft' if draft else 'live',
+        version,
+        page_tree.get_version()
+    )
+
+
+def invalidate_menu_snapshots():
+    '''
+    Changes the menu version, so that every server compiles new snapshots
+    the next time that they are needed.
+    '''
+    CacheVersion.bump(SNAPSHOT_VERSION_NAME)
+
+
+def update_menu_snapshots():
+    '''
+    Changes the menu version, and compiles and stores both the live and
+    the draft menu snapshots of the new version.
+    '''
+    version = CacheVersion.bump(SNAPSHOT_VERSION_NAME)
+    cache = caches[SNAPSHOT_CACHE_NAME]
+
+    cache.set_many({
+        get_snapshot_key(False, version): compile_menu(False),
+        get_snapshot_key(True, version): compile_menu(True),
+    }, SNAPSHOT_TIMEOUT)
+
+
+def compile_menu(draft):
+    '''
+    Returns the mega menu as plain data that can be cached and passed to
+    the mega menu template in place of MenuItem instances.
+
+    Page links are replaced with their URLs, featured images with the URLs
+    of their renditions, and rich text with its rendered HTML.
+    '''
+    return [
+        _compile_menu_item(item.get_content(draft))
+        for item in MenuItem.objects.all().order_by('order')
+    ]
+
+
+def _compile_menu_item(item):
+    featured_content = item.featured_content
+
+    return {
+        'link_text': item.link_text,
+        'page_link': _compile_page_link(item.page_link),
+        'nav_groups': [
+            {
+                'block_type': nav_group.block_type,
+                'value': _compile_nav_group(nav_group.value),
+            } for nav_group in item.nav_groups
+        ],
+        'featured_content': {
+            'value': _compile_featured_content(featured_content.value),
+        } if featured_content else None,
+        'footer': getattr(item, 'footer', None),
+    }
+
+
+def _compile_page_link(page):
+    return {'url': page.url} if page else None
+
+
+def _compile_link(link):
+    if not link:
+        return None
+
+    return {
+        'link_text': link.get('link_text'),
+        'page_link': _compile_page_link(link.get('page_link')),
+        'external_link': link.get('external_link'),
+    }
+
+
+def _compile_nav_group(value):
+    return {
+        'draft': value.get('draft'),
+        'group_title': value.get('group_title'),
+        'hide_group_title': value.get('hide_group_title'),
+        'nav_items': [
+            {
+                'state': nav_item.get('state'),
+                'link': _compile_link(nav_item.get('link')),
+                'nav_items': [
+                    {'link': _compile_link(child.get('link'))}
+                    for child in nav_item.get('nav_items', [])
+                ],
+            } for nav_item in value.get('nav_items', [])
+        ],
+    }
+
+
+def _compile_featured_content(value):
+    body = value.get('body')
+    image = value.get('image') or {}
+    upload = image.get('upload')
+
+    return {
+        'draft': value.get('draft'),
+        'link': _compile_link(value.get('link')),
+        'body': Markup(body) if body is not None else '',
+        'image': {
+            'src': upload.get_rendition('original').url if upload else None,
+            'alt': image.get('alt'),
+        },
+    }
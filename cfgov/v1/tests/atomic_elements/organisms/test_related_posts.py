@@ -1,8 +1,12 @@
 from __future__ import unicode_literals
 
 import datetime as dt
+from unittest import skipUnless
 
-from django.test import RequestFactory, TestCase
+from django.conf import settings
+from django.db import connection
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 
 from wagtail.wagtailcore.models import Page, Site
 
@@ -10,6 +14,7 @@ from v1.atomic_elements.organisms import RelatedPosts
 from v1.models.base import CFGOVPage, CFGOVPageCategory
 from v1.models.learn_page import AbstractFilterPage
 from v1.tests.wagtail_pages import helpers
+from v1.util.related_posts import related_posts
 
 
 class RelatedPostsTestCase(TestCase):
@@ -297,6 +302,154 @@ class RelatedPostsTestCase(TestCase):
         self.assertEqual(related_posts['Events'][0], self.events_child1)
         self.assertEqual(related_posts['Newsroom'][0], self.newsroom_child1)
 
+    def test_related_posts_and_filtering_superset_of_tags(self):
+        self.blog_child1.tags.add('tag 2', 'tag 3')
+        helpers.save_page(self.blog_child1)
+
+        self.block_value['relate_posts'] = True
+        self.block_value['and_filtering'] = True
+
+        related_posts = RelatedPosts.related_posts(
+            self.page_with_authors,
+            self.block_value
+        )
+
+        self.assertEqual(related_posts['Blog'], [self.blog_child1])
+
+    def test_related_posts_no_tags(self):
+        self.page_with_authors.tags.clear()
+        self.block_value['relate_posts'] = True
+
+        self.assertEqual(
+            RelatedPosts.related_posts(
+                self.page_with_authors,
+                self.block_value
+            ),
+            {}
+        )
+
+    def test_related_posts_missing_parent(self):
+        self.blog_parent.delete()
+        self.block_value['relate_posts'] = True
+        self.block_value['relate_newsroom'] = True
+
+        related_posts = RelatedPosts.related_posts(
+            self.page_with_authors,
+            self.block_value
+        )
+
+        self.assertNotIn('Blog', related_posts)
+        self.assertIn('Newsroom', related_posts)
+
+
+@override_settings(CACHES=dict(settings.CACHES, default={
+    'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    'LOCATION': 'test-related-posts',
+}))
+class RelatedPostsCacheTestCase(TestCase):
+    def setUp(self):
+        related_posts.cache.clear()
+
+        self.page = CFGOVPage(title='page')
+        helpers.save_new_page(self.page)
+        self.page.tags.add('tag 1')
+
+        self.blog = CFGOVPage(slug='blog', title='blog')
+        helpers.save_new_page(self.blog)
+        self.events = CFGOVPage(slug='events', title='events')
+        helpers.save_new_page(self.events)
+
+        self.blog_post = AbstractFilterPage(
+            title='blog post', date_published=dt.date(2016, 9, 1)
+        )
+        self.blog_post.tags.add('tag 1')
+        helpers.publish_page(self.blog_post)
+        self.blog_post.move(self.blog, pos='last-child')
+
+        self.event = AbstractFilterPage(
+            title='event', date_published=dt.date(2016, 9, 2)
+        )
+        self.event.tags.add('tag 1')
+        helpers.save_new_page(self.event, self.events)
+
+        self.value = {
+            'limit': 3,
+            'relate_posts': True,
+            'relate_newsroom': True,
+            'relate_events': True,
+            'specific_categories': [],
+            'and_filtering': True,
+        }
+
+    def tearDown(self):
+        related_posts.cache.clear()
+
+    @skipUnless(
+        connection.features.supports_slicing_ordering_in_compound,
+        'Database does not support LIMIT in UNION queries'
+    )
+    def test_all_types_selected_with_one_query(self):
+        # Load the page tree beforehand.
+        related_posts.get_parent_paths('blog')
+
+        with self.assertNumQueries(1):
+            post_ids = related_posts.select(self.page, self.value)
+
+        self.assertEqual(post_ids, {
+            'Blog': [self.blog_post.pk],
+            'Events': [self.event.pk],
+        })
+
+    def test_limit_is_applied_by_query(self):
+        newer_post = AbstractFilterPage(
+            title='newer blog post', date_published=dt.date(2016, 9, 3)
+        )
+        newer_post.tags.add('tag 1')
+        helpers.save_new_page(newer_post, self.blog)
+        self.value['limit'] = 1
+
+        # Load the page tree beforehand.
+        related_posts.get_parent_paths('blog')
+
+        with CaptureQueriesContext(connection) as queries:
+            post_ids = related_posts.select(self.page, self.value)
+
+        self.assertEqual(post_ids, {
+            'Blog': [newer_post.pk],
+            'Events': [self.event.pk],
+        })
+        self.assertTrue(all(
+            'LIMIT 1' in query['sql']
+            for query in queries.captured_queries
+            if 'FROM "v1_abstractfilterpage"' in query['sql']
+        ))
+
+    def test_draft_tags_are_not_used_for_live_page(self):
+        # The tag added in setUp is only on this draft of the page.
+        related_posts.get(self.page, self.value)
+        live_page = CFGOVPage.objects.get(pk=self.page.pk)
+        self.assertEqual(related_posts.get(live_page, self.value), {})
+
+    def test_cached_posts_are_fetched_by_id(self):
+        related_posts.get(self.page, self.value)
+
+        # The version of stored posts is read before posts are fetched.
+        with self.assertNumQueries(2):
+            posts = related_posts.get(self.page, self.value)
+
+        self.assertEqual(posts, {
+            'Blog': [self.blog_post],
+            'Events': [self.event],
+        })
+
+    def test_unpublish_updates_posts(self):
+        related_posts.get(self.page, self.value)
+        self.blog_post.unpublish()
+
+        self.assertEqual(related_posts.get(self.page, self.value), {
+            'Events': [self.event],
+        })
+
 
 class TestGenerateViewMoreUrl(TestCase):
     def setUp(self):
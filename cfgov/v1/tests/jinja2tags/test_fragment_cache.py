@@ -7,6 +7,10 @@ from wagtail.wagtailcore.blocks import StreamValue
 from mock import patch
 from scripts import _atomic_helpers as atomic
 
+from v1.jinja2tags.fragment_cache import (
+    delete_fragment, get_instance_tags, get_tagged_key,
+    invalidate_fragment_tags, local_fragment_cache
+)
 from v1.models.blog_page import BlogPage
 from v1.models.browse_filterable_page import BrowseFilterablePage
 from v1.tests.wagtail_pages.helpers import publish_page
@@ -132,3 +136,210 @@ class TestFragmentCacheJinjaTag(TestCase):
             self._render_tag(value, cache_name='other'),
             'bar'
         )
+
+    @override_settings(CACHES={
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'test-fragment-cache-extension-lock',
+        },
+    }, FRAGMENT_CACHE_LOCK_TIMEOUT=1)
+    def test_waits_for_fragment_being_rendered_elsewhere(self):
+        caches['default'].add('test-cache-key:lock', True)
+
+        def render_elsewhere(seconds):
+            caches['default'].set('test-cache-key', 'foo')
+
+        with patch('v1.jinja2tags.fragment_cache.time.sleep') as sleep:
+            sleep.side_effect = render_elsewhere
+            self.assertEqual(
+                self._render_tag(value='bar', cache_name='default'),
+                'foo'
+            )
+
+    @override_settings(CACHES={
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'test-fragment-cache-extension-lock-timeout',
+        },
+    }, FRAGMENT_CACHE_LOCK_TIMEOUT=0)
+    def test_renders_if_lock_is_not_released(self):
+        caches['default'].add('test-cache-key:lock', True)
+        self.assertEqual(
+            self._render_tag(value='bar', cache_name='default'),
+            'bar'
+        )
+        self.assertIsNone(caches['default'].get('test-cache-key'))
+
+    @override_settings(CACHES={
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'test-fragment-cache-extension-release',
+        },
+    })
+    def test_lock_is_released_after_rendering(self):
+        self._render_tag(value='foo', cache_name='default')
+        self.assertIsNone(caches['default'].get('test-cache-key:lock'))
+
+
+@override_settings(
+    CACHES={
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'test-local-fragment-cache',
+        },
+    },
+    FRAGMENT_CACHE_LOCAL_MAX_ENTRIES=2,
+    FRAGMENT_CACHE_LOCAL_TIMEOUT=60
+)
+class TestLocalFragmentCache(TestCase):
+    def setUp(self):
+        local_fragment_cache.clear()
+
+    def tearDown(self):
+        local_fragment_cache.clear()
+        caches['default'].clear()
+
+    def test_fragment_read_from_shared_cache_is_kept_locally(self):
+        caches['default'].set('key', 'foo')
+        template = engines['wagtail-env'].from_string(
+            '{% cache "key", "default" %}bar{% endcache %}'
+        )
+        self.assertEqual(template.render(), 'foo')
+
+        caches['default'].delete('key')
+        self.assertEqual(template.render(), 'foo')
+
+    def test_rendered_fragment_is_not_kept_locally(self):
+        template = engines['wagtail-env'].from_string(
+            '{% cache "key", "default" %}bar{% endcache %}'
+        )
+        template.render()
+        self.assertIsNone(local_fragment_cache.get('default', 'key'))
+
+    def test_least_recently_used_fragment_is_evicted(self):
+        local_fragment_cache.set('default', 'a', 'a')
+        local_fragment_cache.set('default', 'b', 'b')
+        local_fragment_cache.get('default', 'a')
+        local_fragment_cache.set('default', 'c', 'c')
+
+        self.assertEqual(local_fragment_cache.get('default', 'a'), 'a')
+        self.assertIsNone(local_fragment_cache.get('default', 'b'))
+        self.assertEqual(local_fragment_cache.get('default', 'c'), 'c')
+
+    def test_expired_fragment_is_not_returned(self):
+        with self.settings(FRAGMENT_CACHE_LOCAL_TIMEOUT=0):
+            local_fragment_cache.set('default', 'key', 'foo')
+        self.assertIsNone(local_fragment_cache.get('default', 'key'))
+
+    def test_disabled_by_default(self):
+        with self.settings(FRAGMENT_CACHE_LOCAL_MAX_ENTRIES=0):
+            local_fragment_cache.set('default', 'key', 'foo')
+            self.assertIsNone(local_fragment_cache.get('default', 'key'))
+
+    def test_delete_fragment_deletes_from_all_tiers(self):
+        caches['default'].set('key', 'foo')
+        local_fragment_cache.set('default', 'key', 'foo')
+
+        delete_fragment('default', 'key')
+
+        self.assertIsNone(caches['default'].get('key'))
+        self.assertIsNone(local_fragment_cache.get('default', 'key'))
+
+    def test_tag_versions_are_kept_locally(self):
+        key = get_tagged_key('default', 'key', ['a'])
+
+        with patch.object(caches['default'], 'get_many') as get_many:
+            self.assertEqual(get_tagged_key('default', 'key', ['a']), key)
+
+        get_many.assert_not_called()
+
+    @override_settings(FRAGMENT_CACHE_NAMES=['default'])
+    def test_invalidating_tag_deletes_local_version(self):
+        key = get_tagged_key('default', 'key', ['a'])
+        invalidate_fragment_tags('a')
+        self.assertNotEqual(get_tagged_key('default', 'key', ['a']), key)
+
+
+@override_settings(CACHES={
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'test-fragment-cache-tags-1',
+    },
+    'other': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'test-fragment-cache-tags-2',
+    },
+    'unrelated': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'test-fragment-cache-tags-3',
+    },
+}, FRAGMENT_CACHE_NAMES=['default', 'other', 'missing'])
+class TestFragmentCacheTags(TestCase):
+    def tearDown(self):
+        caches['default'].clear()
+        caches['other'].clear()
+        caches['unrelated'].clear()
+
+    def _render_tag(self, value, tags, cache_name='default', timeout=''):
+        template = engines['wagtail-env'].from_string(
+            '{% cache "key", cache_name' + timeout + ', tags=tags %}'
+            '{{ value }}{% endcache %}'
+        )
+        return template.render({
+            'cache_name': cache_name,
+            'tags': tags,
+            'value': value,
+        })
+
+    def test_tagged_fragment_is_cached(self):
+        self._render_tag('foo', ['a', 'b'])
+        self.assertEqual(self._render_tag('bar', ['b', 'a']), 'foo')
+
+    def test_tagged_fragment_is_cached_with_timeout(self):
+        self._render_tag('foo', ['a'], timeout=', 60')
+        self.assertEqual(self._render_tag('bar', ['a'], timeout=', 60'), 'foo')
+
+    def test_invalidating_tag_evicts_fragment(self):
+        self._render_tag('foo', ['a', 'b'])
+        invalidate_fragment_tags('b')
+        self.assertEqual(self._render_tag('bar', ['a', 'b']), 'bar')
+
+    def test_invalidating_other_tag_does_not_evict_fragment(self):
+        self._render_tag('foo', ['a'])
+        invalidate_fragment_tags('b')
+        self.assertEqual(self._render_tag('bar', ['a']), 'foo')
+
+    def test_invalidating_tag_evicts_fragments_in_all_fragment_caches(self):
+        self._render_tag('foo', ['a'], cache_name='other')
+        invalidate_fragment_tags('a')
+        self.assertEqual(
+            self._render_tag('bar', ['a'], cache_name='other'),
+            'bar'
+        )
+
+    def test_invalidating_tag_ignores_other_caches(self):
+        self._render_tag('foo', ['a'], cache_name='unrelated')
+        invalidate_fragment_tags('a')
+        self.assertEqual(
+            self._render_tag('bar', ['a'], cache_name='unrelated'),
+            'foo'
+        )
+
+    def test_publishing_page_evicts_dependent_fragment(self):
+        page = BlogPage(title='test blog page', slug='test-blog-page')
+        publish_page(page)
+        tags = ['wagtailcore.page:{}'.format(page.pk)]
+        self._render_tag('foo', tags)
+
+        page.save_revision().publish()
+        self.assertEqual(self._render_tag('bar', tags), 'bar')
+
+    def test_get_instance_tags_for_page(self):
+        page = BlogPage(title='test blog page', slug='test-blog-page')
+        publish_page(page)
+        tags = get_instance_tags(page)
+
+        self.assertIn('v1.blogpage', tags)
+        self.assertIn('v1.blogpage:{}'.format(page.pk), tags)
+        self.assertIn('wagtailcore.page', tags)
+        self.assertIn('wagtailcore.page:{}'.format(page.pk), tags)
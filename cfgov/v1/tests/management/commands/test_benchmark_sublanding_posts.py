@@ -0,0 +1,29 @@
+from six import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from v1.models import SublandingPage
+
+
+class BenchmarkSublandingPostsTestCase(TestCase):
+    def test_reports_time_per_selection(self):
+        stdout = StringIO()
+        call_command(
+            'benchmark_sublanding_posts',
+            filterable_pages=2,
+            posts=3,
+            iterations=1,
+            stdout=stdout
+        )
+        output = stdout.getvalue()
+        self.assertIn('FilterableListForm per page: ', output)
+        self.assertIn('single query: ', output)
+        self.assertIn('cached: ', output)
+
+    def test_rolls_back_page_tree(self):
+        call_command('benchmark_sublanding_posts', posts=1, iterations=1,
+                     stdout=StringIO())
+        self.assertFalse(SublandingPage.objects.filter(
+            slug='benchmark-sublanding-page'
+        ).exists())
@@ -0,0 +1,33 @@
+from six import StringIO
+
+from django.core.management import call_command
+from django.template import engines
+from django.test import TestCase
+
+from v1.models import BrowsePage
+
+
+class BenchmarkTemplatePathsTestCase(TestCase):
+    def test_reports_time_per_render(self):
+        stdout = StringIO()
+        call_command(
+            'benchmark_template_paths',
+            repeat=1,
+            iterations=1,
+            stdout=stdout
+        )
+        output = stdout.getvalue()
+        self.assertIn('resolved on every include: ', output)
+        self.assertIn('kept in memory: ', output)
+
+    def test_rolls_back_page_and_restores_caching(self):
+        env = engines['wagtail-env'].env
+        cache_join_paths = env.cache_join_paths
+
+        call_command('benchmark_template_paths', repeat=1, iterations=1,
+                     stdout=StringIO())
+
+        self.assertFalse(BrowsePage.objects.filter(
+            slug='benchmark-browse-page'
+        ).exists())
+        self.assertEqual(env.cache_join_paths, cache_join_paths)
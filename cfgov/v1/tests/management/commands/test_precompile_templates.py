@@ -0,0 +1,62 @@
+import os
+import shutil
+import tempfile
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import SimpleTestCase, override_settings
+from django.utils.six import StringIO
+
+from unipath import Path
+
+
+class PrecompileTemplatesTestCase(SimpleTestCase):
+    def setUp(self):
+        self.template_dir = tempfile.mkdtemp()
+        self.cache_dir = os.path.join(tempfile.mkdtemp(), 'bytecode')
+        self.addCleanup(shutil.rmtree, self.template_dir)
+        self.addCleanup(shutil.rmtree, os.path.dirname(self.cache_dir))
+
+        self.write_template('page.html', '{% include "include.html" %}')
+        self.write_template('include.html', '{{ value }}')
+        self.write_template('styles.less', '{ not a template')
+
+    def write_template(self, name, source):
+        with open(os.path.join(self.template_dir, name), 'w') as f:
+            f.write(source)
+
+    def call_command(self):
+        stdout = StringIO()
+
+        with override_settings(
+            JINJA2_BYTECODE_CACHE_DIR=self.cache_dir,
+            TEMPLATES=[{
+                'NAME': 'test',
+                'BACKEND': 'django.template.backends.jinja2.Jinja2',
+                # Settings use unipath.Path for template directories.
+                'DIRS': [Path(self.template_dir)],
+                'OPTIONS': {
+                    'environment': 'v1.jinja2_environment.environment',
+                    'extensions': [
+                        'jinja2.ext.i18n',
+                    ],
+                },
+            }]
+        ):
+            call_command('precompile_templates', stdout=stdout)
+
+        return stdout.getvalue()
+
+    def test_compiles_templates_into_bytecode_cache(self):
+        output = self.call_command()
+
+        self.assertIn('Compiled 2 templates for test', output)
+        self.assertEqual(len(os.listdir(self.cache_dir)), 2)
+
+    def test_fails_on_syntax_errors(self):
+        self.write_template('broken.html', '{% if %}')
+
+        with self.assertRaises(CommandError) as e:
+            self.call_command()
+
+        self.assertIn('broken.html, line 1', str(e.exception))
@@ -2,8 +2,9 @@ import datetime
 
 from django.contrib.messages.middleware import MessageMiddleware
 from django.contrib.sessions.middleware import SessionMiddleware
+from django.core.cache import caches
 from django.http import HttpResponseBadRequest
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from django.test.client import RequestFactory
 
 from wagtail.wagtailcore import blocks
@@ -12,7 +13,10 @@ from wagtail.wagtailcore.models import Site
 import mock
 
 from v1.models import BrowsePage, CFGOVPage, Feedback
-from v1.tests.wagtail_pages.helpers import save_new_page
+from v1.tests.wagtail_pages.helpers import (
+    publish_changes, publish_page, save_new_page
+)
+from v1.util.page_blocks import page_blocks
 
 
 class TestCFGOVPage(TestCase):
@@ -347,3 +351,96 @@ class TestCFGOVPageMediaProperty(TestCase):
         # The page media should only include the default BrowsePae media, and
         # shouldn't add any additional files because of the FullWithText.
         self.assertEqual(page.media, ['secondary-navigation.js'])
+
+
+@override_settings(CACHES={
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'test-page-blocks',
+    },
+})
+class TestCFGOVPageMediaCaching(TestCase):
+    def setUp(self):
+        page_blocks.clear()
+        caches['default'].clear()
+
+        page = CFGOVPage(title='Test', slug='test')
+        page.sidefoot = blocks.StreamValue(
+            page.sidefoot.stream_block,
+            [
+                {
+                    'type': 'email_signup',
+                    'value': {'heading': 'Heading'}
+                },
+            ],
+            True
+        )
+        publish_page(page)
+
+        page_blocks.clear()
+        caches['default'].clear()
+
+    def tearDown(self):
+        page_blocks.clear()
+        caches['default'].clear()
+
+    def get_page(self):
+        return CFGOVPage.objects.get(slug='test')
+
+    @mock.patch('v1.util.page_blocks.get_page_blocks')
+    def test_block_inventory_is_kept_in_memory(self, get_page_blocks):
+        get_page_blocks.return_value = [
+            'v1.atomic_elements.organisms.EmailSignUp'
+        ]
+        self.get_page().streamfield_js
+        self.get_page().streamfield_js
+        self.assertEqual(get_page_blocks.call_count, 1)
+
+    @mock.patch('v1.util.page_blocks.get_page_blocks')
+    def test_block_inventory_is_kept_in_shared_cache(self, get_page_blocks):
+        get_page_blocks.return_value = [
+            'v1.atomic_elements.organisms.EmailSignUp'
+        ]
+        self.get_page().streamfield_js
+        page_blocks.clear()
+        self.assertEqual(self.get_page().streamfield_js, ['email-signup.js'])
+        self.assertEqual(get_page_blocks.call_count, 1)
+
+    def test_published_revisions_are_cached_separately(self):
+        page = self.get_page()
+        self.assertEqual(page.streamfield_js, ['email-signup.js'])
+
+        page.sidefoot = blocks.StreamValue(
+            page.sidefoot.stream_block,
+            [],
+            True
+        )
+        publish_changes(page)
+
+        self.assertEqual(self.get_page().streamfield_js, [])
+
+    @mock.patch('v1.util.page_blocks.get_page_blocks')
+    def test_drafts_are_not_cached(self, get_page_blocks):
+        get_page_blocks.return_value = []
+        page = self.get_page()
+        page.save_revision()
+
+        page.get_latest_revision_as_page().streamfield_js
+        page.get_latest_revision_as_page().streamfield_js
+        self.assertEqual(get_page_blocks.call_count, 2)
+
+    @mock.patch('v1.util.page_blocks.get_page_blocks')
+    def test_changed_content_is_not_cached(self, get_page_blocks):
+        get_page_blocks.return_value = []
+        page = self.get_page()
+        page.sidefoot = blocks.StreamValue(
+            page.sidefoot.stream_block,
+            [('email_signup', {'heading': 'Heading'})]
+        )
+        page.streamfield_js
+        page.streamfield_js
+        self.assertEqual(get_page_blocks.call_count, 2)
+
+    def test_publishing_warms_cache(self):
+        self.get_page().save_revision().publish()
+        self.assertEqual(len(page_blocks.entries), 1)
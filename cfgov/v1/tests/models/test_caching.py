@@ -1,3 +1,5 @@
+import os
+
 from django.core.files.base import ContentFile
 from django.test import TestCase, override_settings
 
@@ -5,9 +7,11 @@ from wagtail.wagtaildocs.models import Document
 from wagtail.wagtailimages.tests.utils import get_test_image_file
 
 import boto3
+import mock
 import moto
 
 from core.testutils.mock_cache_backend import CACHE_PURGED_URLS
+from v1 import purge_queue
 from v1.models.caching import AkamaiBackend, cloudfront_cache_invalidation
 from v1.models.images import CFGOVImage
 
@@ -42,6 +46,22 @@ class TestAkamaiBackend(TestCase):
         self.assertEquals(akamai_backend.client_secret, 'secret')
         self.assertEquals(akamai_backend.access_token, 'access token')
 
+    def test_can_purge_tags_only_with_tag_url(self):
+        akamai_backend = AkamaiBackend({
+            'CLIENT_TOKEN': 'token',
+            'CLIENT_SECRET': 'secret',
+            'ACCESS_TOKEN': 'access token',
+        })
+
+        with mock.patch.dict(os.environ, {'AKAMAI_FAST_PURGE_TAG_URL': ''}):
+            self.assertFalse(akamai_backend.can_purge_tags)
+
+        with mock.patch.dict(
+            os.environ,
+            {'AKAMAI_FAST_PURGE_TAG_URL': 'https://purge/tag'}
+        ):
+            self.assertTrue(akamai_backend.can_purge_tags)
+
 
 @override_settings(
     WAGTAILFRONTENDCACHE={
@@ -86,9 +106,11 @@ class CloudfrontInvalidationTest(TestCase):
     @override_settings(ENABLE_CLOUDFRONT_CACHE_PURGE=True)
     def test_rendition_saved_cache_invalidation(self):
         cloudfront_cache_invalidation(None, self.rendition)
+        purge_queue.drain()
         self.assertIn(self.rendition.file.url, CACHE_PURGED_URLS)
 
     @override_settings(ENABLE_CLOUDFRONT_CACHE_PURGE=True)
     def test_document_saved_cache_invalidation(self):
         cloudfront_cache_invalidation(None, self.document)
+        purge_queue.drain()
         self.assertIn(self.document.file.url, CACHE_PURGED_URLS)
@@ -1,6 +1,9 @@
 import datetime as dt
 from unittest import TestCase
 
+from django.conf import settings
+from django.test import TestCase as DjangoTestCase, override_settings
+
 from wagtail.wagtailcore.blocks import StreamValue
 
 import mock
@@ -8,6 +11,7 @@ import scripts._atomic_helpers as atomic
 
 from v1.models import AbstractFilterPage, BrowseFilterablePage, SublandingPage
 from v1.tests.wagtail_pages import helpers
+from v1.util.sublanding_posts import sublanding_posts
 
 
 class SublandingPageTestCase(TestCase):
@@ -89,3 +93,74 @@ class SublandingPageTestCase(TestCase):
         browsefilterable_posts = self.sublanding_page.get_browsefilterable_posts(self.limit)
         self.assertEqual(1, len(browsefilterable_posts))
         self.assertEqual(self.child1_of_post2, browsefilterable_posts[0])
+
+
+@override_settings(CACHES=dict(settings.CACHES, default={
+    'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    'LOCATION': 'test-sublanding-posts',
+}))
+class SublandingPagePostsTestCase(DjangoTestCase):
+    def setUp(self):
+        sublanding_posts.cache.clear()
+
+        self.sublanding_page = SublandingPage(title='sublanding')
+        helpers.publish_page(self.sublanding_page)
+
+        self.blog = BrowseFilterablePage(title='blog')
+        helpers.save_new_page(self.blog, self.sublanding_page)
+        self.archive = BrowseFilterablePage(title='blog archive')
+        helpers.save_new_page(self.archive, self.sublanding_page)
+
+        self.post = AbstractFilterPage(
+            title='post', date_published=dt.date(2016, 9, 1)
+        )
+        helpers.save_new_page(self.post, self.blog)
+        self.archived_post = AbstractFilterPage(
+            title='archived post', date_published=dt.date(2016, 9, 2)
+        )
+        helpers.save_new_page(self.archived_post, self.archive)
+
+    def tearDown(self):
+        sublanding_posts.cache.clear()
+
+    def test_excludes_archives(self):
+        self.assertEqual(
+            self.sublanding_page.get_browsefilterable_posts(10),
+            [self.post]
+        )
+
+    def test_excludes_grandchildren(self):
+        grandchild = AbstractFilterPage(
+            title='grandchild', date_published=dt.date(2016, 9, 3)
+        )
+        helpers.save_new_page(grandchild, self.post)
+
+        self.assertEqual(
+            list(self.sublanding_page.get_browsefilterable_queryset()),
+            [self.post]
+        )
+
+    def test_single_query(self):
+        queryset = self.sublanding_page.get_browsefilterable_queryset()
+
+        with self.assertNumQueries(1):
+            list(queryset)
+
+    def test_cached_posts_are_fetched_by_id(self):
+        self.sublanding_page.get_browsefilterable_posts(10)
+
+        # The version of stored posts is read before posts are fetched.
+        with self.assertNumQueries(2):
+            self.assertEqual(
+                self.sublanding_page.get_browsefilterable_posts(10),
+                [self.post]
+            )
+
+    def test_unpublish_updates_posts(self):
+        self.sublanding_page.get_browsefilterable_posts(10)
+        self.post.unpublish()
+
+        self.assertEqual(
+            self.sublanding_page.get_browsefilterable_posts(10),
+            []
+        )
@@ -0,0 +1,166 @@
+import json
+
+from django.conf import settings
+from django.template import engines
+from django.test import RequestFactory, TestCase, override_settings
+
+from wagtail.wagtailcore.models import Site
+from wagtail.wagtailimages.tests.utils import get_test_image_file
+
+from v1.models import CacheVersion, CFGOVImage, CFGOVPage, MenuItem
+from v1.templatetags.mega_menu import (
+    SNAPSHOT_VERSION_NAME, compile_menu, get_menu_items, get_snapshot_key,
+    update_menu_snapshots
+)
+from v1.tests.wagtail_pages.helpers import publish_changes, publish_page
+
+
+def nav_group(title, link_text, draft=False, page=None):
+    return {
+        'type': 'nav_group',
+        'value': {
+            'draft': draft,
+            'group_title': title,
+            'hide_group_title': False,
+            'nav_items': [{
+                'state': 'both',
+                'link': {
+                    'link_text': link_text,
+                    'page_link': page.pk if page else None,
+                    'external_link': '/external/',
+                },
+                'nav_items': [],
+            }],
+        },
+    }
+
+
+@override_settings(CACHES=dict(settings.CACHES, default={
+    'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    'LOCATION': 'test-mega-menu',
+}))
+class MegaMenuSnapshotTests(TestCase):
+    def setUp(self):
+        self.page = CFGOVPage(title='Linked', slug='linked')
+        publish_page(child=self.page)
+
+        self.menu_item = MenuItem.objects.create(
+            link_text='Menu',
+            page_link=self.page,
+            order=1,
+            column_1=json.dumps([
+                nav_group('Live group', 'Live link', page=self.page),
+                nav_group('Draft group', 'Draft link', draft=True),
+            ]),
+            column_4=json.dumps([{
+                'type': 'featured_content',
+                'value': {
+                    'draft': False,
+                    'link': {
+                        'link_text': 'Featured',
+                        'external_link': '/featured/',
+                    },
+                    'body': '<p>Featured body</p>',
+                    'image': {'upload': None, 'alt': ''},
+                },
+            }]),
+            nav_footer=json.dumps([{
+                'type': 'nav_footer',
+                'value': {
+                    'draft': False,
+                    'content': '<p>Footer with <a href="/">link</a></p>',
+                },
+            }])
+        )
+
+        self.request = RequestFactory().get('/')
+        self.request.site = Site.objects.get(is_default_site=True)
+
+    def render(self, menu_items):
+        template = engines['wagtail-env'].from_string(
+            "{% from 'organisms/mega-menu.html' "
+            "import mega_menu with context %}"
+            "{{ mega_menu(menu_items) }}"
+        )
+        return template.render({
+            'request': self.request,
+            'menu_items': menu_items,
+        })
+
+    def test_compile_menu(self):
+        item, = compile_menu(False)
+        self.assertEqual(item['link_text'], 'Menu')
+        self.assertEqual(item['page_link'], {'url': '/linked/'})
+
+        nav_group, = item['nav_groups']
+        self.assertEqual(nav_group['value']['group_title'], 'Live group')
+        self.assertEqual(
+            nav_group['value']['nav_items'][0]['link']['page_link'],
+            {'url': '/linked/'}
+        )
+
+        self.assertEqual(
+            item['featured_content']['value']['link']['link_text'],
+            'Featured'
+        )
+        self.assertIn('aria-label', item['footer'])
+
+    def test_compile_draft_menu(self):
+        item, = compile_menu(True)
+        self.assertEqual(
+            item['nav_groups'][0]['value']['group_title'],
+            'Draft group'
+        )
+
+    def test_snapshot_renders_like_menu_items(self):
+        for draft, link_text in ((False, 'Live link'), (True, 'Draft link')):
+            menu_items = [
+                item.get_content(draft)
+                for item in MenuItem.objects.order_by('order')
+            ]
+            html = self.render(compile_menu(draft))
+            self.assertIn(link_text, html)
+            self.assertEqual(html, self.render(menu_items))
+
+    def test_get_menu_items_reads_snapshot(self):
+        update_menu_snapshots()
+
+        # Each snapshot is found by reading the menu version.
+        with self.assertNumQueries(2):
+            live_items = get_menu_items(self.request)
+            self.request.show_draft_megamenu = True
+            draft_items = get_menu_items(self.request)
+
+        self.assertEqual(live_items, compile_menu(False))
+        self.assertEqual(draft_items, compile_menu(True))
+
+    def test_save_updates_snapshot(self):
+        get_menu_items(self.request)
+        self.menu_item.link_text = 'New menu'
+        self.menu_item.save()
+        self.assertEqual(get_menu_items(self.request)[0]['link_text'],
+                         'New menu')
+
+    def test_delete_updates_snapshot(self):
+        get_menu_items(self.request)
+        self.menu_item.delete()
+        self.assertEqual(get_menu_items(self.request), [])
+
+    def test_page_move_updates_snapshot(self):
+        get_menu_items(self.request)
+        self.page.slug = 'moved'
+        publish_changes(self.page)
+        self.assertEqual(get_menu_items(self.request)[0]['page_link'],
+                         {'url': '/moved/'})
+
+    def test_image_save_changes_snapshot_key(self):
+        key = get_snapshot_key(False)
+        CFGOVImage.objects.create(title='Image', file=get_test_image_file())
+        self.assertNotEqual(get_snapshot_key(False), key)
+
+    def test_change_on_other_server_updates_snapshot(self):
+        get_menu_items(self.request)
+        MenuItem.objects.update(link_text='Other server')
+        CacheVersion.bump(SNAPSHOT_VERSION_NAME)
+        self.assertEqual(get_menu_items(self.request)[0]['link_text'],
+                         'Other server')
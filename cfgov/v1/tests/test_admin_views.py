@@ -94,14 +94,14 @@ class TestCDNManagementView(TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertContains(response, "Enter a full URL")
 
-    @mock.patch('v1.models.caching.AkamaiBackend.purge')
-    def test_submission_with_url_akamai(self, mock_purge):
+    @mock.patch('v1.models.caching.AkamaiBackend.purge_batch')
+    def test_submission_with_url_akamai(self, mock_purge_batch):
         self.client.login(username='cdn', password='password')
         self.client.post(
             reverse('manage-cdn'),
             {'url': 'http://www.fake.gov'}
         )
-        mock_purge.assert_called_with('http://www.fake.gov')
+        mock_purge_batch.assert_called_with(['http://www.fake.gov'])
 
     @mock.patch('wagtail.contrib.wagtailfrontendcache.backends.CloudfrontBackend.purge_batch')  # noqa: E501
     def test_submission_with_url_cloudfront(self, mock_purge_batch):
@@ -0,0 +1,170 @@
+import json
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+
+import mock
+
+from core.testutils.mock_cache_backend import CACHE_PURGED_TAGS
+from v1 import purge_queue
+from v1.cache_tags import (
+    MAX_TAGS, CacheTagMiddleware, add_cache_tags, purge_cache_tags
+)
+from v1.models.caching import AkamaiBackend
+from v1.models.learn_page import LearnPage
+from v1.models.snippets import ReusableText
+from v1.page_cache import page_cache
+from v1.tests.wagtail_pages.helpers import publish_changes, publish_page
+
+
+MOCK_FRONTEND_CACHE = {
+    'mock': {
+        'BACKEND': 'core.testutils.mock_cache_backend.MockCacheBackend',
+    },
+}
+
+
+class CacheTagMiddlewareTests(TestCase):
+    def setUp(self):
+        self.middleware = CacheTagMiddleware()
+        self.request = RequestFactory().get('/')
+
+    def get_response(self, func):
+        self.middleware.process_request(self.request)
+        func()
+        return self.middleware.process_response(self.request, HttpResponse())
+
+    def test_tags_are_sorted_and_use_dashes(self):
+        response = self.get_response(
+            lambda: add_cache_tags('v1.menuitem', 'wagtailcore.page:2')
+        )
+        self.assertEqual(
+            response['Edge-Cache-Tag'],
+            'v1.menuitem,wagtailcore.page-2'
+        )
+
+    def test_no_tags_no_header(self):
+        response = self.get_response(lambda: None)
+        self.assertNotIn('Edge-Cache-Tag', response)
+
+    def test_too_many_tags_no_header(self):
+        response = self.get_response(lambda: add_cache_tags(*(
+            'tag{}'.format(i) for i in range(MAX_TAGS + 1)
+        )))
+        self.assertNotIn('Edge-Cache-Tag', response)
+
+    def test_loaded_snippets_are_tagged(self):
+        snippet = ReusableText.objects.create(title='Snippet', text='Text')
+        response = self.get_response(
+            lambda: ReusableText.objects.get(pk=snippet.pk)
+        )
+        self.assertEqual(
+            response['Edge-Cache-Tag'],
+            'v1.reusabletext-{}'.format(snippet.pk)
+        )
+
+    def test_tags_outside_requests_are_ignored(self):
+        add_cache_tags('ignored')
+        response = self.get_response(lambda: None)
+        self.assertNotIn('Edge-Cache-Tag', response)
+
+
+class PageCacheTagTests(TestCase):
+    def setUp(self):
+        self.page = LearnPage(title='Tagged page', slug='tagged')
+        publish_page(self.page)
+
+    def test_page_response_is_tagged(self):
+        response = self.client.get('/tagged/')
+        tags = response['Edge-Cache-Tag'].split(',')
+        self.assertIn('wagtailcore.page-{}'.format(self.page.pk), tags)
+        self.assertIn('v1.menuitem', tags)
+
+    @override_settings(CACHES=dict(settings.CACHES, page_cache={
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'test_page_cache_tags',
+    }))
+    def test_page_cache_hit_is_tagged(self):
+        snippet = ReusableText.objects.create(title='Snippet', text='Text')
+        original_serve = LearnPage.serve
+
+        def serve(page, request, *args, **kwargs):
+            ReusableText.objects.get(pk=snippet.pk)
+            return original_serve(page, request, *args, **kwargs)
+
+        try:
+            with mock.patch.object(LearnPage, 'serve', serve):
+                miss = self.client.get('/tagged/')
+
+            hit = self.client.get('/tagged/')
+        finally:
+            page_cache.clear()
+
+        self.assertEqual(hit['X-Page-Cache'], 'hit')
+        self.assertEqual(hit['Edge-Cache-Tag'], miss['Edge-Cache-Tag'])
+        self.assertIn(
+            'v1.reusabletext-{}'.format(snippet.pk),
+            hit['Edge-Cache-Tag'].split(',')
+        )
+
+    @override_settings(WAGTAILFRONTENDCACHE=MOCK_FRONTEND_CACHE)
+    def test_publish_purges_page_tag(self):
+        del CACHE_PURGED_TAGS[:]
+        publish_changes(self.page)
+        purge_queue.drain()
+        self.assertIn(
+            'wagtailcore.page-{}'.format(self.page.pk),
+            CACHE_PURGED_TAGS
+        )
+
+    @override_settings(WAGTAILFRONTENDCACHE=MOCK_FRONTEND_CACHE)
+    def test_snippet_save_purges_snippet_tags(self):
+        snippet = ReusableText.objects.create(title='Snippet', text='Text')
+        del CACHE_PURGED_TAGS[:]
+        snippet.save()
+        purge_queue.drain()
+        self.assertEqual(
+            sorted(CACHE_PURGED_TAGS),
+            ['v1.reusabletext', 'v1.reusabletext-{}'.format(snippet.pk)]
+        )
+
+
+class PurgeCacheTagsTests(TestCase):
+    @override_settings(WAGTAILFRONTENDCACHE={
+        'akamai': {
+            'BACKEND': 'v1.models.caching.AkamaiBackend',
+            'CLIENT_TOKEN': 'token',
+            'CLIENT_SECRET': 'secret',
+            'ACCESS_TOKEN': 'access token',
+        },
+    })
+    @mock.patch.dict('os.environ', {'AKAMAI_FAST_PURGE_TAG_URL': 'http://tag'})
+    @mock.patch('v1.models.caching.requests.post')
+    def test_akamai_purges_tags_in_one_request(self, post):
+        purge_cache_tags('v1.contact:1', 'v1.contact', 'v1.contact:1')
+        post.assert_not_called()
+        purge_queue.drain()
+
+        post.assert_called_once()
+        self.assertEqual(post.call_args[0][0], 'http://tag')
+        self.assertEqual(json.loads(post.call_args[1]['data'])['objects'], [
+            'v1.contact', 'v1.contact-1',
+        ])
+
+
+class AkamaiBackendBatchTests(TestCase):
+    @mock.patch.dict('os.environ', {'AKAMAI_FAST_PURGE_URL': 'http://url'})
+    @mock.patch('v1.models.caching.requests.post')
+    def test_purge_batch_makes_one_request(self, post):
+        backend = AkamaiBackend({
+            'CLIENT_TOKEN': 'token',
+            'CLIENT_SECRET': 'secret',
+            'ACCESS_TOKEN': 'access token',
+        })
+        backend.purge_batch(['http://a/', 'http://b/'])
+
+        post.assert_called_once()
+        self.assertEqual(json.loads(post.call_args[1]['data'])['objects'], [
+            'http://a/', 'http://b/',
+        ])
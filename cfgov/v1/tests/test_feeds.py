@@ -0,0 +1,105 @@
+from datetime import date
+
+from django.conf import settings
+from django.test import RequestFactory, TestCase, override_settings
+
+from wagtail.wagtailcore.models import Site
+
+from v1.feeds import feed_cache
+from v1.models import BlogPage, SublandingFilterablePage
+from v1.models.base import CFGOVPageCategory
+from v1.tests.wagtail_pages.helpers import publish_page, save_new_page
+
+
+@override_settings(CACHES=dict(settings.CACHES, default={
+    'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    'LOCATION': 'test-feeds',
+}))
+class FilterableFeedTests(TestCase):
+    def setUp(self):
+        feed_cache.cache.clear()
+
+        self.site = Site.objects.get(is_default_site=True)
+        self.factory = RequestFactory()
+
+        self.blog = SublandingFilterablePage(title='Blog', slug='blog')
+        publish_page(self.blog)
+
+        for i in range(3):
+            post = BlogPage(
+                title='Post {}'.format(i),
+                date_published=date(2019, 1, 1 + i)
+            )
+            post.tags.add('tag {}'.format(i))
+            post.categories.add(CFGOVPageCategory(name='at-the-cfpb'))
+            save_new_page(post, root=self.blog)
+
+    def tearDown(self):
+        feed_cache.cache.clear()
+
+    def get(self, path='/blog/feed/', **extra):
+        request = self.factory.get(path, **extra)
+        request.site = self.site
+        return feed_cache.serve(self.blog, request)
+
+    def test_feed_items(self):
+        response = self.get()
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, '<title>Post 2</title>')
+        self.assertContains(response, '<category>tag 1</category>')
+        self.assertContains(response, '<category>At the CFPB</category>')
+
+    def test_feed_filters(self):
+        response = self.get('/blog/feed/?topics=tag-1')
+        self.assertContains(response, '<title>Post 1</title>')
+        self.assertNotContains(response, '<title>Post 2</title>')
+
+    def test_feed_filters_by_author_without_facets(self):
+        response = self.get('/blog/feed/?authors=someone')
+        self.assertEqual(response.status_code, 200)
+        self.assertNotContains(response, '<item>')
+
+    def test_feed_items_prefetch_categories_and_tags(self):
+        items = self.blog.get_feed_items({})
+
+        with self.assertNumQueries(0):
+            for item in items:
+                list(item.categories.all())
+                list(item.tags.all())
+
+    def test_feed_is_cached(self):
+        self.get()
+
+        # Only the version of stored feeds is read.
+        with self.assertNumQueries(1):
+            response = self.get()
+
+        self.assertContains(response, '<title>Post 2</title>')
+
+    def test_feeds_are_cached_for_each_scheme(self):
+        self.get()
+        response = self.get(secure=True)
+        self.assertContains(response, 'href="https://testserver/blog/feed/"')
+
+    def test_last_modified_is_newest_item(self):
+        response = self.get()
+        self.assertEqual(
+            response['Last-Modified'],
+            'Thu, 03 Jan 2019 05:00:00 GMT'
+        )
+
+    def test_not_modified(self):
+        etag = self.get()['ETag']
+        response = self.get(HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_publish_updates_feed(self):
+        etag = self.get()['ETag']
+
+        post = BlogPage(title='Post 3', date_published=date(2019, 1, 4))
+        publish_page(post)
+        post.move(self.blog, pos='last-child')
+
+        response = self.get(HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, '<title>Post 3</title>')
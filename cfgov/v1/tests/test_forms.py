@@ -10,24 +10,29 @@ from v1.forms import FilterableDateField, FilterableListForm
 class TestFilterableListForm(TestCase):
 
     @mock.patch('v1.forms.FilterableListForm.__init__')
-    @mock.patch('taggit.models.Tag.objects')
-    def test_set_topics_filters_tags_on_pageids(self, mock_tag_objects, mock_init):
+    def test_set_topics_splits_most_frequent_topics(self, mock_init):
         mock_init.return_value = None
-        page_ids = [1, 2, 3, 4, 5]
+        counts = [('tag-%s' % i, 'Tag %s' % i, 5 - i) for i in range(5)]
         form = FilterableListForm()
         form.fields = {'topics': mock.Mock()}
-        form.set_topics(page_ids=page_ids)
-        mock_tag_objects.filter.assert_called_with(v1_cfgovtaggedpages_items__content_object__id__in=page_ids)
+        form.set_topics(counts)
+        self.assertEqual(form.fields['topics'].choices, (
+            ('Most frequent', [
+                ('tag-0', 'Tag 0'), ('tag-1', 'Tag 1'), ('tag-2', 'Tag 2')
+            ]),
+            ('All other topics', [('tag-3', 'Tag 3'), ('tag-4', 'Tag 4')]),
+        ))
 
     @mock.patch('v1.forms.FilterableListForm.__init__')
-    @mock.patch('taggit.models.Tag.objects')
-    def test_set_authors_filters_tags_on_pageids(self, mock_tag_objects, mock_init):
+    def test_set_authors_uses_counts_order(self, mock_init):
         mock_init.return_value = None
-        page_ids = [1, 2, 3, 4, 5]
         form = FilterableListForm()
         form.fields = {'authors': mock.Mock()}
-        form.set_authors(page_ids=page_ids)
-        mock_tag_objects.filter.assert_called_with(v1_cfgovauthoredpages_items__content_object__id__in=page_ids)
+        form.set_authors([('b', 'B', 2), ('a', 'A', 1)])
+        self.assertEqual(
+            form.fields['authors'].choices,
+            [('b', 'B'), ('a', 'A')]
+        )
 
     @mock.patch('v1.forms.FilterableListForm.__init__')
     @mock.patch('six.moves.builtins.super')
@@ -4,6 +4,11 @@ from django.template import engines
 from django.template.loader import get_template
 from django.test import TestCase, override_settings
 
+import mock
+from jinja2 import FileSystemLoader
+
+from v1.jinja2_environment import RelativeTemplatePathEnvironment
+
 
 @override_settings(TEMPLATES=[{
     'NAME': 'test',
@@ -33,6 +38,44 @@ include "/include.html": include from template root
         )
 
 
+class JoinPathCacheTests(TestCase):
+    def make_env(self, **kwargs):
+        return RelativeTemplatePathEnvironment(
+            loader=FileSystemLoader(
+                os.path.join(os.path.dirname(__file__), 'templates')
+            ),
+            **kwargs
+        )
+
+    def test_resolved_paths_are_kept_in_memory(self):
+        env = self.make_env(auto_reload=False)
+        self.assertEqual(
+            env.join_path('include.html', 'foo/bar/test.html'),
+            'foo/bar/include.html'
+        )
+
+        with mock.patch('os.path.exists') as exists:
+            self.assertEqual(
+                env.join_path('include.html', 'foo/bar/test.html'),
+                'foo/bar/include.html'
+            )
+
+        exists.assert_not_called()
+
+    def test_paths_resolved_every_time_when_auto_reloading(self):
+        env = self.make_env(auto_reload=True)
+        env.join_path('include.html', 'foo/bar/test.html')
+
+        with mock.patch('os.path.exists', return_value=False) as exists:
+            self.assertEqual(
+                env.join_path('include.html', 'foo/bar/test.html'),
+                'include.html'
+            )
+
+        exists.assert_called()
+        self.assertEqual(env.join_path_cache, {})
+
+
 class TranslationsTests(TestCase):
     def setUp(self):
         self.jinja2_engine = engines['wagtail-env']
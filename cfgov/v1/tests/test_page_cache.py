@@ -0,0 +1,248 @@
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+
+from wagtail.wagtailcore.models import Site
+from wagtail.wagtailimages.tests.utils import get_test_image_file
+from wagtailsharing.models import SharingSite
+
+import mock
+
+from v1.models.caching import CacheVersion, PageCacheStats
+from v1.models.images import CFGOVImage
+from v1.models.learn_page import LearnPage
+from v1.models.snippets import ReusableText
+from v1.page_cache import page_cache, page_etags
+from v1.tests.wagtail_pages.helpers import publish_changes, save_new_page
+
+
+PAGE_CACHES = dict(settings.CACHES, page_cache={
+    'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    'LOCATION': 'test_page_cache',
+})
+
+
+@override_settings(CACHES=PAGE_CACHES)
+class PageCacheTests(TestCase):
+    def setUp(self):
+        self.page = LearnPage(title='Cached page', slug='cached')
+        save_new_page(self.page)
+        page_cache.clear()
+        page_cache.clear_sharing_hosts()
+
+    def tearDown(self):
+        page_cache.clear()
+        page_cache.clear_sharing_hosts()
+
+    def test_second_request_is_a_hit(self):
+        response = self.client.get('/cached/')
+        self.assertEqual(response['X-Page-Cache'], 'miss')
+
+        response = self.client.get('/cached/')
+        self.assertEqual(response['X-Page-Cache'], 'hit')
+        self.assertContains(response, 'Cached page')
+
+    def test_stats(self):
+        stats = page_cache.stats
+        self.client.get('/cached/')
+        self.client.get('/cached/')
+        self.assertEqual(page_cache.stats['hits'], stats['hits'] + 1)
+        self.assertEqual(page_cache.stats['misses'], stats['misses'] + 1)
+
+    def test_counts_are_saved_to_database(self):
+        stats = page_cache.stats
+
+        with mock.patch.object(page_cache, 'stats_interval', 0):
+            self.client.get('/cached/')
+
+        self.assertFalse(page_cache.counts)
+        self.assertEqual(
+            PageCacheStats.objects.get(name=page_cache.cache_name).misses,
+            stats['misses'] + 1
+        )
+
+    def test_query_string_is_part_of_key(self):
+        self.client.get('/cached/')
+        response = self.client.get('/cached/?page=2')
+        self.assertEqual(response['X-Page-Cache'], 'miss')
+
+    def test_publish_clears_cache(self):
+        self.client.get('/cached/')
+
+        self.page.title = 'Updated page'
+        publish_changes(self.page)
+
+        response = self.client.get('/cached/')
+        self.assertEqual(response['X-Page-Cache'], 'miss')
+        self.assertContains(response, 'Updated page')
+
+    def test_snippet_save_clears_cache(self):
+        self.client.get('/cached/')
+        ReusableText.objects.create(title='Snippet', text='Text')
+        response = self.client.get('/cached/')
+        self.assertEqual(response['X-Page-Cache'], 'miss')
+
+    def test_flag_state_is_part_of_key(self):
+        self.client.get('/cached/')
+        with self.settings(FLAGS={'BETA_NOTICE': [('boolean', True)]}):
+            response = self.client.get('/cached/')
+        self.assertEqual(response['X-Page-Cache'], 'miss')
+
+    def test_authenticated_requests_bypass_cache(self):
+        User.objects.create_user('user', password='password')
+        self.client.login(username='user', password='password')
+        self.client.get('/cached/')
+        response = self.client.get('/cached/')
+        self.assertNotIn('X-Page-Cache', response)
+
+    def test_post_requests_bypass_cache(self):
+        response = self.client.post('/cached/')
+        self.assertNotIn('X-Page-Cache', response)
+
+    def test_draft_pages_bypass_cache(self):
+        with self.settings(SERVE_LATEST_DRAFT_PAGES=[self.page.pk]):
+            response = self.client.get('/cached/')
+        self.assertNotIn('X-Page-Cache', response)
+        self.assertEqual(response['Serving-Wagtail-Draft'], '1')
+
+    def test_sharing_site_requests_bypass_cache(self):
+        sharing_site = SharingSite.objects.get(
+            site=Site.objects.get(is_default_site=True)
+        )
+        response = self.client.get(
+            '/cached/',
+            HTTP_HOST=sharing_site.hostname
+        )
+        self.assertNotIn('X-Page-Cache', response)
+
+    def test_sharing_check_does_not_query_database(self):
+        request = RequestFactory().get('/cached/')
+        page_cache.is_sharing_request(request)
+
+        with self.assertNumQueries(0):
+            self.assertFalse(page_cache.is_sharing_request(request))
+
+    def test_changed_sharing_site_bypasses_cache(self):
+        self.client.get('/cached/')
+
+        sharing_site = SharingSite.objects.get(
+            site=Site.objects.get(is_default_site=True)
+        )
+        sharing_site.hostname = 'new-sharing-host'
+        sharing_site.save()
+
+        response = self.client.get('/cached/', HTTP_HOST='new-sharing-host')
+        self.assertNotIn('X-Page-Cache', response)
+
+    def test_error_responses_are_not_cached(self):
+        request = RequestFactory().get('/')
+        response = HttpResponse(status=404)
+        self.assertFalse(page_cache.is_cacheable_response(request, response))
+
+    def test_responses_that_set_cookies_are_not_cached(self):
+        request = RequestFactory().get('/')
+        response = HttpResponse()
+        response.set_cookie('cookie', 'value')
+        self.assertFalse(page_cache.is_cacheable_response(request, response))
+
+    def test_responses_that_use_csrf_are_not_cached(self):
+        request = RequestFactory().get('/')
+        request.META['CSRF_COOKIE_USED'] = True
+        self.assertFalse(
+            page_cache.is_cacheable_response(request, HttpResponse())
+        )
+
+
+class PageCacheDisabledTests(TestCase):
+    def test_disabled_without_cache_setting(self):
+        save_new_page(LearnPage(title='Uncached page', slug='uncached'))
+        response = self.client.get('/uncached/')
+        self.assertNotIn('X-Page-Cache', response)
+
+
+@override_settings(ENABLE_PAGE_ETAGS=True)
+class PageETagsTests(TestCase):
+    def setUp(self):
+        self.page = LearnPage(title='Tagged page', slug='tagged')
+        save_new_page(self.page)
+
+    def test_response_has_etag(self):
+        response = self.client.get('/tagged/')
+        self.assertEqual(
+            response['ETag'],
+            self.client.get('/tagged/')['ETag']
+        )
+
+    def test_matching_etag_is_not_modified_without_rendering(self):
+        etag = self.client.get('/tagged/')['ETag']
+
+        with mock.patch.object(LearnPage, 'serve') as serve:
+            response = self.client.get('/tagged/', HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+        serve.assert_not_called()
+
+    def test_publish_changes_etag(self):
+        etag = self.client.get('/tagged/')['ETag']
+
+        self.page.title = 'Updated page'
+        publish_changes(self.page)
+
+        response = self.client.get('/tagged/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Updated page')
+
+    def test_change_on_other_server_changes_etag(self):
+        etag = self.client.get('/tagged/')['ETag']
+        CacheVersion.bump(page_etags.version_name)
+        response = self.client.get('/tagged/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_snippet_save_changes_etag(self):
+        etag = self.client.get('/tagged/')['ETag']
+        ReusableText.objects.create(title='Snippet', text='Text')
+        response = self.client.get('/tagged/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_image_save_changes_etag(self):
+        etag = self.client.get('/tagged/')['ETag']
+        CFGOVImage.objects.create(title='Image', file=get_test_image_file())
+        response = self.client.get('/tagged/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_etag_changes_after_lifetime(self):
+        with mock.patch('v1.page_cache.time.time', return_value=0):
+            etag = self.client.get('/tagged/')['ETag']
+
+        with mock.patch(
+            'v1.page_cache.time.time',
+            return_value=page_etags.lifetime
+        ):
+            response = self.client.get('/tagged/', HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
+
+    def test_flag_state_changes_etag(self):
+        etag = self.client.get('/tagged/')['ETag']
+        with self.settings(FLAGS={'BETA_NOTICE': [('boolean', True)]}):
+            response = self.client.get(
+                '/tagged/',
+                HTTP_IF_NONE_MATCH=etag
+            )
+        self.assertEqual(response.status_code, 200)
+
+    def test_authenticated_requests_have_no_etag_validator(self):
+        etag = self.client.get('/tagged/')['ETag']
+        User.objects.create_user('user', password='password')
+        self.client.login(username='user', password='password')
+        response = self.client.get('/tagged/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    @override_settings(ENABLE_PAGE_ETAGS=False)
+    def test_disabled_without_setting(self):
+        with mock.patch.object(page_cache, 'is_cacheable_request') as check:
+            self.client.get('/tagged/')
+
+        check.assert_not_called()
@@ -0,0 +1,275 @@
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from django.utils.six import StringIO
+
+import mock
+
+from core.testutils.mock_cache_backend import (
+    CACHE_PURGED_TAGS, CACHE_PURGED_URLS
+)
+from v1 import purge_queue
+from v1.models.caching import CDNPurgeRequest
+
+
+MOCK_FRONTEND_CACHE = {
+    'mock': {
+        'BACKEND': 'core.testutils.mock_cache_backend.MockCacheBackend',
+    },
+}
+
+
+@override_settings(WAGTAILFRONTENDCACHE=MOCK_FRONTEND_CACHE)
+class PurgeQueueTests(TestCase):
+    def setUp(self):
+        del CACHE_PURGED_URLS[:]
+        del CACHE_PURGED_TAGS[:]
+
+    def test_enqueue_does_not_purge(self):
+        purge_queue.enqueue_urls(['http://a/'])
+        purge_queue.enqueue_tags(['tag'])
+        self.assertEqual(CACHE_PURGED_URLS, [])
+        self.assertEqual(CACHE_PURGED_TAGS, [])
+        self.assertEqual(CDNPurgeRequest.objects.count(), 2)
+
+    def test_enqueue_for_each_backend(self):
+        with override_settings(WAGTAILFRONTENDCACHE=dict(
+            MOCK_FRONTEND_CACHE,
+            other=MOCK_FRONTEND_CACHE['mock']
+        )):
+            purge_queue.enqueue_urls(['http://a/'])
+
+        self.assertEqual(
+            sorted(CDNPurgeRequest.objects.values_list('backend', flat=True)),
+            ['mock', 'other']
+        )
+
+    def test_enqueue_for_named_backends(self):
+        with override_settings(WAGTAILFRONTENDCACHE=dict(
+            MOCK_FRONTEND_CACHE,
+            other=MOCK_FRONTEND_CACHE['mock']
+        )):
+            purge_queue.enqueue_urls(['http://a/'], backends=['other'])
+
+        self.assertEqual(
+            list(CDNPurgeRequest.objects.values_list('backend', flat=True)),
+            ['other']
+        )
+
+    def test_tags_only_queued_for_backends_that_purge_tags(self):
+        with mock.patch(
+            'core.testutils.mock_cache_backend.MockCacheBackend.purge_tags',
+            new=None
+        ):
+            purge_queue.enqueue_tags(['tag'])
+
+        self.assertFalse(CDNPurgeRequest.objects.exists())
+
+    def test_fallback_urls_queued_for_backends_that_cannot_purge_tags(self):
+        with mock.patch(
+            'core.testutils.mock_cache_backend.MockCacheBackend.purge_tags',
+            new=None
+        ):
+            purge_queue.enqueue_tags(['tag'], fallback_urls=['http://a/'])
+
+        self.assertEqual(
+            list(CDNPurgeRequest.objects.values_list('kind', 'value')),
+            [(CDNPurgeRequest.URL, 'http://a/')]
+        )
+
+    def test_drain_purges_and_empties_queue(self):
+        purge_queue.enqueue_urls(['http://a/', 'http://b/'])
+        purge_queue.enqueue_tags(['tag'])
+
+        stats = purge_queue.drain()
+
+        self.assertEqual(CACHE_PURGED_URLS, ['http://a/', 'http://b/'])
+        self.assertEqual(CACHE_PURGED_TAGS, ['tag'])
+        self.assertEqual(stats['purged'], 3)
+        self.assertEqual(stats['failed'], 0)
+        self.assertFalse(CDNPurgeRequest.objects.exists())
+
+    def test_drain_removes_duplicates(self):
+        purge_queue.enqueue_urls(['http://a/', 'http://b/'])
+        purge_queue.enqueue_urls(['http://a/'])
+
+        purge_queue.drain()
+
+        self.assertEqual(CACHE_PURGED_URLS, ['http://a/', 'http://b/'])
+        self.assertFalse(CDNPurgeRequest.objects.exists())
+
+    def test_drain_batches_by_backend_size(self):
+        purge_queue.enqueue_urls(
+            'http://{}/'.format(i) for i in range(5)
+        )
+
+        with mock.patch(
+            'core.testutils.mock_cache_backend.MockCacheBackend.purge_batch',
+            create=True
+        ) as purge_batch, mock.patch(
+            'core.testutils.mock_cache_backend.MockCacheBackend.'
+            'max_batch_size',
+            new=2,
+            create=True
+        ):
+            purge_queue.drain()
+
+        self.assertEqual(
+            [call[0][0] for call in purge_batch.call_args_list],
+            [
+                ['http://0/', 'http://1/'],
+                ['http://2/', 'http://3/'],
+                ['http://4/'],
+            ]
+        )
+
+    def test_failed_purges_are_retried_with_backoff(self):
+        purge_queue.enqueue_tags(['tag'])
+
+        with mock.patch(
+            'core.testutils.mock_cache_backend.MockCacheBackend.purge_tags',
+            side_effect=ValueError
+        ), mock.patch('v1.purge_queue.logger') as logger:
+            stats = purge_queue.drain()
+
+        logger.exception.assert_called_once()
+        self.assertEqual(stats['failed'], 1)
+
+        request = CDNPurgeRequest.objects.get()
+        self.assertEqual(request.attempts, 1)
+        self.assertGreater(
+            request.next_attempt,
+            timezone.now() + timedelta(seconds=purge_queue.RETRY_DELAY - 5)
+        )
+
+        # The purge isn't retried until it's due.
+        purge_queue.drain()
+        self.assertEqual(CACHE_PURGED_TAGS, [])
+
+        CDNPurgeRequest.objects.update(next_attempt=timezone.now())
+        purge_queue.drain()
+        self.assertEqual(CACHE_PURGED_TAGS, ['tag'])
+        self.assertFalse(CDNPurgeRequest.objects.exists())
+
+    def test_retry_delay_doubles_up_to_maximum(self):
+        self.assertEqual(
+            purge_queue.get_retry_delay(2),
+            timedelta(seconds=purge_queue.RETRY_DELAY * 2)
+        )
+        self.assertEqual(
+            purge_queue.get_retry_delay(100),
+            timedelta(seconds=purge_queue.MAX_RETRY_DELAY)
+        )
+
+    def test_retry_updates_each_attempt_count_once(self):
+        purge_queue.enqueue_tags(['a', 'b'])
+        first, second = CDNPurgeRequest.objects.order_by('pk')
+        CDNPurgeRequest.objects.filter(pk=second.pk).update(attempts=1)
+
+        purge_queue.retry([first.pk, second.pk])
+
+        self.assertEqual(
+            list(CDNPurgeRequest.objects.order_by('pk').values_list(
+                'attempts', flat=True
+            )),
+            [1, 2]
+        )
+
+    def test_purges_dropped_after_max_attempts(self):
+        purge_queue.enqueue_tags(['tag'])
+        CDNPurgeRequest.objects.update(
+            attempts=purge_queue.MAX_ATTEMPTS - 1
+        )
+
+        with mock.patch(
+            'core.testutils.mock_cache_backend.MockCacheBackend.purge_tags',
+            side_effect=ValueError
+        ), mock.patch('v1.purge_queue.logger'):
+            purge_queue.drain()
+
+        self.assertFalse(CDNPurgeRequest.objects.exists())
+
+    def test_purges_for_unknown_backends_dropped(self):
+        CDNPurgeRequest.objects.create(
+            backend='removed',
+            kind=CDNPurgeRequest.URL,
+            value='http://a/'
+        )
+
+        purge_queue.drain()
+
+        self.assertEqual(CACHE_PURGED_URLS, [])
+        self.assertFalse(CDNPurgeRequest.objects.exists())
+
+    def test_stats(self):
+        purge_queue.enqueue_urls(['http://a/'])
+        CDNPurgeRequest.objects.update(
+            created=timezone.now() - timedelta(seconds=60)
+        )
+        purge_queue.enqueue_urls(['http://b/'])
+        self.assertEqual(purge_queue.get_stats()['depth'], 2)
+
+        purge_queue.drain()
+
+        stats = purge_queue.get_stats()
+        self.assertEqual(stats['depth'], 0)
+        self.assertEqual(stats['last_drain']['purged'], 2)
+        self.assertGreaterEqual(stats['last_drain']['latency'], 60)
+
+    def test_overdue(self):
+        purge_queue.enqueue_urls(['http://a/'])
+        self.assertFalse(purge_queue.get_stats()['overdue'])
+
+        CDNPurgeRequest.objects.update(
+            next_attempt=timezone.now() - timedelta(
+                seconds=purge_queue.OVERDUE_AFTER + 1
+            )
+        )
+        self.assertTrue(purge_queue.get_stats()['overdue'])
+
+    def test_command(self):
+        purge_queue.enqueue_urls(['http://a/'])
+        stdout = StringIO()
+
+        call_command('drain_purge_queue', stdout=stdout)
+
+        self.assertEqual(CACHE_PURGED_URLS, ['http://a/'])
+        self.assertIn('Purged 1, failed 0', stdout.getvalue())
+
+
+@override_settings(WAGTAILFRONTENDCACHE=MOCK_FRONTEND_CACHE)
+class ManageCDNPurgeQueueTests(TestCase):
+    def setUp(self):
+        User.objects.create_superuser(
+            username='cdn',
+            email='cdn@example.com',
+            password='password'
+        )
+        self.client.login(username='cdn', password='password')
+
+    def test_shows_queue_depth_and_last_drain(self):
+        purge_queue.enqueue_urls(['http://a/'])
+        purge_queue.drain()
+        purge_queue.enqueue_urls(['http://b/', 'http://c/'])
+
+        response = self.client.get('/admin/cdn/')
+
+        self.assertEqual(response.context['purge_queue']['depth'], 2)
+        self.assertEqual(
+            response.context['purge_queue']['last_drain']['purged'],
+            1
+        )
+        self.assertContains(response, 'Latency of last drain')
+
+    def test_warns_when_purges_are_overdue(self):
+        purge_queue.enqueue_urls(['http://a/'])
+        CDNPurgeRequest.objects.update(
+            next_attempt=timezone.now() - timedelta(hours=1)
+        )
+
+        response = self.client.get('/admin/cdn/')
+
+        self.assertContains(response, 'drain_purge_queue --loop</code> is')
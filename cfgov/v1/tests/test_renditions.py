@@ -0,0 +1,212 @@
+import json
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils.six import StringIO
+
+from wagtail.wagtailimages.tests.utils import get_test_image_file
+
+import mock
+
+from v1.models import CFGOVImage, CFGOVRendition, LearnPage
+from v1.renditions import (
+    generate_renditions, get_missing_renditions, get_page_images,
+    get_page_renditions, prefetch_page_renditions, pregenerate_renditions
+)
+from v1.tests.wagtail_pages.helpers import publish_page
+
+
+class RenditionsTestCase(TestCase):
+    def setUp(self):
+        self.image = CFGOVImage.objects.create(
+            title='image',
+            file=get_test_image_file()
+        )
+        self.sharing_image = CFGOVImage.objects.create(
+            title='sharing image',
+            file=get_test_image_file()
+        )
+
+    def make_page(self, images=None):
+        return LearnPage(
+            title='Page with images',
+            slug='page-with-images',
+            social_sharing_image=self.sharing_image,
+            content=json.dumps([{
+                'type': 'full_width_text',
+                'value': [
+                    {
+                        'type': 'image',
+                        'value': {'image': {'upload': image.pk}},
+                    } for image in images or [self.image]
+                ],
+            }])
+        )
+
+
+class GetPageRenditionsTests(RenditionsTestCase):
+    def test_streamfield_and_foreign_key_images(self):
+        self.assertEqual(get_page_renditions(self.make_page()), set([
+            (self.image.pk, 'original'),
+            (self.image.pk, 'width-1200'),
+            (self.sharing_image.pk, 'original'),
+        ]))
+
+    def test_page_without_images(self):
+        page = LearnPage(title='No images', slug='no-images')
+        self.assertEqual(get_page_renditions(page), set())
+
+
+class GenerateRenditionsTests(RenditionsTestCase):
+    def test_missing_renditions(self):
+        self.image.get_rendition('original')
+
+        self.assertEqual(
+            get_missing_renditions([
+                (self.image.pk, 'original'),
+                (self.image.pk, 'width-1200'),
+                (self.sharing_image.pk, 'original'),
+            ]),
+            [
+                (self.image.pk, 'width-1200'),
+                (self.sharing_image.pk, 'original'),
+            ]
+        )
+
+    def test_missing_renditions_skips_gifs_and_unknown_images(self):
+        gif = CFGOVImage.objects.create(
+            title='gif',
+            file=get_test_image_file(filename='test.gif')
+        )
+
+        self.assertEqual(
+            get_missing_renditions([(gif.pk, 'original'), (0, 'original')]),
+            []
+        )
+
+    def test_generate_renditions(self):
+        stats = generate_renditions([
+            (self.image.pk, 'original'),
+            (self.image.pk, 'width-1200'),
+        ])
+
+        self.assertEqual(stats['generated'], 2)
+        self.assertEqual(stats['failed'], 0)
+        self.assertGreater(stats['per_second'], 0)
+        self.assertEqual(
+            sorted(self.image.renditions.values_list(
+                'filter_spec', flat=True
+            )),
+            ['original', 'width-1200']
+        )
+
+    def test_failed_renditions_are_counted(self):
+        with mock.patch('v1.renditions.logger') as logger:
+            stats = generate_renditions([(self.image.pk, 'invalid-spec')])
+
+        logger.exception.assert_called_once()
+        self.assertEqual(stats['generated'], 0)
+        self.assertEqual(stats['failed'], 1)
+
+    @mock.patch('v1.renditions.connection')
+    @mock.patch('v1.renditions.threading.Thread')
+    @mock.patch('v1.renditions.transaction.on_commit')
+    def test_pregenerate_after_commit_in_thread(self, on_commit, thread, _):
+        pregenerate_renditions(lambda: [(self.image.pk, 'original')])
+        self.assertFalse(CFGOVRendition.objects.exists())
+
+        on_commit.call_args[0][0]()
+        thread.return_value.start.assert_called_once()
+
+        thread.call_args[1]['target']()
+        self.assertTrue(
+            self.image.renditions.filter(filter_spec='original').exists()
+        )
+
+
+class PrefetchRenditionsTests(RenditionsTestCase):
+    def test_prefetched_renditions_need_no_queries(self):
+        page = self.make_page()
+        self.image.get_rendition('original')
+        self.sharing_image.get_rendition('original')
+
+        prefetch_page_renditions(page)
+        images = [image for image, _ in get_page_images(page)]
+
+        with self.assertNumQueries(0):
+            for image in images:
+                rendition = image.get_rendition('original')
+                self.assertEqual(rendition.image, image)
+
+    def test_missing_renditions_are_generated(self):
+        page = self.make_page()
+        prefetch_page_renditions(page)
+        image, _ = next(get_page_images(page))
+
+        rendition = image.get_rendition('width-1200')
+
+        self.assertEqual(rendition.filter_spec, 'width-1200')
+        self.assertTrue(CFGOVRendition.objects.filter(pk=rendition.pk))
+
+    def test_page_with_many_images_queries_renditions_once(self):
+        images = [
+            CFGOVImage.objects.create(
+                title='image {}'.format(i),
+                file=get_test_image_file()
+            ) for i in range(5)
+        ]
+
+        page = self.make_page(images=images)
+        publish_page(page)
+        generate_renditions(get_missing_renditions(get_page_renditions(page)))
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/page-with-images/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len([
+            query for query in queries.captured_queries
+            if 'FROM "v1_cfgovrendition"' in query['sql']
+        ]), 1)
+
+
+class PregenerateHooksTests(RenditionsTestCase):
+    @mock.patch('v1.wagtail_hooks.pregenerate_renditions')
+    def test_page_publish(self, pregenerate_renditions):
+        page = self.make_page()
+        publish_page(page)
+
+        get_renditions = pregenerate_renditions.call_args[0][0]
+        self.assertIn((self.image.pk, 'width-1200'), get_renditions())
+
+    @mock.patch('v1.wagtail_hooks.pregenerate_renditions')
+    def test_image_upload(self, pregenerate_renditions):
+        image = CFGOVImage.objects.create(
+            title='new image',
+            file=get_test_image_file()
+        )
+
+        get_renditions = pregenerate_renditions.call_args[0][0]
+        self.assertEqual(get_renditions(), [(image.pk, 'original')])
+
+
+class GenerateRenditionsCommandTests(RenditionsTestCase):
+    def test_command_backfills_images_and_pages(self):
+        publish_page(self.make_page())
+        stdout = StringIO()
+
+        call_command('generate_renditions', processes=1, stdout=stdout)
+
+        self.assertEqual(
+            sorted(CFGOVRendition.objects.values_list(
+                'image_id', 'filter_spec'
+            )),
+            [
+                (self.image.pk, 'original'),
+                (self.image.pk, 'width-1200'),
+                (self.sharing_image.pk, 'original'),
+            ]
+        )
+        self.assertIn('Generated 3 renditions', stdout.getvalue())
@@ -1,3 +1,4 @@
+from django.conf import settings
 from django.core.cache import caches
 from django.test import (
     RequestFactory, SimpleTestCase, TestCase, override_settings
@@ -10,6 +11,7 @@ from wagtail.wagtailcore.rich_text import DbWhitelister
 
 import mock
 
+from v1.jinja2tags.fragment_cache import get_tagged_key
 from v1.models.base import CFGOVPage
 from v1.models.menu_item import MenuItem
 from v1.models.resources import Resource
@@ -62,53 +64,36 @@ class TestFormModuleHandlers(TestCase):
         self.request = mock.Mock()
         self.context = {}
 
-    @mock.patch('six.moves.builtins.hasattr')
-    @mock.patch('v1.wagtail_hooks.util.get_streamfields')
-    def test_sets_context(self, mock_getstreamfields, mock_hasattr):
-        mock_hasattr.return_value = True
+    @mock.patch('v1.wagtail_hooks.util.get_form_blocks')
+    def test_sets_context(self, mock_getformblocks):
         child = mock.Mock()
-        mock_getstreamfields().items.return_value = [('name', [child])]
+        mock_getformblocks.return_value = [('name', 0, child)]
         form_module_handlers(self.page, self.request, self.context)
         assert 'form_modules' in self.context
 
-    @mock.patch('v1.wagtail_hooks.util.get_streamfields')
-    def test_does_not_set_context(self, mock_getstreamfields):
-        mock_getstreamfields().items.return_value = []
+    @mock.patch('v1.wagtail_hooks.util.get_form_blocks')
+    def test_does_not_set_context(self, mock_getformblocks):
+        mock_getformblocks.return_value = []
         form_module_handlers(self.page, self.request, self.context)
         assert 'form_modules' not in self.context
 
-    @mock.patch('v1.wagtail_hooks.util.get_streamfields')
-    def test_calls_get_streamfields(self, mock_getstreamfields):
+    @mock.patch('v1.wagtail_hooks.util.get_form_blocks')
+    def test_calls_get_form_blocks(self, mock_getformblocks):
         form_module_handlers(self.page, self.request, self.context)
-        mock_getstreamfields.assert_called_with(self.page)
+        mock_getformblocks.assert_called_with(self.page)
 
-    @mock.patch('six.moves.builtins.hasattr')
-    @mock.patch('v1.wagtail_hooks.util.get_streamfields')
-    def test_checks_child_block_if_set_form_context_exists(self, mock_getstreamfields, mock_hasattr):
+    @mock.patch('v1.wagtail_hooks.util.get_form_blocks')
+    def test_sets_context_fieldname_if_not_set(self, mock_getformblocks):
         child = mock.Mock()
-        streamfields = {'name': [child]}
-        mock_getstreamfields.return_value = streamfields
-        form_module_handlers(self.page, self.request, self.context)
-        mock_hasattr.assert_called_with(child.block, 'get_result')
-
-    @mock.patch('six.moves.builtins.hasattr')
-    @mock.patch('v1.wagtail_hooks.util.get_streamfields')
-    def test_sets_context_fieldname_if_not_set(self, mock_getstreamfields, mock_hasattr):
-        child = mock.Mock()
-        streamfields = {'name': [child]}
-        mock_getstreamfields.return_value = streamfields
-        mock_hasattr.return_value = True
+        mock_getformblocks.return_value = [('name', 0, child)]
         form_module_handlers(self.page, self.request, self.context)
         assert 'name' in self.context['form_modules']
         self.assertIsInstance(self.context['form_modules']['name'], dict)
 
-    @mock.patch('six.moves.builtins.hasattr')
-    @mock.patch('v1.wagtail_hooks.util.get_streamfields')
-    def test_calls_child_block_get_result(self, mock_getstreamfields, mock_hasattr):
+    @mock.patch('v1.wagtail_hooks.util.get_form_blocks')
+    def test_calls_child_block_get_result(self, mock_getformblocks):
         child = mock.Mock()
-        streamfields = {'name': [child]}
-        mock_getstreamfields.return_value = streamfields
-        mock_hasattr.return_value = True
+        mock_getformblocks.return_value = [('name', 0, child)]
         form_module_handlers(self.page, self.request, self.context)
         child.block.get_result.assert_called_with(
             self.page,
@@ -117,13 +102,10 @@ class TestFormModuleHandlers(TestCase):
             child.block.is_submitted()
         )
 
-    @mock.patch('six.moves.builtins.hasattr')
-    @mock.patch('v1.wagtail_hooks.util.get_streamfields')
-    def test_calls_child_block_is_submitted(self, mock_getstreamfields, mock_hasattr):
+    @mock.patch('v1.wagtail_hooks.util.get_form_blocks')
+    def test_calls_child_block_is_submitted(self, mock_getformblocks):
         child = mock.Mock()
-        streamfields = {'name': [child]}
-        mock_getstreamfields.return_value = streamfields
-        mock_hasattr.return_value = True
+        mock_getformblocks.return_value = [('name', 0, child)]
         form_module_handlers(self.page, self.request, self.context)
         child.block.is_submitted.assert_called_with(self.request, 'name', 0)
 
@@ -150,22 +132,23 @@ class TestServeLatestDraftPage(TestCase):
 
 class TestMenuItemSave(TestCase):
     @override_settings(
-        CACHES = {
-            'default_fragment_cache': {
-                'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
-            }
-        })
+        CACHES=dict(settings.CACHES, default_fragment_cache={
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }))
     def test_mega_menu_cache_cleared(self):
-        caches['default_fragment_cache'].set('mega_menu', 'menu_content')
-        self.assertEqual(
-            caches['default_fragment_cache'].get('mega_menu'),
-            'menu_content'
+        cache = caches['default_fragment_cache']
+        key = get_tagged_key(
+            'default_fragment_cache', 'mega_menu', ['v1.menuitem']
         )
+        cache.set(key, 'menu_content')
+        self.assertEqual(cache.get(key), 'menu_content')
         menu_item = MenuItem()
         menu_item.save()
-        self.assertEqual(
-            caches['default_fragment_cache'].get('mega_menu'),
-            None
+        self.assertNotEqual(
+            get_tagged_key(
+                'default_fragment_cache', 'mega_menu', ['v1.menuitem']
+            ),
+            key
         )
 
 
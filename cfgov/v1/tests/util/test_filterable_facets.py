@@ -0,0 +1,82 @@
+from django.conf import settings
+from django.test import TestCase, override_settings
+
+from v1.models import BlogPage, CacheVersion
+from v1.models.learn_page import AbstractFilterPage
+from v1.tests.wagtail_pages.helpers import publish_changes, publish_page
+from v1.util.filterable_facets import filterable_facets
+
+
+@override_settings(CACHES=dict(settings.CACHES, default={
+    'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    'LOCATION': 'test-filterable-facets',
+}))
+class FilterableFacetsTests(TestCase):
+    def setUp(self):
+        filterable_facets.cache.clear()
+
+        self.page1 = BlogPage(title='Page 1')
+        self.page1.tags.add('foo', 'bar')
+        self.page1.authors.add('author')
+        publish_page(self.page1)
+
+        self.page2 = BlogPage(title='Page 2')
+        self.page2.tags.add('bar')
+        publish_page(self.page2)
+
+        self.pages = AbstractFilterPage.objects.live()
+
+    def tearDown(self):
+        filterable_facets.cache.clear()
+
+    def test_counts(self):
+        self.assertEqual(filterable_facets.get(self.pages), {
+            'topics': [('bar', 'bar', 2), ('foo', 'foo', 1)],
+            'authors': [('author', 'author', 1)],
+        })
+
+    def test_counts_only_given_pages(self):
+        pages = self.pages.filter(pk=self.page2.pk)
+        self.assertEqual(filterable_facets.get(pages), {
+            'topics': [('bar', 'bar', 1)],
+            'authors': [],
+        })
+
+    def test_empty_pages(self):
+        self.assertEqual(
+            filterable_facets.get(AbstractFilterPage.objects.none()),
+            {'topics': [], 'authors': []}
+        )
+
+    def test_counts_are_cached(self):
+        filterable_facets.get(self.pages)
+
+        # Only the version of stored counts is read.
+        with self.assertNumQueries(1):
+            filterable_facets.get(self.pages)
+
+    def test_unpublish_updates_counts(self):
+        filterable_facets.get(self.pages)
+        self.page1.unpublish()
+        self.assertEqual(
+            filterable_facets.get(self.pages)['topics'],
+            [('bar', 'bar', 1)]
+        )
+
+    def test_change_on_other_server_updates_counts(self):
+        filterable_facets.get(self.pages)
+        BlogPage.objects.filter(pk=self.page2.pk).update(live=False)
+        CacheVersion.bump(filterable_facets.version_name)
+        self.assertEqual(
+            filterable_facets.get(self.pages)['topics'],
+            [('bar', 'bar', 1), ('foo', 'foo', 1)]
+        )
+
+    def test_tag_change_updates_counts(self):
+        filterable_facets.get(self.pages)
+        self.page2.tags.add('foo')
+        publish_changes(self.page2)
+        self.assertEqual(
+            filterable_facets.get(self.pages)['topics'],
+            [('bar', 'bar', 2), ('foo', 'foo', 2)]
+        )
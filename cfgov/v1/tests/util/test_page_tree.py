@@ -0,0 +1,152 @@
+from django.test import RequestFactory, TestCase
+
+from wagtail.wagtailcore.models import Page, Site
+
+import mock
+
+from v1.models import BlogPage, BrowseFilterablePage, CacheVersion, CFGOVPage
+from v1.tests.wagtail_pages.helpers import publish_changes, save_new_page
+from v1.util.page_tree import page_tree
+
+
+class PageTreeTests(TestCase):
+    def setUp(self):
+        page_tree.clear()
+
+        self.site = Site.objects.get(is_default_site=True)
+        self.request = RequestFactory().get('/')
+        self.request.site = self.site
+
+        self.section = BrowseFilterablePage(title='Section', slug='section')
+        save_new_page(self.section)
+
+        self.parent = CFGOVPage(title='Parent', slug='parent')
+        save_new_page(self.parent, root=self.section)
+
+        self.page = BlogPage(title='Page', slug='page')
+        save_new_page(self.page, root=self.parent)
+
+    def tearDown(self):
+        page_tree.clear()
+
+    def get_ancestor_titles(self, page):
+        return [node.title for node in page_tree.get_ancestors(page)]
+
+    def test_ancestors(self):
+        self.assertEqual(
+            self.get_ancestor_titles(self.page),
+            ['Root', 'CFGov', 'Section', 'Parent']
+        )
+
+    def test_ancestors_of_unknown_page(self):
+        self.assertIsNone(page_tree.get_ancestors(CFGOVPage(title='New')))
+
+    def test_get_by_slug(self):
+        other = CFGOVPage(title='Other parent', slug='parent')
+        save_new_page(other, root=self.parent)
+
+        self.assertEqual(
+            [node.id for node in page_tree.get_by_slug('parent')],
+            [self.parent.pk, other.pk]
+        )
+        self.assertEqual(page_tree.get_by_slug('missing'), [])
+
+    def test_lookups_survive_tree_dropped_by_other_thread(self):
+        ensure_loaded = page_tree.ensure_loaded
+
+        def ensure_loaded_then_clear():
+            loaded = ensure_loaded()
+            page_tree.clear()
+            return loaded
+
+        with mock.patch.object(
+            page_tree,
+            'ensure_loaded',
+            ensure_loaded_then_clear
+        ):
+            self.assertEqual(page_tree.get(self.page.pk).id, self.page.pk)
+            self.assertEqual(
+                page_tree.get_by_path(self.page.path).id,
+                self.page.pk
+            )
+
+    def test_breadcrumbs_do_not_query(self):
+        self.page.get_breadcrumbs(self.request)
+
+        with self.assertNumQueries(0):
+            breadcrumbs = self.page.get_breadcrumbs(self.request)
+
+        self.assertEqual(
+            [(crumb.title, crumb.url) for crumb in breadcrumbs],
+            [('Parent', '/section/parent/')]
+        )
+
+    def test_breadcrumbs_match_database(self):
+        expected = self.page.get_ancestors()[3:]
+        self.assertEqual(
+            [crumb.pk for crumb in self.page.get_breadcrumbs(self.request)],
+            [page.pk for page in expected]
+        )
+
+    def test_filter_data_queries_once(self):
+        page_tree.get(self.page.pk)
+
+        with self.assertNumQueries(1):
+            filter_page = self.page.get_filter_data()
+
+        self.assertIsInstance(filter_page, BrowseFilterablePage)
+        self.assertEqual(filter_page.pk, self.section.pk)
+
+    def test_parent_queries_once(self):
+        page_tree.get(self.page.pk)
+
+        with self.assertNumQueries(1):
+            parent = self.page.parent()
+
+        self.assertIsInstance(parent, CFGOVPage)
+        self.assertEqual(parent.pk, self.parent.pk)
+
+    def test_title_change_is_updated(self):
+        page_tree.get(self.page.pk)
+        self.parent.title = 'New parent'
+        publish_changes(self.parent)
+        self.assertEqual(
+            self.get_ancestor_titles(self.page)[-1],
+            'New parent'
+        )
+
+    def test_draft_title_is_not_used(self):
+        page_tree.get(self.page.pk)
+        self.parent.title = 'Draft parent'
+        self.parent.save_revision()
+        self.assertEqual(self.get_ancestor_titles(self.page)[-1], 'Parent')
+
+    def test_move_is_updated(self):
+        page_tree.get(self.page.pk)
+        self.parent.move(self.section.get_parent(), pos='last-child')
+
+        page = Page.objects.get(pk=self.page.pk)
+        self.assertEqual(
+            self.get_ancestor_titles(page),
+            ['Root', 'CFGov', 'Parent']
+        )
+        self.assertEqual(page_tree.get(page.pk).url_path, page.url_path)
+
+    def test_delete_is_updated(self):
+        page_tree.get(self.page.pk)
+        self.parent.delete()
+        self.assertIsNone(page_tree.get(self.parent.pk))
+        self.assertIsNone(page_tree.get(self.page.pk))
+
+    def test_changes_from_other_servers_are_loaded(self):
+        page_tree.get(self.page.pk)
+        Page.objects.filter(pk=self.parent.pk).update(title='Other server')
+        CacheVersion.bump(page_tree.version_name)
+
+        self.assertEqual(self.get_ancestor_titles(self.page)[-1], 'Parent')
+
+        page_tree.version_checked = 0
+        self.assertEqual(
+            self.get_ancestor_titles(self.page)[-1],
+            'Other server'
+        )
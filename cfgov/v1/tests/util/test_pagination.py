@@ -0,0 +1,146 @@
+from datetime import date
+
+from django.test import RequestFactory, TestCase
+
+import mock
+
+from v1.models import BlogPage
+from v1.models.learn_page import AbstractFilterPage
+from v1.tests.wagtail_pages.helpers import publish_page
+from v1.util.filterable_list import FilterableListMixin
+from v1.util.pagination import (
+    NEXT, KeysetPage, KeysetPaginator, decode_cursor, encode_cursor
+)
+
+
+class CursorTests(TestCase):
+    def test_round_trip(self):
+        cursor = encode_cursor(NEXT, date(2019, 1, 2), 3)
+        self.assertEqual(decode_cursor(cursor), (NEXT, date(2019, 1, 2), 3))
+
+    def test_invalid_cursors(self):
+        wrong_direction = encode_cursor('up', date.today(), 1)
+
+        for cursor in ('', 'not-a-cursor', wrong_direction):
+            self.assertIsNone(decode_cursor(cursor))
+
+
+class KeysetPaginatorTests(TestCase):
+    def setUp(self):
+        # Two pages share each date, so that ties are ordered by id.
+        for i in range(7):
+            publish_page(BlogPage(
+                title='Post {}'.format(i),
+                date_published=date(2019, 1, 1 + i // 2)
+            ))
+
+        self.pages = AbstractFilterPage.objects.live().order_by(
+            '-date_published', '-pk'
+        )
+        self.paginator = KeysetPaginator(self.pages, 3)
+
+    def titles(self, page):
+        return [post.title for post in page]
+
+    def test_first_page(self):
+        page = self.paginator.page()
+        self.assertEqual(self.titles(page), ['Post 6', 'Post 5', 'Post 4'])
+        self.assertTrue(page.has_next())
+        self.assertFalse(page.has_previous())
+        self.assertIsNone(page.previous_cursor)
+
+    def test_next_pages(self):
+        page2 = self.paginator.page(self.paginator.page().next_cursor)
+        self.assertEqual(self.titles(page2), ['Post 3', 'Post 2', 'Post 1'])
+        self.assertTrue(page2.has_previous())
+
+        page3 = self.paginator.page(page2.next_cursor)
+        self.assertEqual(self.titles(page3), ['Post 0'])
+        self.assertFalse(page3.has_next())
+        self.assertIsNone(page3.next_cursor)
+
+    def test_previous_page(self):
+        page2 = self.paginator.page(self.paginator.page().next_cursor)
+        page3 = self.paginator.page(page2.next_cursor)
+
+        previous = self.paginator.page(page3.previous_cursor)
+        self.assertEqual(self.titles(previous), self.titles(page2))
+        self.assertTrue(previous.has_previous())
+        self.assertTrue(previous.has_next())
+
+        first = self.paginator.page(previous.previous_cursor)
+        self.assertEqual(self.titles(first), ['Post 6', 'Post 5', 'Post 4'])
+        self.assertFalse(first.has_previous())
+
+    def test_deep_pages_do_not_count(self):
+        cursor = self.paginator.page().next_cursor
+
+        with self.assertNumQueries(1):
+            self.paginator.page(cursor).object_list
+
+    def test_invalid_cursor_returns_first_page(self):
+        page = self.paginator.page('not-a-cursor')
+        self.assertEqual(self.titles(page), ['Post 6', 'Post 5', 'Post 4'])
+
+    def test_page_number(self):
+        page = self.paginator.page(number='2')
+        self.assertEqual(self.titles(page), ['Post 3', 'Post 2', 'Post 1'])
+        self.assertTrue(page.has_previous())
+        self.assertTrue(page.has_next())
+
+        next_page = self.paginator.page(page.next_cursor)
+        self.assertEqual(self.titles(next_page), ['Post 0'])
+
+        previous = self.paginator.page(page.previous_cursor)
+        self.assertEqual(self.titles(previous), ['Post 6', 'Post 5', 'Post 4'])
+
+    def test_page_number_past_end_returns_last_page(self):
+        page = self.paginator.page(number='10')
+        self.assertEqual(self.titles(page), ['Post 0'])
+        self.assertFalse(page.has_next())
+
+    def test_invalid_page_number_returns_first_page(self):
+        for number in ('abc', '0', '-1'):
+            page = self.paginator.page(number=number)
+            self.assertEqual(self.titles(page), ['Post 6', 'Post 5', 'Post 4'])
+
+    def test_cursor_is_used_before_page_number(self):
+        cursor = self.paginator.page().next_cursor
+        page = self.paginator.page(cursor, number='3')
+        self.assertEqual(self.titles(page), ['Post 3', 'Post 2', 'Post 1'])
+
+    def test_count(self):
+        self.assertEqual(self.paginator.count, 7)
+
+
+class FilterableListKeysetPaginationTests(TestCase):
+    def test_process_form_uses_cursor(self):
+        mixin = FilterableListMixin()
+        mixin.filterable_keyset_pagination = True
+        request = RequestFactory().get('/?cursor=abc')
+        form = mock.Mock()
+        form.get_page_set.return_value = AbstractFilterPage.objects.none()
+
+        with mock.patch.object(KeysetPaginator, 'page') as page:
+            mixin.process_form(request, form)
+
+        page.assert_called_once_with('abc', number=None)
+
+    def test_process_form_passes_page_number(self):
+        mixin = FilterableListMixin()
+        mixin.filterable_keyset_pagination = True
+        request = RequestFactory().get('/?page=4')
+        form = mock.Mock()
+        form.get_page_set.return_value = AbstractFilterPage.objects.none()
+
+        with mock.patch.object(KeysetPaginator, 'page') as page:
+            mixin.process_form(request, form)
+
+        page.assert_called_once_with(None, number='4')
+
+    def test_empty_page(self):
+        paginator = KeysetPaginator(AbstractFilterPage.objects.none(), 10)
+        page = paginator.page()
+        self.assertIsInstance(page, KeysetPage)
+        self.assertFalse(page.has_other_pages())
+        self.assertEqual(paginator.count, 0)
@@ -0,0 +1,116 @@
+from django.conf import settings
+from django.test import RequestFactory, TestCase, override_settings
+
+from wagtail.wagtailcore.models import Site
+
+from v1.models import BrowseFilterablePage, BrowsePage, CFGOVPage
+from v1.tests.wagtail_pages.helpers import (
+    publish_changes, publish_page, save_new_page
+)
+from v1.util.page_tree import page_tree
+from v1.util.secondary_nav import secondary_nav
+from v1.util.util import get_secondary_nav_items
+
+
+class SecondaryNavTests(TestCase):
+    def setUp(self):
+        page_tree.clear()
+        secondary_nav.clear()
+
+        self.request = RequestFactory().get('/')
+        self.request.site = Site.objects.get(is_default_site=True)
+
+        self.browse1 = BrowsePage(title='Browse 1', slug='browse1')
+        publish_page(child=self.browse1)
+        self.browse2 = BrowseFilterablePage(title='Browse 2', slug='browse2')
+        publish_page(child=self.browse2)
+        publish_page(child=CFGOVPage(title='Other', slug='other'))
+
+        self.child = BrowsePage(title='Child', slug='child')
+        save_new_page(self.child, root=self.browse1)
+
+    def tearDown(self):
+        page_tree.clear()
+        secondary_nav.clear()
+
+    def get_nav(self, page):
+        return get_secondary_nav_items(self.request, page)
+
+    def get_titles(self, page):
+        nav, _ = self.get_nav(page)
+        return [
+            (item['title'], [child['title'] for child in item['children']])
+            for item in nav
+        ]
+
+    def test_nav_items(self):
+        nav, has_children = self.get_nav(self.child)
+        self.assertTrue(has_children)
+        self.assertEqual(nav, [
+            {
+                'title': 'Browse 1',
+                'slug': 'browse1',
+                'url': '/browse1/',
+                'children': [{
+                    'title': 'Child',
+                    'slug': 'child',
+                    'url': '/browse1/child/',
+                    'active': True,
+                }],
+                'active': False,
+                'expanded': True,
+            },
+            {
+                'title': 'Browse 2',
+                'slug': 'browse2',
+                'url': '/browse2/',
+                'children': [],
+                'active': False,
+                'expanded': False,
+            },
+        ])
+
+    @override_settings(CACHES=dict(settings.CACHES, default={
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'test-secondary-nav',
+    }))
+    def test_nav_is_cached(self):
+        self.get_nav(self.browse1)
+
+        with self.assertNumQueries(0):
+            self.get_nav(self.browse1)
+            self.get_nav(self.browse2)
+            self.get_nav(self.child)
+
+    def test_publish_updates_nav(self):
+        self.get_nav(self.browse1)
+        publish_page(child=BrowsePage(title='Browse 3', slug='browse3'))
+        self.assertEqual(
+            self.get_titles(self.browse1),
+            [('Browse 1', ['Child']), ('Browse 2', []), ('Browse 3', [])]
+        )
+
+    def test_exclude_siblings_updates_nav(self):
+        self.get_nav(self.child)
+        self.browse1.secondary_nav_exclude_sibling_pages = True
+        publish_changes(self.browse1)
+        self.assertEqual(
+            self.get_titles(self.child),
+            [('Browse 1', ['Child'])]
+        )
+
+    def test_unpublish_updates_nav(self):
+        self.get_nav(self.browse1)
+        self.browse2.unpublish()
+        self.assertEqual(
+            self.get_titles(self.browse1),
+            [('Browse 1', ['Child'])]
+        )
+
+    def test_move_updates_nav(self):
+        self.get_nav(self.browse1)
+        self.child.move(self.browse2, pos='last-child')
+        self.assertEqual(
+            self.get_titles(self.browse2),
+            [('Browse 1', []), ('Browse 2', ['Child'])]
+        )
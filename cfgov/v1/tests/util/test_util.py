@@ -2,9 +2,13 @@ from datetime import date
 
 from django.test import TestCase
 
+from wagtail.wagtailcore.blocks import StreamValue
+
 import mock
 
-from v1.models import BrowseFilterablePage, BrowsePage, CFGOVPage, HomePage
+from v1.models import (
+    BrowseFilterablePage, BrowsePage, CFGOVPage, HomePage, LearnPage
+)
 from v1.tests.wagtail_pages import helpers
 from v1.util import util
 
@@ -22,6 +26,55 @@ class TestUtilFunctions(TestCase):
         self.assertEqual(result, {'key': 'value'})
 
 
+
+class TestGetFormBlocks(TestCase):
+    def make_page(self, stream_data, is_lazy=False):
+        page = LearnPage(title='Learn page', slug='learn')
+        page.content = StreamValue(
+            page.content.stream_block,
+            stream_data,
+            is_lazy=is_lazy
+        )
+        return page
+
+    def test_form_block_names(self):
+        page = self.make_page([])
+        self.assertEqual(
+            util.get_form_block_names(page.content.stream_block),
+            frozenset(['feedback'])
+        )
+
+    def test_page_without_form_blocks(self):
+        page = self.make_page([('full_width_text', [])])
+        self.assertEqual(util.get_form_blocks(page), [])
+
+    def test_page_with_form_blocks(self):
+        page = self.make_page([
+            ('full_width_text', []),
+            ('feedback', {}),
+        ])
+        form_blocks = util.get_form_blocks(page)
+
+        self.assertEqual(len(form_blocks), 1)
+        fieldname, index, child = form_blocks[0]
+        self.assertEqual((fieldname, index), ('content', 1))
+        self.assertEqual(child.block_type, 'feedback')
+
+    def test_other_blocks_are_not_converted(self):
+        page = self.make_page([
+            {'type': 'full_width_text', 'value': []},
+            {'type': 'feedback', 'value': {}},
+        ], is_lazy=True)
+
+        with mock.patch.object(
+            page.content.stream_block.child_blocks['full_width_text'],
+            'to_python'
+        ) as to_python:
+            util.get_form_blocks(page)
+
+        to_python.assert_not_called()
+
+
 class TestExtendedStrftime(TestCase):
 
     def test_date_formatted_without_leading_zero_in_day(self):
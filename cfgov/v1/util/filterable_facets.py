@@ -0,0 +1,96 @@
+import hashlib
+
+from django.core.cache import caches
+from django.core.exceptions import EmptyResultSet
+from django.db.models import Count
+from django.utils.encoding import force_bytes
+
+from taggit.models import Tag
+
+
+# Names of the relations from tags to the pages that use them, by facet.
+FACET_RELATIONS = (
+    ('topics', 'v1_cfgovtaggedpages_items'),
+    ('authors', 'v1_cfgovauthoredpages_items'),
+)
+
+
+def count_tags(pages, relation):
+    """Return (slug, name, count) for each tag used by a set of pages.
+
+    Tags are ordered from the most to the least used.
+    """
+    return list(
+        Tag.objects
+        .filter(**{relation + '__content_object__in': pages.values('pk')})
+        .values_list('slug', 'name')
+        .annotate(count=Count(relation))
+        .order_by('-count', 'name')
+    )
+
+
+class FilterableFacets(object):
+    """A store of topic and author counts for filterable lists.
+
+    Filterable list pages offer the topics and authors of the pages that
+    they filter as choices, ordered by how many of those pages use each.
+    Those counts are aggregated once for each distinct set of filterable
+    pages and kept in the default cache, keyed by the query that selects
+    those pages.
+
+    Every stored count is invalidated at once by changing a version stored
+    in the database as a CacheVersion, so that counts kept on every server
+    are invalidated. This happens whenever a page is published, unpublished,
+    moved, or deleted, or whenever page tags change; see v1.wagtail_hooks.
+    """
+    cache_name = 'default'
+    version_name = 'filterable_facets'
+
+    @property
+    def cache(self):
+        return caches[self.cache_name]
+
+    def get_version(self):
+        from v1.models.caching import CacheVersion
+        return CacheVersion.current(self.version_name)
+
+    def invalidate(self):
+        from v1.models.caching import CacheVersion
+        CacheVersion.bump(self.version_name)
+
+    def get_key(self, pages):
+        """Return a key for a set of pages, or None if it must be empty."""
+        try:
+            query = pages.values('pk').query.sql_with_params()
+        except EmptyResultSet:
+            return None
+
+        return 'filterable_facets_{}_{}'.format(
+            self.get_version(),
+            hashlib.sha1(force_bytes(repr(query))).hexdigest()
+        )
+
+    def get(self, pages):
+        """Return the topic and author counts of a set of pages.
+
+        Counts are returned as a dict of lists of (slug, name, count),
+        keyed by facet name.
+        """
+        key = self.get_key(pages)
+
+        if key is None:
+            return {name: [] for name, _ in FACET_RELATIONS}
+
+        facets = self.cache.get(key)
+
+        if facets is None:
+            facets = {
+                name: count_tags(pages, relation)
+                for name, relation in FACET_RELATIONS
+            }
+            self.cache.set(key, facets)
+
+        return facets
+
+
+filterable_facets = FilterableFacets()
@@ -2,6 +2,7 @@ from django.core.paginator import EmptyPage, PageNotAnInteger, Paginator
 
 from v1.forms import FilterableListForm
 from v1.models.learn_page import AbstractFilterPage
+from v1.util.pagination import KeysetPaginator
 from v1.util.ref import get_category_children
 from v1.util.util import get_secondary_nav_items
 
@@ -18,6 +19,9 @@ class FilterableListMixin(object):
     filterable_per_page_limit = 10
     """Number of results to return per page."""
 
+    filterable_keyset_pagination = False
+    """Determines whether results are paginated by cursor; see process_form."""
+
     do_not_index = False
     """Determines whether we tell crawlers to index the page or not."""
 
@@ -76,7 +80,16 @@ class FilterableListMixin(object):
 
     def process_form(self, request, form):
         filter_data = {}
-        if form.is_valid():
+        if form.is_valid() and self.filterable_keyset_pagination:
+            # Select pages of results with cursors instead of page numbers,
+            # so that later pages don't need to skip over earlier ones.
+            paginator = KeysetPaginator(form.get_page_set(),
+                                        self.filterable_per_page_limit)
+            filter_data['page_set'] = paginator.page(
+                request.GET.get('cursor'),
+                number=request.GET.get('page')
+            )
+        elif form.is_valid():
             paginator = Paginator(form.get_page_set(),
                                   self.filterable_per_page_limit)
             page = request.GET.get('page')
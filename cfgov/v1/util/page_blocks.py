@@ -0,0 +1,135 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+from django.core.cache import caches
+from django.utils.encoding import force_bytes
+from django.utils.lru_cache import lru_cache
+from django.utils.module_loading import import_string
+
+from wagtail.wagtailcore.fields import StreamField
+
+from wagtailinventory.helpers import get_block_name, get_page_blocks
+
+
+# Maximum number of page block inventories to keep in memory.
+MAX_ENTRIES = 1000
+
+
+def get_block_definition_names(block):
+    """Return the names of a block class and all of its possible children."""
+    names = [get_block_name(block)]
+
+    children = list(getattr(block, 'child_blocks', {}).values())
+    if hasattr(block, 'child_block'):
+        children.append(block.child_block)
+
+    for child in children:
+        names.extend(get_block_definition_names(child))
+
+    return names
+
+
+@lru_cache(maxsize=None)
+def get_page_definition_key(page_cls):
+    """Return a hash of the StreamField block definitions of a page type.
+
+    This changes whenever block classes are renamed or added to or removed
+    from a page type, so that cached inventories from other versions of
+    the code aren't used.
+    """
+    key = hashlib.sha1(force_bytes(page_cls._meta.label_lower))
+
+    for field in page_cls._meta.fields:
+        if isinstance(field, StreamField):
+            key.update(force_bytes(field.name))
+            key.update(force_bytes(
+                ' '.join(get_block_definition_names(field.stream_block))
+            ))
+
+    return key.hexdigest()
+
+
+class PageBlocksCache(object):
+    """A cache of the block classes used by published pages.
+
+    wagtailinventory.helpers.get_page_blocks converts every block of every
+    StreamField on a page to find the classes that it uses. Its result only
+    depends on the page's block definitions and the revision that was last
+    published, so it is kept in memory and in the shared cache, keyed by a
+    hash of the definitions and by the page's last publication time.
+
+    Only pages loaded from the database are cached, because their content
+    is that of their last published revision. Other pages, like drafts,
+    previews, and pages with StreamField content that has been changed in
+    memory, aren't cached.
+    """
+    cache_name = 'default'
+
+    def __init__(self, max_entries=MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+        self.clear()
+
+    def clear(self):
+        with self.lock:
+            self.entries = OrderedDict()
+
+    def get_key(self, page):
+        """Return a key for a page's published content, or None."""
+        if page._state.db is None or page.last_published_at is None:
+            return None
+
+        for field in page._meta.fields:
+            if isinstance(field, StreamField):
+                if not getattr(page, field.name).is_lazy:
+                    return None
+
+        return 'page_blocks_{}_{}_{}'.format(
+            get_page_definition_key(type(page)),
+            page.pk,
+            page.last_published_at.isoformat()
+        )
+
+    def get(self, page):
+        """Return the names of the block classes that a page uses."""
+        page = page.specific
+        key = self.get_key(page)
+
+        if key is None:
+            return get_page_blocks(page)
+
+        with self.lock:
+            blocks = self.entries.pop(key, None)
+            if blocks is not None:
+                self.entries[key] = blocks
+                return blocks
+
+        shared_cache = caches[self.cache_name]
+        blocks = shared_cache.get(key)
+
+        if blocks is None:
+            blocks = tuple(get_page_blocks(page))
+            shared_cache.set(key, blocks, None)
+
+        with self.lock:
+            self.entries[key] = blocks
+
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+        return blocks
+
+
+page_blocks = PageBlocksCache()
+
+
+@lru_cache(maxsize=None)
+def get_block_js(block_cls_name):
+    """Return the JS files required by a block class, given its name."""
+    block_cls = import_string(block_cls_name)
+
+    if hasattr(block_cls, 'Media') and hasattr(block_cls.Media, 'js'):
+        return tuple(block_cls.Media.js)
+
+    return ()
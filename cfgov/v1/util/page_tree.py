@@ -0,0 +1,217 @@
+import threading
+import time
+from collections import namedtuple
+
+from django.contrib.contenttypes.models import ContentType
+
+from wagtail.wagtailcore.models import Page
+
+
+# Fields of each page that are kept in the page tree.
+PAGE_TREE_FIELDS = (
+    'id',
+    'path',
+    'depth',
+    'title',
+    'slug',
+    'url_path',
+    'live',
+    'content_type_id',
+)
+
+# Changes to the page tree made by other processes are checked for at most
+# this often, in seconds.
+VERSION_CHECK_INTERVAL = 5
+
+
+class PageNode(namedtuple('PageNode', PAGE_TREE_FIELDS)):
+    """A page in the page tree."""
+    __slots__ = ()
+
+    @property
+    def specific_class(self):
+        content_type = ContentType.objects.get_for_id(self.content_type_id)
+        return content_type.model_class()
+
+    def as_page(self):
+        """Return an unsaved Page with this node's fields.
+
+        This can be used wherever a page's title, slug, or URL is needed
+        without querying the database.
+        """
+        return Page(**self._asdict())
+
+    def get_specific(self):
+        """Return this page in its most specific form, with one query."""
+        return self.specific_class.objects.get(pk=self.id)
+
+
+class PageTree(object):
+    """An in-memory index of every page in the page tree.
+
+    The index is loaded from a single query the first time that it is used,
+    and is then updated whenever pages are saved, moved, or deleted in this
+    process. Other processes, on this server and others, are told about
+    those changes through a CacheVersion; when that version changes, the
+    index is reloaded.
+    """
+    version_name = 'page_tree'
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.nodes = None
+        self.paths = None
+        self.version = None
+        self.version_checked = 0
+
+    def clear(self):
+        with self.lock:
+            self.nodes = None
+
+    def load(self):
+        nodes = {}
+        paths = {}
+
+        for values in Page.objects.values_list(*PAGE_TREE_FIELDS):
+            node = PageNode(*values)
+            nodes[node.id] = node
+            paths[node.path] = node.id
+
+        return nodes, paths
+
+    def get_shared_version(self):
+        from v1.models.caching import CacheVersion
+        return CacheVersion.current(self.version_name)
+
+    def ensure_loaded(self):
+        """Load the index if needed, and return its nodes and paths.
+
+        Other threads may drop the index at any time, so callers must use
+        the returned dicts rather than reading self.nodes or self.paths.
+        """
+        now = time.time()
+
+        with self.lock:
+            if self.nodes is not None:
+                if now - self.version_checked < VERSION_CHECK_INTERVAL:
+                    return self.nodes, self.paths
+
+                self.version_checked = now
+                if self.get_shared_version() == self.version:
+                    return self.nodes, self.paths
+
+            self.version = self.get_shared_version()
+            self.version_checked = now
+            self.nodes, self.paths = self.load()
+
+            return self.nodes, self.paths
+
+    def get_version(self):
+        """Return a version that changes whenever the page tree changes."""
+        with self.lock:
+            self.ensure_loaded()
+            return self.version
+
+    def get(self, page_id):
+        nodes, _ = self.ensure_loaded()
+        return nodes.get(page_id)
+
+    def get_by_path(self, path):
+        nodes, paths = self.ensure_loaded()
+        page_id = paths.get(path)
+        return nodes.get(page_id) if page_id is not None else None
+
+    def get_by_slug(self, slug):
+        """Return every page with a slug, ordered by path."""
+        nodes, _ = self.ensure_loaded()
+        return sorted(
+            (node for node in list(nodes.values()) if node.slug == slug),
+            key=lambda node: node.path
+        )
+
+    def get_ancestors(self, page):
+        """Return the ancestors of a page, from the root, or None.
+
+        None is returned if the page isn't in the tree.
+        """
+        node = self.get(page.pk)
+        if node is None or node.path != page.path:
+            return None
+
+        steplen = Page.steplen
+        ancestors = [
+            self.get_by_path(node.path[:depth * steplen])
+            for depth in range(1, node.depth)
+        ]
+
+        if None in ancestors:
+            return None
+
+        return ancestors
+
+    def get_parent(self, page):
+        ancestors = self.get_ancestors(page)
+        return ancestors[-1] if ancestors else None
+
+    def update(self, page_id):
+        """Update a page that has been saved."""
+        with self.lock:
+            if self.nodes is not None:
+                values = Page.objects.filter(pk=page_id).values_list(
+                    *PAGE_TREE_FIELDS
+                ).first()
+
+                old_node = self.nodes.get(page_id)
+                new_node = PageNode(*values) if values else None
+
+                if old_node is None:
+                    self.add(new_node)
+                elif new_node is None:
+                    self.remove_subtree(old_node)
+                elif (
+                    old_node.path != new_node.path or
+                    old_node.url_path != new_node.url_path
+                ):
+                    # Descendants of moved pages and pages with new slugs
+                    # are updated after this page is saved, so reload the
+                    # whole tree the next time that it is used.
+                    self.nodes = None
+                else:
+                    self.nodes[page_id] = new_node
+
+            self.publish_version()
+
+    def remove(self, page_id):
+        """Remove a deleted page and its descendants."""
+        with self.lock:
+            if self.nodes is not None:
+                self.remove_subtree(self.nodes.get(page_id))
+
+            self.publish_version()
+
+    def remove_subtree(self, node):
+        if node is None:
+            return
+
+        for path in [p for p in self.paths if p.startswith(node.path)]:
+            self.nodes.pop(self.paths.pop(path), None)
+
+    def add(self, node):
+        if node is not None:
+            self.nodes[node.id] = node
+            self.paths[node.path] = node.id
+
+    def publish_version(self):
+        """Tell other processes to reload their page trees."""
+        from v1.models.caching import CacheVersion
+
+        # Changes made by other processes since this tree was last checked
+        # would otherwise be hidden by the new version.
+        if self.version != self.get_shared_version():
+            self.nodes = None
+
+        self.version = CacheVersion.bump(self.version_name)
+        self.version_checked = time.time()
+
+
+page_tree = PageTree()
@@ -0,0 +1,154 @@
+import json
+
+from django.db.models import Q
+from django.utils.dateparse import parse_date
+from django.utils.encoding import force_bytes, force_text
+from django.utils.functional import cached_property
+from django.utils.http import urlsafe_base64_decode, urlsafe_base64_encode
+
+
+NEXT = 'next'
+PREVIOUS = 'previous'
+
+
+def encode_cursor(direction, date, pk):
+    """Return an opaque cursor for a position in a list of results."""
+    return force_text(urlsafe_base64_encode(force_bytes(
+        json.dumps([direction, date.isoformat(), pk])
+    )))
+
+
+def decode_cursor(cursor):
+    """Return (direction, date, pk) for a cursor, or None if it is invalid."""
+    try:
+        direction, date, pk = json.loads(force_text(
+            urlsafe_base64_decode(cursor)
+        ))
+        date = parse_date(date)
+        pk = int(pk)
+    except (TypeError, ValueError):
+        return None
+
+    if direction not in (NEXT, PREVIOUS) or date is None:
+        return None
+
+    return direction, date, pk
+
+
+class KeysetPaginator(object):
+    """Paginates results from newest to oldest using cursors.
+
+    Django's Paginator selects pages with OFFSET, which gets slower the
+    further into the results a page is. This paginator instead selects
+    the results before or after a cursor, ordered on a date field and the
+    primary key, so that every page costs the same as the first one.
+
+    Pages are selected by cursor rather than by number; see KeysetPage.
+    Page numbers from older links are still accepted, and are selected
+    with OFFSET as before.
+    """
+    def __init__(self, object_list, per_page, date_field='date_published'):
+        self.object_list = object_list
+        self.per_page = int(per_page)
+        self.date_field = date_field
+
+    @cached_property
+    def count(self):
+        return self.object_list.count()
+
+    def get_cursor(self, direction, obj):
+        return encode_cursor(direction, getattr(obj, self.date_field), obj.pk)
+
+    def get_offset(self, number):
+        """Return the offset of a page number, limited to the last page."""
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            return 0
+
+        if number <= 1:
+            return 0
+
+        last = max(1, (self.count + self.per_page - 1) // self.per_page)
+        return (min(number, last) - 1) * self.per_page
+
+    def page(self, cursor=None, number=None):
+        """Return the page of results at a cursor.
+
+        If the cursor is missing or invalid, the page with the given number
+        is returned instead, or the first page if there is no number.
+        """
+        position = decode_cursor(cursor) if cursor else None
+        date_field = self.date_field
+        results = self.object_list
+        offset = 0
+
+        if position is None:
+            direction = NEXT
+            offset = self.get_offset(number)
+        else:
+            direction, date, pk = position
+            lookup = 'lt' if direction == NEXT else 'gt'
+            results = results.filter(
+                Q(**{date_field + '__' + lookup: date}) |
+                Q(**{date_field: date, 'pk__' + lookup: pk})
+            )
+
+        if direction == NEXT:
+            results = results.order_by('-' + date_field, '-pk')
+        else:
+            results = results.order_by(date_field, 'pk')
+
+        results = list(results[offset:offset + self.per_page + 1])
+        has_more = len(results) > self.per_page
+        results = results[:self.per_page]
+
+        if direction == NEXT:
+            has_next = has_more
+            has_previous = position is not None or offset > 0
+        else:
+            results.reverse()
+            has_next = True
+            has_previous = has_more
+
+        return KeysetPage(results, self, has_next, has_previous)
+
+
+class KeysetPage(object):
+    """A page of results from a KeysetPaginator."""
+    def __init__(self, object_list, paginator, has_next, has_previous):
+        self.object_list = object_list
+        self.paginator = paginator
+        self._has_next = has_next
+        self._has_previous = has_previous
+
+    def __repr__(self):
+        return '<KeysetPage of {} results>'.format(len(self))
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self._has_next and bool(self.object_list)
+
+    def has_previous(self):
+        return self._has_previous and bool(self.object_list)
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+    @property
+    def next_cursor(self):
+        if self.has_next():
+            return self.paginator.get_cursor(NEXT, self.object_list[-1])
+
+    @property
+    def previous_cursor(self):
+        if self.has_previous():
+            return self.paginator.get_cursor(PREVIOUS, self.object_list[0])
@@ -0,0 +1,255 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from itertools import chain
+
+from django.core.cache import caches
+from django.db import connection
+from django.db.models import CharField, Count
+from django.db.models.functions import Length, Substr
+from django.utils.encoding import force_bytes
+
+from wagtail.wagtailcore.models import Page
+
+from v1.util import ref
+from v1.util.page_tree import page_tree
+
+
+# Related post types, in the order that they are shown, as (block field,
+# type, slugs of the pages whose children are posts of that type).
+RELATED_TYPES = (
+    ('relate_posts', 'blog', ('blog',)),
+    ('relate_newsroom', 'newsroom', ('newsroom',)),
+    ('relate_events', 'events', ('events', 'archive-past-events')),
+)
+
+
+class RelatedPostsEngine(object):
+    """Selects the posts shown by RelatedPosts blocks.
+
+    Posts are the children of the blog, newsroom, and events pages that
+    share tags with the page that the block is on. The paths of those parent
+    pages are looked up from v1.util.page_tree and kept in memory until the
+    page tree changes. The latest posts of each related type are selected up
+    to the block's limit, which when a block matches all tags requires the
+    number of matching tags of each post to equal the number of the page's
+    tags. Where the database allows it, the queries of every related type
+    are combined into a single query with UNION ALL.
+
+    The ids of selected posts are kept in the default cache for each page
+    revision, set of page tags, and block value. Tags are part of the key
+    because previews and shared drafts may have tags that the live page
+    doesn't have. Every stored list of posts is invalidated at
+    once by changing a version stored in the database as a CacheVersion, so
+    that lists kept on every server are invalidated. This happens whenever
+    a page is published, unpublished, moved, or deleted, or whenever page
+    tags change; see v1.wagtail_hooks.
+    """
+    cache_name = 'default'
+    version_name = 'related_posts'
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.parent_paths = {}
+        self.parent_paths_version = None
+
+    @property
+    def cache(self):
+        return caches[self.cache_name]
+
+    def get_version(self):
+        from v1.models.caching import CacheVersion
+        return CacheVersion.current(self.version_name)
+
+    def invalidate(self):
+        from v1.models.caching import CacheVersion
+        CacheVersion.bump(self.version_name)
+
+    def get_parent_paths(self, related_type):
+        """Return the paths of the pages whose children are related posts."""
+        version = page_tree.get_version()
+
+        with self.lock:
+            if version != self.parent_paths_version:
+                self.parent_paths = {}
+                self.parent_paths_version = version
+
+            paths = self.parent_paths.get(related_type)
+
+        if paths is None:
+            slugs = dict(
+                (name, slugs) for _, name, slugs in RELATED_TYPES
+            )[related_type]
+
+            paths = tuple(
+                node.path
+                for slug in slugs
+                for node in page_tree.get_by_slug(slug)
+            )
+
+            with self.lock:
+                if version == self.parent_paths_version:
+                    self.parent_paths[related_type] = paths
+
+        return paths
+
+    def get_related_types(self, value):
+        return [
+            name for field, name, _ in RELATED_TYPES if value.get(field)
+        ]
+
+    def get_tags(self, page):
+        return sorted(tag.pk for tag in page.tags.all())
+
+    def get_key(self, page, value, tags):
+        block_value = sorted(
+            (name, value.get(name))
+            for name in (
+                'limit',
+                'and_filtering',
+                'specific_categories',
+                'relate_posts',
+                'relate_newsroom',
+                'relate_events',
+            )
+        )
+
+        return 'related_posts_{}_{}'.format(
+            self.get_version(),
+            hashlib.sha1(force_bytes(repr((
+                page.pk,
+                page.live_revision_id,
+                tags,
+                block_value,
+            )))).hexdigest()
+        )
+
+    def select(self, page, value, tags=None):
+        """Return ids of the related posts of a page, by related type.
+
+        Ids are returned as an OrderedDict of lists of ids, keyed by the
+        title of each related type that has any related posts.
+        """
+        from v1.models.learn_page import AbstractFilterPage
+
+        related_types = self.get_related_types(value)
+
+        if tags is None:
+            tags = self.get_tags(page)
+
+        if not related_types or not tags:
+            return OrderedDict()
+
+        specific_categories = value['specific_categories']
+        limit = int(value['limit'])
+
+        posts = AbstractFilterPage.objects.live().exclude(pk=page.pk).annotate(
+            parent_path=Substr(
+                'path', 1, Length('path') - Page.steplen,
+                output_field=CharField()
+            )
+        ).filter(tags__in=tags)
+
+        path_types = {}
+        querysets = []
+
+        for related_type in related_types:
+            paths = self.get_parent_paths(related_type)
+
+            if not paths:
+                continue
+
+            for path in paths:
+                path_types[path] = related_type
+
+            type_posts = posts.filter(parent_path__in=paths)
+
+            if specific_categories:
+                # Filter by any additional categories specified
+                categories = ref.get_appropriate_categories(
+                    specific_categories=specific_categories,
+                    page_type=related_type
+                )
+                if categories:
+                    type_posts = type_posts.filter(
+                        categories__name__in=categories
+                    )
+
+            type_posts = type_posts.values_list(
+                'pk', 'parent_path', 'date_published'
+            ).annotate(
+                tag_count=Count('tags', distinct=True)
+            )
+
+            if value['and_filtering']:
+                type_posts = type_posts.filter(tag_count=len(tags))
+
+            querysets.append(
+                type_posts.order_by('-date_published', '-pk')[:limit]
+            )
+
+        if not querysets:
+            return OrderedDict()
+
+        if (
+            len(querysets) > 1 and
+            connection.features.supports_slicing_ordering_in_compound
+        ):
+            rows = querysets[0].union(*querysets[1:], all=True)
+        else:
+            rows = chain.from_iterable(querysets)
+
+        post_ids = dict((related_type, []) for related_type in related_types)
+
+        # Rows of a combined query aren't guaranteed to keep the order of
+        # each related type's query.
+        for pk, parent_path, _, _ in sorted(
+            rows,
+            key=lambda row: (row[2], row[0]),
+            reverse=True
+        ):
+            post_ids[path_types[parent_path]].append(pk)
+
+        return OrderedDict(
+            (related_type.title(), post_ids[related_type])
+            for related_type in related_types
+            if post_ids[related_type]
+        )
+
+    def get(self, page, value):
+        """Return the related posts of a page, by related type.
+
+        Posts are returned as an OrderedDict of lists of pages, keyed by the
+        title of each related type that has any related posts.
+        """
+        from v1.models.learn_page import AbstractFilterPage
+
+        if not self.get_related_types(value):
+            return OrderedDict()
+
+        tags = self.get_tags(page)
+        key = self.get_key(page, value, tags)
+        post_ids = self.cache.get(key)
+
+        if post_ids is None:
+            post_ids = self.select(page, value, tags)
+            self.cache.set(key, post_ids)
+
+        if not post_ids:
+            return OrderedDict()
+
+        posts = AbstractFilterPage.objects.live().in_bulk([
+            pk for type_post_ids in post_ids.values() for pk in type_post_ids
+        ])
+
+        related_posts = OrderedDict()
+
+        for title, type_post_ids in post_ids.items():
+            type_posts = [posts[pk] for pk in type_post_ids if pk in posts]
+            if type_posts:
+                related_posts[title] = type_posts
+
+        return related_posts
+
+
+related_posts = RelatedPostsEngine()
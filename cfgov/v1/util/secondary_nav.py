@@ -0,0 +1,172 @@
+import threading
+from collections import namedtuple
+
+from django.apps import apps
+from django.contrib.contenttypes.models import ContentType
+from django.utils.lru_cache import lru_cache
+
+from wagtail.wagtailcore.models import Page
+
+from v1.util.page_tree import PAGE_TREE_FIELDS, PageNode, page_tree
+
+
+NavSection = namedtuple('NavSection', ('pages', 'children', 'excluded'))
+
+
+@lru_cache(maxsize=None)
+def get_browse_page_models():
+    """Return every page model that appears in secondary navigation."""
+    from v1.models import BrowseFilterablePage, BrowsePage
+    return tuple(
+        model for model in apps.get_models()
+        if issubclass(model, (BrowsePage, BrowseFilterablePage))
+    )
+
+
+def get_browse_page_content_types():
+    return list(ContentType.objects.get_for_models(
+        *get_browse_page_models()
+    ).values())
+
+
+class SecondaryNav(object):
+    """The secondary navigation of Browse pages.
+
+    A section is a set of sibling Browse pages. The live Browse pages of a
+    section and their live Browse children are loaded with one query, and
+    which of them exclude their siblings from navigation with one query per
+    Browse page table. Sections are kept in memory until the page tree in
+    v1.util.page_tree changes, which happens whenever a page is published,
+    unpublished, moved, or deleted in any process.
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.sections = {}
+        self.version = None
+
+    def clear(self):
+        with self.lock:
+            self.sections = {}
+
+    def load_section(self, parent_path, depth):
+        pages = []
+        children = {}
+
+        page_values = Page.objects.live().filter(
+            content_type__in=get_browse_page_content_types(),
+            path__startswith=parent_path,
+            depth__in=(depth, depth + 1)
+        ).order_by('path').values_list(*PAGE_TREE_FIELDS)
+
+        for values in page_values:
+            node = PageNode(*values)
+
+            if node.depth == depth:
+                pages.append(node)
+            else:
+                children.setdefault(
+                    node.path[:-Page.steplen], []
+                ).append(node)
+
+        from v1.models import BrowseFilterablePage, BrowsePage
+        page_ids = [node.id for node in pages]
+        excluded = set()
+
+        for model in (BrowsePage, BrowseFilterablePage):
+            excluded.update(model.objects.filter(
+                pk__in=page_ids,
+                secondary_nav_exclude_sibling_pages=True
+            ).values_list('pk', flat=True))
+
+        return NavSection(pages, children, frozenset(excluded))
+
+    def get_section(self, page):
+        """Return the section that contains a page."""
+        version = page_tree.get_version()
+        parent_path = page.path[:-Page.steplen]
+
+        with self.lock:
+            if version != self.version:
+                self.sections = {}
+                self.version = version
+
+            section = self.sections.get(parent_path)
+
+        if section is None:
+            section = self.load_section(parent_path, page.depth)
+
+            with self.lock:
+                if version == self.version:
+                    self.sections[parent_path] = section
+
+        return section
+
+    def get_items(self, request, current_page):
+        """Return the navigation items for a page.
+
+        The top-level page is the current page's parent if that is a Browse
+        page, and the current page otherwise. The navigation lists the
+        top-level page and its live Browse siblings, along with the live
+        Browse children of the top-level page.
+        """
+        parent = page_tree.get_parent(current_page)
+        if parent is None:
+            parent = current_page.get_parent()
+
+        if issubclass(parent.specific_class, get_browse_page_models()):
+            page = parent
+            section = self.get_section(page)
+            exclude_siblings = page.id in section.excluded
+        else:
+            page = current_page
+            section = self.get_section(page)
+            exclude_siblings = page.secondary_nav_exclude_sibling_pages
+
+        if exclude_siblings:
+            pages = [page]
+        else:
+            pages = [page if p.id == page.id else p for p in section.pages]
+
+        has_children = False
+        nav_items = []
+
+        for sibling in pages:
+            item_selected = current_page.pk == sibling.id
+
+            item = {
+                'title': sibling.title,
+                'slug': sibling.slug,
+                'url': self.get_url(request, sibling),
+                'children': [],
+                'active': item_selected,
+                'expanded': item_selected,
+            }
+
+            if sibling is page:
+                for child in section.children.get(page.path, []):
+                    has_children = True
+                    child_selected = current_page.pk == child.id
+
+                    if child_selected:
+                        item['expanded'] = True
+
+                    item['children'].append({
+                        'title': child.title,
+                        'slug': child.slug,
+                        'url': self.get_url(request, child),
+                        'active': child_selected,
+                    })
+
+            nav_items.append(item)
+
+        return nav_items, has_children
+
+    @staticmethod
+    def get_url(request, page):
+        if isinstance(page, PageNode):
+            page = page.as_page()
+
+        return page.relative_url(request.site)
+
+
+secondary_nav = SecondaryNav()
@@ -0,0 +1,69 @@
+from django.core.cache import caches
+from django.utils.lru_cache import lru_cache
+
+from wagtail.wagtailcore.models import get_page_models
+
+
+@lru_cache()
+def get_filterable_parent_models():
+    """Return the page models whose children sublanding pages preview."""
+    return tuple(
+        model for model in get_page_models()
+        if 'FilterablePage' in model.__name__
+    )
+
+
+class SublandingPosts(object):
+    """A store of the most recent posts previewed on sublanding pages.
+
+    Sublanding pages preview the latest posts of the filterable pages below
+    them; see SublandingPage.get_browsefilterable_posts. Those posts are
+    selected once for each sublanding page and limit, and their ids are kept
+    in the default cache. Pages themselves can't be cached, because their
+    StreamField values can't be pickled; cached posts are instead fetched by
+    id with a single query on the primary key.
+
+    Every stored list of posts is invalidated at once by changing a version
+    stored in the database as a CacheVersion, so that lists kept on every
+    server are invalidated. This happens whenever a page is published,
+    unpublished, moved, or deleted; see v1.wagtail_hooks.
+    """
+    cache_name = 'default'
+    version_name = 'sublanding_posts'
+
+    @property
+    def cache(self):
+        return caches[self.cache_name]
+
+    def get_version(self):
+        from v1.models.caching import CacheVersion
+        return CacheVersion.current(self.version_name)
+
+    def invalidate(self):
+        from v1.models.caching import CacheVersion
+        CacheVersion.bump(self.version_name)
+
+    def get(self, page, limit):
+        """Return the latest posts previewed on a sublanding page."""
+        key = 'sublanding_posts_{}_{}_{}'.format(
+            self.get_version(),
+            page.pk,
+            limit
+        )
+
+        post_ids = self.cache.get(key)
+
+        if post_ids is None:
+            posts = list(page.get_browsefilterable_queryset()[:limit])
+            self.cache.set(key, [post.pk for post in posts])
+            return posts
+
+        if not post_ids:
+            return []
+
+        model = page.get_browsefilterable_queryset().model
+        posts = model.objects.live().in_bulk(post_ids)
+        return [posts[pk] for pk in post_ids if pk in posts]
+
+
+sublanding_posts = SublandingPosts()
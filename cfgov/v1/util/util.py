@@ -8,6 +8,9 @@ from django.http import Http404, HttpResponseRedirect
 
 from wagtail.wagtailcore.blocks.stream_block import StreamValue
 
+from core.utils import PathMatcher
+from v1.util.secondary_nav import secondary_nav
+
 
 # These messages are manually mirrored on the
 # Javascript side in error-messages-config.js
@@ -22,6 +25,18 @@ ERROR_MESSAGES = {
 }
 
 
+# Buying a House journey pages, which are also served at `/process/` urls.
+# TODO: Remove this when redirects for `/process/` urls
+# are added after 2018 homebuying campaign.
+BAH_JOURNEY_URLS = PathMatcher(prefixes=(
+    '/owning-a-home/prepare',
+    '/owning-a-home/explore',
+    '/owning-a-home/compare',
+    '/owning-a-home/close',
+    '/owning-a-home/sources',
+))
+
+
 def get_unique_id(prefix='', suffix=''):
     index = hex(int(time() * 10000000))[2:]
     return prefix + str(index) + suffix
@@ -37,87 +52,12 @@ def instanceOfBrowseOrFilterablePages(page):
 # TODO: Move into BrowsePage class once BrowseFilterablePage has been merged
 # into BrowsePage
 def get_secondary_nav_items(request, current_page):
-    # If the parent page of the current page is a BrowsePage or a
-    # BrowseFilterablePage, then use that as the top-level page for the
-    # purposes of the navigation sidebar. Otherwise, treat the current page
-    # as top-level.
-    parent = current_page.get_parent().specific
-    if instanceOfBrowseOrFilterablePages(parent):
-        page = parent
-    else:
-        page = current_page
-
-    # If there's no appropriate page version (e.g. not published for a sharing
-    # request), then return no sidebar at all.
-    if not page:
-        return [], False
-
-    # Return a boolean about whether or not the current page has Browse
-    # children
-    has_children = False
-
-    if page.secondary_nav_exclude_sibling_pages:
-        pages = [page]
-    else:
-        pages = filter(
-            lambda p: instanceOfBrowseOrFilterablePages(p.specific),
-            page.get_appropriate_siblings()
-        )
-
-    nav_items = []
-    for sibling in pages:
-        if page.id == sibling.id:
-            sibling = page
-        else:
-            sibling = sibling
-
-        item_selected = current_page.pk == sibling.pk
-
-        item = {
-            'title': sibling.title,
-            'slug': sibling.slug,
-            'url': sibling.relative_url(request.site),
-            'children': [],
-            'active': item_selected,
-            'expanded': item_selected,
-        }
-
-        if page.id == sibling.id:
-            visible_children = list(filter(
-                lambda c: (
-                    instanceOfBrowseOrFilterablePages(c) and
-                    (c.live)
-                ),
-                sibling.get_children().specific()
-            ))
-            if len(visible_children):
-                has_children = True
-                for child in visible_children:
-                    child_selected = current_page.pk == child.pk
-
-                    if child_selected:
-                        item['expanded'] = True
-
-                    item['children'].append({
-                        'title': child.title,
-                        'slug': child.slug,
-                        'url': child.relative_url(request.site),
-                        'active': child_selected,
-                    })
-
-        nav_items.append(item)
+    nav_items, has_children = secondary_nav.get_items(request, current_page)
 
     # Add `/process/` segment to BAH journey page nav urls.
     # TODO: Remove this when redirects for `/process/` urls
     # are added after 2018 homebuying campaign.
-    journey_urls = (
-        '/owning-a-home/prepare',
-        '/owning-a-home/explore',
-        '/owning-a-home/compare',
-        '/owning-a-home/close',
-        '/owning-a-home/sources',
-    )
-    if current_page.relative_url(request.site).startswith(journey_urls):
+    if BAH_JOURNEY_URLS.matches(current_page.relative_url(request.site)):
         for item in nav_items:
             item['url'] = item['url'].replace(
                 'owning-a-home', 'owning-a-home/process')
@@ -169,6 +109,57 @@ def get_streamfields(page):
     return blocks_dict
 
 
+# Names of the child blocks of each StreamBlock that are form modules, by
+# StreamBlock id. Each StreamBlock is kept alongside its names so that its
+# id can't be reused.
+_form_block_names = {}
+
+
+def get_form_block_names(stream_block):
+    """Return the names of the child blocks of a StreamBlock that are forms.
+
+    Form modules are blocks that implement get_result. StreamBlocks are
+    defined once per StreamField, so this is only computed once for each.
+    """
+    cached = _form_block_names.get(id(stream_block))
+
+    if cached is None or cached[0] is not stream_block:
+        cached = _form_block_names[id(stream_block)] = (
+            stream_block,
+            frozenset(
+                name for name, block in stream_block.child_blocks.items()
+                if hasattr(block, 'get_result')
+            )
+        )
+
+    return cached[1]
+
+
+def get_form_blocks(page):
+    """
+    Retrieves the form modules on a page as (fieldname, index, child) tuples.
+
+    Only the block type of each stored block is checked, so blocks that
+    aren't form modules are never converted to their Python values. Pages
+    without form modules don't have any of their blocks converted.
+    """
+    form_blocks = []
+
+    for fieldname, stream_value in get_streamfields(page).items():
+        form_block_names = get_form_block_names(stream_value.stream_block)
+
+        if not form_block_names:
+            continue
+
+        for index, item in enumerate(stream_value.stream_data):
+            block_type = item['type'] if stream_value.is_lazy else item[0]
+
+            if block_type in form_block_names:
+                form_blocks.append((fieldname, index, stream_value[index]))
+
+    return form_blocks
+
+
 def extended_strftime(dt, format):
     """
     Extend strftime with additional patterns:
@@ -5,7 +5,7 @@ from django.conf.urls import url
 from django.contrib import admin
 from django.core.exceptions import PermissionDenied
 from django.core.urlresolvers import reverse
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_init, post_save
 from django.dispatch import receiver
 from django.utils.html import format_html_join
 
@@ -14,16 +14,42 @@ from wagtail.contrib.modeladmin.options import (
 )
 from wagtail.wagtailadmin.menu import MenuItem
 from wagtail.wagtailcore import hooks
+from wagtail.wagtailcore.models import Page
+from wagtail.wagtailcore.signals import page_published, page_unpublished
 from wagtail.wagtailcore.whitelist import attribute_rule
+from wagtail.wagtaildocs.models import Document
+from wagtailsharing.models import SharingSite
+
+from taggit.models import Tag
 
 from v1.admin_views import manage_cdn
+from v1.cache_tags import add_cache_tags, purge_cache_tags, tag_instance
+from v1.feeds import feed_cache
+from v1.jinja2tags.fragment_cache import (
+    get_instance_tags, invalidate_fragment_tags
+)
+from v1.models.base import CFGOVAuthoredPages, CFGOVPage, CFGOVTaggedPages
+from v1.models.images import CFGOVImage
 from v1.models.menu_item import MenuItem as MegaMenuItem
 from v1.models.portal_topics import PortalCategory, PortalTopic
 from v1.models.resources import Resource
 from v1.models.snippets import (
     Contact, GlossaryTerm, RelatedResource, ReusableText
 )
+from v1.page_cache import clear_cached_pages, page_cache, page_etags
+from v1.renditions import (
+    DEFAULT_FILTER_SPECS, get_page_renditions, prefetch_page_renditions,
+    pregenerate_renditions
+)
+from v1.templatetags.mega_menu import (
+    invalidate_menu_snapshots, update_menu_snapshots
+)
 from v1.util import util
+from v1.util.filterable_facets import filterable_facets
+from v1.util.page_blocks import page_blocks
+from v1.util.page_tree import PAGE_TREE_FIELDS, page_tree
+from v1.util.related_posts import related_posts
+from v1.util.sublanding_posts import sublanding_posts
 
 
 logger = logging.getLogger(__name__)
@@ -89,34 +115,41 @@ def editor_css():
     return css_includes
 
 
+@hooks.register('cfgovpage_context_handlers')
+def prefetch_image_renditions(page, request, context, *args, **kwargs):
+    """
+    Hook function that loads the renditions of every image in a page with a
+    single query, before the page's templates request them one at a time.
+    """
+    prefetch_page_renditions(page)
+
+
 @hooks.register('cfgovpage_context_handlers')
 def form_module_handlers(page, request, context, *args, **kwargs):
     """
-    Hook function that iterates over every Streamfield's blocks on a page and
-    sets the context for any form modules.
+    Hook function that sets the context for any form modules in a page's
+    Streamfields.
     """
     form_modules = {}
-    streamfields = util.get_streamfields(page)
-
-    for fieldname, blocks in streamfields.items():
-        for index, child in enumerate(blocks):
-            if hasattr(child.block, 'get_result'):
-                if fieldname not in form_modules:
-                    form_modules[fieldname] = {}
-
-                if not request.method == 'POST':
-                    is_submitted = child.block.is_submitted(
-                        request,
-                        fieldname,
-                        index
-                    )
-                    module_context = child.block.get_result(
-                        page,
-                        request,
-                        child.value,
-                        is_submitted
-                    )
-                    form_modules[fieldname].update({index: module_context})
+
+    for fieldname, index, child in util.get_form_blocks(page):
+        if fieldname not in form_modules:
+            form_modules[fieldname] = {}
+
+        if not request.method == 'POST':
+            is_submitted = child.block.is_submitted(
+                request,
+                fieldname,
+                index
+            )
+            module_context = child.block.get_result(
+                page,
+                request,
+                child.value,
+                is_submitted
+            )
+            form_modules[fieldname].update({index: module_context})
+
     if form_modules:
         context['form_modules'] = form_modules
 
@@ -144,6 +177,12 @@ def register_flag_admin_urls():
     return [url(r'^cdn/$', manage_cdn, name='manage-cdn'), ]
 
 
+# This must be registered before any hook that serves a response.
+@hooks.register('before_serve_page')
+def tag_served_page(page, request, args, kwargs):
+    add_cache_tags('wagtailcore.page:{}'.format(page.pk))
+
+
 @hooks.register('before_serve_page')
 def serve_latest_draft_page(page, request, args, kwargs):
     if page.pk in settings.SERVE_LATEST_DRAFT_PAGES:
@@ -158,6 +197,153 @@ def before_serve_shared_page(page, request, args, kwargs):
     request.show_draft_megamenu = True
 
 
+# This must be registered after serve_latest_draft_page so that drafts are
+# never served from the page cache.
+@hooks.register('before_serve_page')
+def serve_cached_page(page, request, args, kwargs):
+    response = page_etags.serve(page, request, lambda: (
+        page_cache.serve(page, request, args, kwargs) or
+        page.serve(request, *args, **kwargs)
+    ))
+
+    if response is None:
+        response = page_cache.serve(page, request, args, kwargs)
+
+    return response
+
+
+# Pages display content from other pages and from these snippets, so any
+# change to them may change any number of cached pages and fragments.
+SNIPPET_MODELS = (
+    Contact,
+    GlossaryTerm,
+    MegaMenuItem,
+    PortalCategory,
+    PortalTopic,
+    RelatedResource,
+    Resource,
+    ReusableText,
+)
+
+
+@receiver([page_published, page_unpublished])
+@receiver([post_save, post_delete], sender=CFGOVImage)
+@receiver([post_save, post_delete], sender=Document)
+def clear_page_cache(sender, **kwargs):
+    clear_cached_pages()
+
+
+@receiver([post_save, post_delete], sender=SharingSite)
+def clear_sharing_hosts(sender, **kwargs):
+    page_cache.clear_sharing_hosts()
+
+
+@receiver([page_published, page_unpublished])
+def invalidate_fragments(sender, instance, **kwargs):
+    tags = get_instance_tags(instance)
+    invalidate_fragment_tags(*tags)
+    purge_cache_tags(*tags)
+
+
+# Fields of pages that are kept in v1.util.page_tree.
+PAGE_TREE_UPDATE_FIELDS = frozenset(PAGE_TREE_FIELDS)
+
+
+@receiver(post_save)
+def update_page_tree(sender, instance, update_fields=None, **kwargs):
+    if not isinstance(instance, Page):
+        return
+
+    if update_fields and PAGE_TREE_UPDATE_FIELDS.isdisjoint(update_fields):
+        return
+
+    page_tree.update(instance.pk)
+
+
+@receiver(post_delete)
+def remove_from_page_tree(sender, instance, **kwargs):
+    if isinstance(instance, Page):
+        page_tree.remove(instance.pk)
+
+
+# Fields of pages that change which pages filterable lists filter.
+FILTERABLE_FACETS_UPDATE_FIELDS = frozenset(('live', 'path'))
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def invalidate_tagged_pages(sender, instance, update_fields=None, **kwargs):
+    if isinstance(instance, Page):
+        if (
+            update_fields and
+            FILTERABLE_FACETS_UPDATE_FIELDS.isdisjoint(update_fields)
+        ):
+            return
+    elif not isinstance(instance, (CFGOVAuthoredPages, CFGOVTaggedPages, Tag)):
+        return
+
+    filterable_facets.invalidate()
+    related_posts.invalidate()
+    feed_cache.invalidate()
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def invalidate_sublanding_posts(sender, instance, update_fields=None,
+                                **kwargs):
+    if not isinstance(instance, Page):
+        return
+
+    if update_fields and FILTERABLE_FACETS_UPDATE_FIELDS.isdisjoint(
+        update_fields
+    ):
+        return
+
+    sublanding_posts.invalidate()
+
+
+@receiver(page_published)
+def warm_page_blocks(sender, instance, **kwargs):
+    if isinstance(instance, CFGOVPage):
+        page_blocks.get(instance)
+
+
+@receiver(page_published)
+def pregenerate_page_renditions(sender, instance, **kwargs):
+    if isinstance(instance, CFGOVPage):
+        pregenerate_renditions(lambda: get_page_renditions(instance))
+
+
+@receiver(post_save, sender=CFGOVImage)
+def pregenerate_image_renditions(sender, instance, created, **kwargs):
+    if created:
+        pregenerate_renditions(lambda: [
+            (instance.pk, filter_spec) for filter_spec in DEFAULT_FILTER_SPECS
+        ])
+
+
+# This must be connected before the snippet receivers below, so that cached
+# menu fragments are never rendered again from an out of date snapshot.
+@receiver(post_save, sender=MegaMenuItem)
+@receiver(post_delete, sender=MegaMenuItem)
+def update_mega_menu(sender, instance, **kwargs):
+    update_menu_snapshots()
+
+
+# The mega menu shows image renditions, which change with their images.
+@receiver([post_save, post_delete], sender=CFGOVImage)
+def invalidate_mega_menu(sender, instance, **kwargs):
+    invalidate_menu_snapshots()
+
+
+for snippet in SNIPPET_MODELS:
+    post_init.connect(tag_instance, sender=snippet)
+    post_save.connect(clear_page_cache, sender=snippet)
+    post_delete.connect(clear_page_cache, sender=snippet)
+    post_save.connect(invalidate_fragments, sender=snippet)
+    post_delete.connect(invalidate_fragments, sender=snippet)
+
+
 class MegaMenuModelAdmin(ModelAdmin):
     model = MegaMenuItem
     menu_label = 'Mega Menu'
@@ -168,12 +354,6 @@ class MegaMenuModelAdmin(ModelAdmin):
 modeladmin_register(MegaMenuModelAdmin)
 
 
-@receiver(post_save, sender=MegaMenuItem)
-def clear_mega_menu_cache(sender, instance, **kwargs):
-    from django.core.cache import caches
-    caches['default_fragment_cache'].delete('mega_menu')
-
-
 def get_resource_tags():
     tag_list = []
 
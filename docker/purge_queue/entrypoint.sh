@@ -0,0 +1,3 @@
+source /src/cfgov-refresh/.env
+source /etc/profile.d/extend-environment.sh
+python2.7 /src/cfgov-refresh/cfgov/manage.py drain_purge_queue --loop